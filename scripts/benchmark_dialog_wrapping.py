@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+from typing import List
+
+import argparse
+import os
+import time
+import xml.etree.ElementInclude as ETI
+import xml.etree.ElementTree as ET
+
+from generic_utils.point import Point
+
+from pydw.game_dialog import GameDialog
+from pydw.game_info import GameInfo
+
+
+def get_dialog_messages(xml_root: ET.Element) -> List[str]:
+    """Get the text of every dialog in the game configuration, capitalized as it would be displayed"""
+    messages = []
+    for element in xml_root.iter():
+        if (
+            isinstance(element.tag, str)
+            and element.tag.endswith("Dialog")
+            and element.text is not None
+            and element.text.strip() != ""
+        ):
+            messages.append(GameDialog.fix_capitalization(element.text))
+    return messages
+
+
+def convert_message_to_lines_by_line_measurement(
+    message: str, width_px: int
+) -> List[str]:
+    """The previous implementation of GameDialog.convert_message_to_lines, which measures the whole line per word"""
+    lines: List[str] = []
+    for line in message.split("\n"):
+        line_to_display = ""
+        for word in line.split(" "):
+            if line_to_display == "":
+                line_to_evaluate = word
+            else:
+                line_to_evaluate = line_to_display + " " + word
+            if (
+                GameDialog.font.size(line_to_evaluate)[0]
+                + 2 * GameDialog.outside_spacing_pixels
+                <= width_px
+            ):
+                line_to_display = line_to_evaluate
+            else:
+                lines.append(line_to_display)
+                line_to_display = word
+        lines.append(line_to_display)
+    return lines
+
+
+def time_wrapping(
+    messages: List[str],
+    width_px: int,
+    repeat: int,
+    by_line_measurement: bool,
+    cold: bool,
+) -> float:
+    """Time wrapping all of the messages, returning the mean time per pass over the messages"""
+    total_time = 0.0
+    for _ in range(repeat):
+        if cold:
+            GameDialog.word_width_cache.clear()
+            GameDialog.wrapped_message_cache.clear()
+        start_time = time.perf_counter()
+        for message in messages:
+            if by_line_measurement:
+                convert_message_to_lines_by_line_measurement(message, width_px)
+            else:
+                GameDialog.convert_message_to_lines(message, width_px)
+        total_time += time.perf_counter() - start_time
+    return total_time / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the time to wrap the dialog scripts measuring whole lines versus cached word widths"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Passes over the dialog scripts"
+    )
+    parser.add_argument(
+        "--game-xml",
+        default=os.path.join("data", "game.xml"),
+        help="Game configuration xml file, relative to the base path",
+    )
+    args = parser.parse_args()
+
+    # Xml files are included relative to the base path
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+    os.chdir(base_path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    # Match the window and tile sizes used by game.py
+    win_size_pixels = Point(1280, 720)
+    tile_size_pixels = 16 * 3
+    win_size_tiles = (win_size_pixels / tile_size_pixels).floor()
+    pygame.init()
+    pygame.display.set_mode(win_size_pixels.get_as_int_tuple())
+
+    xml_root = ET.parse(os.path.join(base_path, args.game_xml)).getroot()
+    ETI.include(xml_root)
+    data_path = os.path.join(base_path, xml_root.attrib["dataPath"])
+    image_path = os.path.join(data_path, xml_root.attrib["imagePath"])
+    font_names, dialog_border_image_filename = GameInfo.parse_dialogs_info(
+        xml_root, image_path
+    )
+    GameDialog.static_init(
+        win_size_tiles, tile_size_pixels, font_names, dialog_border_image_filename
+    )
+
+    messages = get_dialog_messages(xml_root)
+    width_px = int(
+        GameDialog.get_message_dialog_size_tiles(win_size_tiles).x * tile_size_pixels
+    )
+    num_differences = sum(
+        1
+        for message in messages
+        if convert_message_to_lines_by_line_measurement(message, width_px)
+        != GameDialog.convert_message_to_lines(message, width_px)
+    )
+    print(
+        f"{len(messages)} dialog messages wrapped to {width_px}px, {num_differences} wrapped differently",
+        flush=True,
+    )
+
+    for name, by_line_measurement, cold in [
+        ("line measurement", True, True),
+        ("word widths (cold)", False, True),
+        ("word widths (warm)", False, False),
+    ]:
+        pass_time = time_wrapping(
+            messages, width_px, args.repeat, by_line_measurement, cold
+        )
+        print(f"{name}: {pass_time * 1000:.3f}ms per pass", flush=True)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        import sys
+        import traceback
+
+        print(
+            traceback.format_exception(
+                None, e, e.__traceback__  # <- type(e) by docs, but ignored
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+        traceback.print_exc()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+from typing import List
+
+import argparse
+import os
+import random
+import timeit
+
+from generic_utils.point import Point
+
+from pydw.game_map import GameMap
+from pydw.game_map_viewer import GameMapViewer
+
+
+def get_walkable_tiles(game_map: GameMap) -> List[Point]:
+    walkable_tiles = []
+    map_w, map_h = game_map.size().get_as_int_tuple()
+    for x in range(map_w):
+        for y in range(map_h):
+            tile = Point(x, y)
+            if game_map.can_npc_move_to_tile(tile, enforce_npc_dof_limit=False):
+                walkable_tiles.append(tile)
+    return walkable_tiles
+
+
+def follow_distance_field(game_map: GameMap, start: Point, goal: Point) -> int:
+    """Walk from start to goal by always stepping to the lowest distance neighbor, returning the number of steps"""
+    distance_field = game_map.get_npc_distance_field(goal)
+    if distance_field is None:
+        return 0
+    steps = 0
+    tile = start
+    while tile != goal:
+        next_tile = min(
+            GameMap.get_adjacent_points(tile, include_point=False),
+            key=lambda neighbor: (
+                distance_field[neighbor.get_as_int_tuple()]
+                if game_map.is_tile_in_bounds(neighbor)
+                else float("inf")
+            ),
+        )
+        if not distance_field[next_tile.get_as_int_tuple()] < distance_field[
+            tile.get_as_int_tuple()
+        ]:
+            break
+        tile = next_tile
+        steps += 1
+    return steps
+
+
+def benchmark_map(
+    viewer: GameMapViewer,
+    map_name: str,
+    num_npcs: int,
+    num_waypoints: int,
+    repeat: int,
+) -> None:
+    try:
+        game_map = GameMap(viewer.mock_game_state, map_name)
+    except FileNotFoundError as e:
+        print(f"{map_name}: skipped, failed to load: {e}", flush=True)
+        return
+    walkable_tiles = get_walkable_tiles(game_map)
+    if len(walkable_tiles) < 2:
+        print(f"{map_name}: skipped, too few walkable tiles", flush=True)
+        return
+
+    # NPCs in a town share the same waypoints, so each NPC is routed to each of the waypoints
+    rng = random.Random(map_name)
+    starts = [rng.choice(walkable_tiles) for _ in range(num_npcs)]
+    waypoints = rng.sample(walkable_tiles, min(num_waypoints, len(walkable_tiles)))
+
+    def run_a_star() -> None:
+        for waypoint in waypoints:
+            for start in starts:
+                game_map.compute_npc_path(start, waypoint)
+
+    def run_distance_field() -> None:
+        # Start from an empty cache each run so that building the fields is included in the timing
+        game_map.npc_distance_fields = {}
+        for waypoint in waypoints:
+            for start in starts:
+                follow_distance_field(game_map, start, waypoint)
+
+    a_star_time = min(timeit.repeat(run_a_star, number=1, repeat=repeat))
+    distance_field_time = min(timeit.repeat(run_distance_field, number=1, repeat=repeat))
+    print(
+        f"{map_name} ({game_map.size().w}x{game_map.size().h}, {len(starts)} NPCs, {len(waypoints)} waypoints): "
+        f"A*={a_star_time * 1000:.1f}ms; distance field={distance_field_time * 1000:.1f}ms; "
+        f"speedup={a_star_time / max(distance_field_time, 1e-9):.1f}x",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per NPC A* pathfinding with shared waypoint distance fields on the Tiled maps"
+    )
+    parser.add_argument("--npcs", type=int, default=20, help="NPCs per map")
+    parser.add_argument("--waypoints", type=int, default=4, help="Waypoints per map")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    parser.add_argument(
+        "--game-xml",
+        default=None,
+        help="Game configuration xml file, relative to the base path.  Defaults to the licensed assets, falling back "
+        "to data/game.xml when they are missing.",
+    )
+    parser.add_argument(
+        "--include-legacy-maps",
+        action="store_true",
+        help="Also benchmark the maps which are not Tiled maps",
+    )
+    args = parser.parse_args()
+
+    # Map xml files are included relative to the base path
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+    os.chdir(base_path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    viewer = GameMapViewer(base_path, args.game_xml)
+    for map_name, map_info in viewer.game_info.maps.items():
+        if map_info.tiled_filename is not None or args.include_legacy_maps:
+            benchmark_map(viewer, map_name, args.npcs, args.waypoints, args.repeat)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        import sys
+        import traceback
+
+        print(
+            traceback.format_exception(
+                None, e, e.__traceback__  # <- type(e) by docs, but ignored
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+        traceback.print_exc()
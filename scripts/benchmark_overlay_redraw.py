@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+from typing import List, Optional, Tuple
+
+import argparse
+import os
+import time
+
+from generic_utils.point import Point
+
+from pydw.game_map import GameMap
+from pydw.game_map_viewer import GameMapViewer
+from pydw.game_types import Direction
+
+
+def find_doorway(game_map: GameMap) -> Optional[Tuple[Point, Point]]:
+    """Find a pair of adjacent walkable tiles where one is exterior and the other is interior"""
+    map_w, map_h = game_map.size().get_as_int_tuple()
+    for x in range(map_w):
+        for y in range(map_h):
+            exterior_tile = Point(x, y)
+            if game_map.is_interior(exterior_tile) or not game_map.can_move_to_tile(
+                exterior_tile
+            ):
+                continue
+            for direction in Direction:
+                interior_tile = exterior_tile + direction.get_vector()
+                if game_map.is_interior(interior_tile) and game_map.can_move_to_tile(
+                    interior_tile
+                ):
+                    return exterior_tile, interior_tile
+    return None
+
+
+def time_doorway_frames(
+    viewer: GameMapViewer,
+    game_map: GameMap,
+    doorway: Tuple[Point, Point],
+    num_crossings: int,
+) -> List[float]:
+    """Time the frames drawn as the hero steps back and forth through the doorway"""
+    frame_times = []
+    for crossing in range(num_crossings + 1):
+        viewer.hero_party.set_pos(doorway[crossing % 2], Direction.SOUTH)
+        start_time = time.perf_counter()
+        game_map.draw()
+        frame_times.append(time.perf_counter() - start_time)
+
+    # The first frame is drawn before any crossing
+    return frame_times[1:]
+
+
+def benchmark_map(viewer: GameMapViewer, map_name: str, num_crossings: int) -> None:
+    try:
+        game_map = GameMap(viewer.mock_game_state, map_name)
+    except FileNotFoundError as e:
+        print(f"{map_name}: skipped, failed to load: {e}", flush=True)
+        return
+    doorway = find_doorway(game_map)
+    if doorway is None:
+        print(f"{map_name}: skipped, no doorway", flush=True)
+        return
+    viewer.hero_party.light_diameter = viewer.game_info.maps[map_name].light_diameter
+
+    results = []
+    for incremental_overlay_redraw in [False, True]:
+        game_map.incremental_overlay_redraw = incremental_overlay_redraw
+        frame_times = time_doorway_frames(viewer, game_map, doorway, num_crossings)
+        enter_times = frame_times[0::2]
+        leave_times = frame_times[1::2]
+        results.append(
+            f"{'incremental' if incremental_overlay_redraw else 'full'}: "
+            f"enter={sum(enter_times) / len(enter_times) * 1000:.2f}ms "
+            f"leave={sum(leave_times) / len(leave_times) * 1000:.2f}ms "
+            f"max={max(frame_times) * 1000:.2f}ms"
+        )
+    print(f"{map_name} doorway {doorway[0]}->{doorway[1]}: {'; '.join(results)}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare frame times walking through a doorway with full and incremental overlay redraws"
+    )
+    parser.add_argument(
+        "--crossings", type=int, default=20, help="Doorway crossings per map"
+    )
+    parser.add_argument(
+        "--game-xml",
+        default=None,
+        help="Game configuration xml file, relative to the base path.  Defaults to the licensed assets, falling back "
+        "to data/game.xml when they are missing.",
+    )
+    parser.add_argument(
+        "--include-legacy-maps",
+        action="store_true",
+        help="Also benchmark the maps which are not Tiled maps",
+    )
+    args = parser.parse_args()
+
+    # Map xml files are included relative to the base path
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+    os.chdir(base_path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    viewer = GameMapViewer(base_path, args.game_xml)
+    for map_name, map_info in viewer.game_info.maps.items():
+        if map_info.tiled_filename is not None or args.include_legacy_maps:
+            benchmark_map(viewer, map_name, args.crossings)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        import sys
+        import traceback
+
+        print(
+            traceback.format_exception(
+                None, e, e.__traceback__  # <- type(e) by docs, but ignored
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+        traceback.print_exc()
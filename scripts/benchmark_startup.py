@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+from typing import Any, Dict, List, Optional
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None  # type: ignore
+
+
+def get_peak_rss_kb() -> Optional[int]:
+    """Get the peak resident set size of this process and of its reaped children (the monster loaders), in KiB"""
+    if resource is None:
+        return None
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+    return peak_rss
+
+
+def measure_game_info(
+    base_path: str, game_xml: str, cache_path: Optional[str]
+) -> Dict[str, Any]:
+    """Construct a GameInfo headless, recording the wall time and peak RSS at the end of each phase"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import pygame
+
+    from generic_utils.point import Point
+    from pygame_utils.audio_player import AudioPlayer
+    from pydw.game_info import GameInfo
+
+    result: Dict[str, Any] = {
+        "game_xml": game_xml,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "cached": cache_path is not None,
+    }
+
+    # Match the window and tile sizes used by game.py
+    win_size_pixels = Point(1280, 720)
+    tile_size_pixels = 16 * 3
+    pygame.init()
+    pygame.display.set_mode(win_size_pixels.get_as_int_tuple())
+
+    phases: List[Dict[str, Any]] = []
+    start_time = time.perf_counter()
+    phase_start_time = start_time
+
+    def end_phase(phase_name: str) -> None:
+        nonlocal phase_start_time
+        end_time = time.perf_counter()
+        phases.append(
+            {
+                "name": phase_name,
+                "wall_time_s": end_time - phase_start_time,
+                "peak_rss_kb": get_peak_rss_kb(),
+            }
+        )
+        phase_start_time = end_time
+
+    GameInfo.cache_path = cache_path
+    GameInfo.phase_callback = end_phase
+    try:
+        GameInfo(
+            base_path,
+            os.path.join(base_path, game_xml),
+            tile_size_pixels,
+            win_size_pixels,
+        )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["total_wall_time_s"] = time.perf_counter() - start_time
+    GameInfo.phase_callback = None
+    AudioPlayer().terminate()
+
+    result["peak_rss_kb"] = get_peak_rss_kb()
+    result["phases"] = phases
+    return result
+
+
+def run_game_info_subprocess(
+    game_xml: str, cache_path: Optional[str]
+) -> Dict[str, Any]:
+    """Measure each game configuration in a fresh process so that peak RSS and warm caches are not shared"""
+    command = [sys.executable, __file__, "--measure", game_xml]
+    if cache_path is not None:
+        command += ["--cache-path", cache_path]
+    completed = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+    try:
+        return json.loads(completed.stdout.strip().splitlines()[-1])  # type: ignore
+    except (IndexError, ValueError):
+        return {
+            "game_xml": game_xml,
+            "error": f"Benchmark process exited with code {completed.returncode}",
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report the wall time and peak RSS of each phase of the headless construction of GameInfo as JSON"
+    )
+    parser.add_argument(
+        "game_xmls",
+        nargs="*",
+        default=[
+            os.path.join("data", "game.xml"),
+            os.path.join("data", "game_low_mem.xml"),
+            os.path.join("data", "game_licensed_assets.xml"),
+        ],
+        help="Game configuration xml files, relative to the base path",
+    )
+    parser.add_argument(
+        "--cache-path",
+        default=None,
+        help="Game info cache directory.  When specified each configuration is loaded twice, cold then warm.",
+    )
+    parser.add_argument(
+        "-o", "--output", default=None, help="Write the JSON results to this file"
+    )
+    parser.add_argument("--measure", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Map xml files are included relative to the base path
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+    os.chdir(base_path)
+
+    if args.measure is not None:
+        print(json.dumps(measure_game_info(base_path, args.measure, args.cache_path)), flush=True)
+        return
+
+    results = []
+    for game_xml in args.game_xmls:
+        results.append(run_game_info_subprocess(game_xml, None))
+        if args.cache_path is not None:
+            # Populate the cache, then measure the warm start
+            run_game_info_subprocess(game_xml, args.cache_path)
+            results.append(run_game_info_subprocess(game_xml, args.cache_path))
+
+    output = json.dumps({"results": results}, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    print(output, flush=True)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        import traceback
+
+        print(
+            traceback.format_exception(
+                None, e, e.__traceback__  # <- type(e) by docs, but ignored
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+        traceback.print_exc()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+from typing import Any, Dict, List
+
+import argparse
+import json
+import os
+import random
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run every dialog script of a game configuration headless, reporting what each displays and changes"
+    )
+    parser.add_argument(
+        "labels",
+        nargs="*",
+        help="Labels of the dialog scripts to run.  When omitted every dialog script is run.",
+    )
+    parser.add_argument(
+        "--game-xml",
+        default=os.path.join("data", "game.xml"),
+        help="Game configuration xml file, relative to the base path",
+    )
+    parser.add_argument(
+        "--pc-name", default="Hero", help="Name of the hero, as entered for a new game"
+    )
+    parser.add_argument(
+        "--menu-answer",
+        action="append",
+        default=[],
+        help="Menu option to choose, in order.  May be repeated.  The first option is chosen once these run out.",
+    )
+    parser.add_argument(
+        "--text-answer",
+        action="append",
+        default=[],
+        help="Text to enter when prompted, in order.  May be repeated.",
+    )
+    parser.add_argument(
+        "--max-menu-selections",
+        type=int,
+        default=32,
+        help="Stop a dialog script after this many menu selections",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed, so that dialog with random outcomes can be compared between runs",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Passes over the dialog scripts"
+    )
+    parser.add_argument(
+        "-o", "--output", default=None, help="Write the JSON results to this file"
+    )
+    parser.add_argument(
+        "--expected",
+        default=None,
+        help="JSON results of a previous run to compare against.  Exits with an error if any results differ.",
+    )
+    args = parser.parse_args()
+
+    # Xml files are included relative to the base path
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+    os.chdir(base_path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    from generic_utils.point import Point
+    from pygame_utils.audio_player import AudioPlayer
+    from pydw.game_info import GameInfo
+    from pydw.headless_dialog_evaluator import (
+        HeadlessDialogEvaluator,
+        HeadlessGameState,
+    )
+
+    # Match the window and tile sizes used by game.py
+    win_size_pixels = Point(1280, 720)
+    tile_size_pixels = 16 * 3
+    pygame.init()
+    pygame.display.set_mode(win_size_pixels.get_as_int_tuple())
+
+    game_info = GameInfo(
+        base_path,
+        os.path.join(base_path, args.game_xml),
+        tile_size_pixels,
+        win_size_pixels,
+    )
+    game_info.parse_initial_game_state(args.pc_name)
+
+    random.seed(args.seed)
+    labels = args.labels if 0 < len(args.labels) else list(game_info.dialog_sequences)
+    results: Dict[str, Dict[str, Any]] = {}
+    num_runs = 0
+    start_time = time.perf_counter()
+    for _ in range(args.repeat):
+        for label in labels:
+            # Every dialog script starts from the initial game state
+            game_state = HeadlessGameState(
+                game_info,
+                HeadlessGameState.create_initial_hero_party(game_info),
+                game_info.initial_map,
+            )
+            evaluator = HeadlessDialogEvaluator(
+                game_info,
+                game_state,
+                args.menu_answer,
+                args.text_answer,
+                max_menu_selections=args.max_menu_selections,
+            )
+            dialog_result = evaluator.run(game_info.dialog_sequences[label])
+            results[label] = dialog_result._asdict()
+            num_runs += 1
+    run_time = time.perf_counter() - start_time
+    AudioPlayer().terminate()
+
+    num_stopped = sum(1 for result in results.values() if result["stop_reason"])
+    print(
+        f"Ran {num_runs} dialog scripts in {run_time:.3f}s ({num_runs / max(run_time, 1e-9):.0f} scripts/s), "
+        f"{num_stopped} of {len(results)} stopped early",
+        flush=True,
+    )
+    for label, result in results.items():
+        if result["stop_reason"]:
+            print(f"  {label}: {result['stop_reason']}", flush=True)
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            output_file.write(json.dumps(results, indent=2) + "\n")
+
+    if args.expected is not None:
+        with open(args.expected) as expected_file:
+            expected_results = json.load(expected_file)
+        differences: List[str] = []
+        for label in sorted(set(results) | set(expected_results)):
+            if label not in expected_results:
+                differences.append(f"{label}: not in the expected results")
+            elif label not in results:
+                differences.append(f"{label}: not run")
+            elif results[label] != expected_results[label]:
+                differences.append(f"{label}: results differ from the expected results")
+        for difference in differences:
+            print(difference, flush=True)
+        if 0 < len(differences):
+            raise SystemExit(
+                f"{len(differences)} dialog scripts differ from the expected results"
+            )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        import sys
+        import traceback
+
+        print(
+            traceback.format_exception(
+                None, e, e.__traceback__  # <- type(e) by docs, but ignored
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+        traceback.print_exc()
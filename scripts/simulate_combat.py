@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+from typing import Any, Dict, List, Optional
+
+import argparse
+import json
+import os
+import random
+import time
+
+
+def parse_equipment(equipment: str) -> List[Optional[str]]:
+    """Parse equipment given as weapon,armor,shield where an empty name is no equipment"""
+    names: List[Optional[str]] = [
+        name if name != "" else None for name in equipment.split(",")
+    ]
+    return (names + [None, None, None])[:3]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Simulate battles between the hero and monsters, reporting the win rate, rounds to defeat the "
+        "monster and HP/MP left per hero level, equipment and monster"
+    )
+    parser.add_argument(
+        "--game-xml",
+        default=os.path.join("data", "game.xml"),
+        help="Game configuration xml file, relative to the base path",
+    )
+    parser.add_argument(
+        "--level",
+        action="append",
+        default=[],
+        help="Name of the hero level to simulate, such as 10.  May be repeated.  Defaults to every level.",
+    )
+    parser.add_argument(
+        "--equipment",
+        action="append",
+        default=[],
+        help="Hero equipment as weapon,armor,shield, such as 'Club,Leather Armor,'.  May be repeated.  Defaults to "
+        "the equipment of a new game.",
+    )
+    parser.add_argument(
+        "--monster",
+        action="append",
+        default=[],
+        help="Monster to simulate.  May be repeated.  Defaults to every monster.",
+    )
+    parser.add_argument(
+        "--battles", type=int, default=1000, help="Battles to simulate per combination"
+    )
+    parser.add_argument(
+        "--max-rounds",
+        type=int,
+        default=100,
+        help="Rounds after which a battle is counted as undecided",
+    )
+    parser.add_argument(
+        "--heal-spell", default=None, help="Spell the hero casts to heal when low on HP"
+    )
+    parser.add_argument(
+        "--heal-hp-ratio",
+        type=float,
+        default=0.25,
+        help="Health ratio at which the hero casts the heal spell",
+    )
+    parser.add_argument(
+        "--attack-spell", default=None, help="Spell the hero casts instead of fighting"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument(
+        "-o", "--output", default=None, help="Write the JSON results to this file"
+    )
+    args = parser.parse_args()
+
+    # Xml files are included relative to the base path
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+    os.chdir(base_path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    from generic_utils.point import Point
+    from pygame_utils.audio_player import AudioPlayer
+    from pydw.combat_simulator import (
+        CombatPolicy,
+        CombatSimulationSummary,
+        CombatSimulator,
+    )
+    from pydw.game_info import GameInfo
+
+    # Match the window and tile sizes used by game.py
+    win_size_pixels = Point(1280, 720)
+    tile_size_pixels = 16 * 3
+    pygame.init()
+    pygame.display.set_mode(win_size_pixels.get_as_int_tuple())
+
+    game_info = GameInfo(
+        base_path,
+        os.path.join(base_path, args.game_xml),
+        tile_size_pixels,
+        win_size_pixels,
+    )
+    random.seed(args.seed)
+
+    levels = game_info.character_types["hero"].levels
+    if 0 < len(args.level):
+        levels = [level for level in levels if level.name in args.level]
+        for level_name in sorted(set(args.level) - {level.name for level in levels}):
+            print(f"ERROR: No hero level named {level_name}", flush=True)
+    if 0 < len(args.equipment):
+        equipment_list = [parse_equipment(equipment) for equipment in args.equipment]
+    else:
+        game_info.parse_initial_game_state()
+        equipment_list = [
+            [
+                item.name if item is not None else None
+                for item in [
+                    game_info.pc_weapon,
+                    game_info.pc_armor,
+                    game_info.pc_shield,
+                ]
+            ]
+        ]
+    monsters = args.monster if 0 < len(args.monster) else list(game_info.monsters)
+
+    try:
+        simulator = CombatSimulator(
+            game_info,
+            CombatPolicy(args.heal_spell, args.heal_hp_ratio, args.attack_spell),
+            args.max_rounds,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}", flush=True)
+        AudioPlayer().terminate()
+        return
+    results: List[Dict[str, Any]] = []
+    num_battles = 0
+    start_time = time.perf_counter()
+    for level in levels:
+        for weapon, armor, shield in equipment_list:
+            for monster in monsters:
+                summary = simulator.simulate(
+                    level, weapon, armor, shield, monster, args.battles
+                )
+                num_battles += summary.num_battles
+                mean_rounds_to_kill = CombatSimulationSummary.get_mean(
+                    summary.rounds_to_kill
+                )
+                # There are no rounds to kill without any victories
+                rounds_to_kill_str = (
+                    "n/a"
+                    if mean_rounds_to_kill is None
+                    else f"{mean_rounds_to_kill:.1f}"
+                )
+                mean_hero_hp = CombatSimulationSummary.get_mean(summary.hero_hp)
+                mean_hero_mp = CombatSimulationSummary.get_mean(summary.hero_mp)
+                print(
+                    f"{level.name} ({weapon}, {armor}, {shield}) vs {monster}: "
+                    f"win rate {summary.get_win_rate():.1%}, "
+                    f"rounds to kill {rounds_to_kill_str}, "
+                    f"HP left {mean_hero_hp or 0:.1f}, MP left {mean_hero_mp or 0:.1f}",
+                    flush=True,
+                )
+                results.append(
+                    {
+                        "level": level.number,
+                        "level_name": level.name,
+                        "weapon": weapon,
+                        "armor": armor,
+                        "shield": shield,
+                        "monster": monster,
+                        "battles": summary.num_battles,
+                        "win_rate": summary.get_win_rate(),
+                        "outcomes": summary.outcomes,
+                        "rounds_to_kill": {
+                            "mean": mean_rounds_to_kill,
+                            "p50": CombatSimulationSummary.get_percentile(
+                                summary.rounds_to_kill, 50
+                            ),
+                            "p90": CombatSimulationSummary.get_percentile(
+                                summary.rounds_to_kill, 90
+                            ),
+                            "histogram": summary.rounds_to_kill,
+                        },
+                        "hero_hp": {
+                            "mean": mean_hero_hp,
+                            "histogram": summary.hero_hp,
+                        },
+                        "hero_mp": {
+                            "mean": mean_hero_mp,
+                            "histogram": summary.hero_mp,
+                        },
+                    }
+                )
+    run_time = time.perf_counter() - start_time
+    AudioPlayer().terminate()
+    print(
+        f"Simulated {num_battles} battles in {run_time:.3f}s ({num_battles / max(run_time, 1e-9):.0f} battles/s)",
+        flush=True,
+    )
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            output_file.write(json.dumps({"results": results}, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        import sys
+        import traceback
+
+        print(
+            traceback.format_exception(
+                None, e, e.__traceback__  # <- type(e) by docs, but ignored
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+        traceback.print_exc()
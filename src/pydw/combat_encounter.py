@@ -600,6 +600,14 @@ class CombatEncounter(CombatEncounterInterface):
             # If here the turn was successfully completed
             break
 
+        self.perform_hero_action(hero, use_dialog, target_type)
+
+    def perform_hero_action(
+        self,
+        hero: HeroState,
+        use_dialog: Optional[DialogType],
+        target_type: Optional[TargetTypeEnum],
+    ) -> None:
         if use_dialog is None or target_type is None:
             self.add_message("Thou held back in defense.")
             return
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+
+# Imports to support type annotations
+from __future__ import annotations
+from typing import cast, Dict, List, NamedTuple, Optional
+
+from collections import Counter
+from enum import Enum
+
+import pygame
+
+from generic_utils.point import Point
+
+from pygame_utils.audio_player import AudioPlayer
+
+from pydw.combat_character_state import CombatCharacterState
+from pydw.combat_encounter import CombatEncounter
+from pydw.game_dialog import GameDialog
+from pydw.game_info import GameInfo
+from pydw.game_types import Direction, Level, MonsterInfo, Spell
+from pydw.headless_dialog_evaluator import (
+    HeadlessDialogEvaluator,
+    HeadlessDialogStop,
+    HeadlessGameState,
+    HeadlessMessageDialog,
+)
+from pydw.hero_party import HeroParty
+from pydw.hero_state import HeroState
+from pydw.monster_party import MonsterParty
+from pydw.monster_state import MonsterState
+
+
+class CombatOutcome(Enum):
+    VICTORY = 1
+    DEFEAT = 2
+    MONSTER_RAN_AWAY = 3
+    # The battle was not over after the maximum number of rounds
+    UNDECIDED = 4
+    # The battle needed input which a simulation cannot provide, such as the answer to a math problem
+    STOPPED = 5
+
+
+class CombatPolicy(NamedTuple):
+    """How the simulated hero acts on each turn.  The hero fights unless a spell is cast."""
+
+    # Spell cast once the hero's health ratio drops to heal_hp_ratio, while there is enough MP
+    heal_spell: Optional[str] = None
+    heal_hp_ratio: float = 0.25
+    # Spell cast instead of fighting, while there is enough MP
+    attack_spell: Optional[str] = None
+
+
+class CombatSimulationResult(NamedTuple):
+    outcome: CombatOutcome
+    rounds: int
+    hero_hp: int
+    hero_mp: int
+
+
+class CombatSimulationSummary(NamedTuple):
+    level: Level
+    weapon: Optional[str]
+    armor: Optional[str]
+    shield: Optional[str]
+    monster: str
+    num_battles: int
+    # Histograms keyed by the outcome name, the rounds to defeat the monster, or the HP or MP left at the end of a
+    # battle
+    outcomes: Dict[str, int]
+    rounds_to_kill: Dict[int, int]
+    hero_hp: Dict[int, int]
+    hero_mp: Dict[int, int]
+
+    def get_win_rate(self) -> float:
+        if 0 == self.num_battles:
+            return 0.0
+        return self.outcomes.get(CombatOutcome.VICTORY.name, 0) / self.num_battles
+
+    @staticmethod
+    def get_mean(histogram: Dict[int, int]) -> Optional[float]:
+        count = sum(histogram.values())
+        if 0 == count:
+            return None
+        return (
+            sum(value * value_count for value, value_count in histogram.items())
+            / count
+        )
+
+    @staticmethod
+    def get_percentile(histogram: Dict[int, int], percentile: float) -> Optional[int]:
+        count = sum(histogram.values())
+        if 0 == count:
+            return None
+        threshold = percentile / 100 * count
+        cumulative_count = 0
+        for value in sorted(histogram):
+            cumulative_count += histogram[value]
+            if cumulative_count >= threshold:
+                return value
+        return max(histogram)
+
+
+class SimulatedCombatEncounter(CombatEncounter):
+    """
+    A CombatEncounter between a hero and a single monster which is played out without rendering, audio or waiting
+    for input.  The turn order, monster turns, running away and the actions of the hero and the monster all use the
+    CombatEncounter rules, with the hero choosing actions by a CombatPolicy rather than from the encounter menu.
+    """
+
+    def __init__(
+        self,
+        game_info: GameInfo,
+        game_state: HeadlessGameState,
+        policy: CombatPolicy = CombatPolicy(),
+        max_rounds: int = 100,
+    ) -> None:
+        # CombatEncounter.__init__ is not called as it renders the encounter background
+        self.is_first_turn = True
+        self.game_info = game_info
+        self.game_state = game_state
+        self.hero_party = game_state.get_hero_party()
+        self.monster_party = MonsterParty()
+        self.approach_dialog = None
+        self.victory_dialog = None
+        self.run_away_dialog = None
+        self.encounter_music = ""
+        self.message_dialog = cast(GameDialog, HeadlessMessageDialog())
+        self.headless_gde = HeadlessDialogEvaluator(game_info, game_state)
+        self.headless_gde.set_combat_encounter(self)
+        self.gde = self.headless_gde
+        self.policy = policy
+        self.max_rounds = max_rounds
+        game_state.in_combat = True
+
+    def simulate(self, monster_info: MonsterInfo) -> CombatSimulationResult:
+        """Fight a battle against the monster, starting with the hero at full HP and MP"""
+        hero = self.hero_party.main_character
+        hero.hp = hero.max_hp
+        hero.mp = hero.max_mp
+        self.hero_party.clear_combat_status_affects()
+        self.monster_party = MonsterParty([monster_info])
+        self.is_first_turn = True
+        self.message_dialog.clear()
+        self.headless_gde.messages = []
+        self.headless_gde.num_instructions = 0
+        self.headless_gde.events.clear()
+
+        rounds = 0
+        try:
+            # Check if the monster runs away at the start of the encounter
+            for monster in self.monster_party.members:
+                if monster.is_still_in_combat() and monster.should_run_away(hero):
+                    monster.has_run_away = True
+
+            while self.still_in_encounter() and rounds < self.max_rounds:
+                rounds += 1
+                for combatant in self.get_turn_order():
+                    if combatant.is_still_in_combat():
+                        if isinstance(combatant, MonsterState):
+                            self.execute_monster_turn(combatant)
+                        elif isinstance(combatant, HeroState):
+                            self.execute_player_turn(combatant)
+                        if not self.still_in_encounter():
+                            break
+        except HeadlessDialogStop:
+            return CombatSimulationResult(
+                CombatOutcome.STOPPED, rounds, hero.hp, hero.mp
+            )
+
+        if not self.hero_party.has_surviving_members():
+            outcome = CombatOutcome.DEFEAT
+        elif 0 < self.monster_party.get_defeated_count():
+            outcome = CombatOutcome.VICTORY
+        elif not self.monster_party.is_still_in_combat():
+            outcome = CombatOutcome.MONSTER_RAN_AWAY
+        else:
+            outcome = CombatOutcome.UNDECIDED
+        return CombatSimulationResult(outcome, rounds, hero.hp, hero.mp)
+
+    def choose_spell(self, hero: HeroState) -> Optional[Spell]:
+        if (
+            self.policy.heal_spell is not None
+            and hero.hp <= hero.max_hp * self.policy.heal_hp_ratio
+        ):
+            spell = hero.get_spell(self.policy.heal_spell)
+            if spell is not None and hero.mp >= spell.mp:
+                return spell
+        if self.policy.attack_spell is not None:
+            spell = hero.get_spell(self.policy.attack_spell)
+            if spell is not None and hero.mp >= spell.mp:
+                return spell
+        return None
+
+    def execute_player_turn(self, hero: HeroState) -> None:
+        # Check if the hero wakes up
+        self.check_wake_up(hero)
+        if hero.is_asleep:
+            return
+
+        spell = self.choose_spell(hero)
+        if spell is not None:
+            hero.mp -= spell.mp
+            self.perform_hero_action(hero, spell.use_dialog, spell.target_type)
+        else:
+            weapon = self.game_info.default_weapon
+            if hero.weapon is not None:
+                weapon = hero.weapon
+            self.perform_hero_action(hero, weapon.use_dialog, weapon.target_type)
+
+    def render_monsters(
+        self,
+        flicker_image_monsters: Optional[List[CombatCharacterState]] = None,
+        force_display_monsters: Optional[List[CombatCharacterState]] = None,
+        render_background: bool = True,
+        render_dialogs: bool = True,
+        flicker_color: pygame.Color = pygame.Color("red"),
+    ) -> None:
+        pass
+
+    def render_damage_to_targets(self, targets: List[CombatCharacterState]) -> None:
+        pass
+
+    def add_message(self, message: str) -> None:
+        pass
+
+    def wait_for_acknowledgement(self) -> None:
+        pass
+
+
+class CombatSimulator:
+    """
+    Runs Monte Carlo simulations of battles between a hero of a given level and equipment and a monster, using the
+    monster, level and equipment data of a GameInfo.  Sounds are muted while simulating.
+    """
+
+    def __init__(
+        self,
+        game_info: GameInfo,
+        policy: CombatPolicy = CombatPolicy(),
+        max_rounds: int = 100,
+    ) -> None:
+        self.game_info = game_info
+        self.policy = policy
+        self.max_rounds = max_rounds
+
+        # Fail up front on a misspelled spell rather than silently having the hero fight instead
+        for spell_name in (policy.heal_spell, policy.attack_spell):
+            if spell_name is not None and spell_name not in game_info.spells:
+                raise ValueError(f"Unknown spell in combat policy: {spell_name}")
+
+    def create_hero_party(
+        self,
+        level: Level,
+        weapon: Optional[str] = None,
+        armor: Optional[str] = None,
+        shield: Optional[str] = None,
+    ) -> HeroParty:
+        hero = HeroState(
+            self.game_info.character_types["hero"],
+            Point(0, 0),
+            Direction.SOUTH,
+            "Hero",
+            level.xp,
+        )
+        if weapon is not None:
+            hero.weapon = self.game_info.weapons[weapon]
+        if armor is not None:
+            hero.armor = self.game_info.armors[armor]
+        if shield is not None:
+            hero.shield = self.game_info.shields[shield]
+        return HeroParty(hero)
+
+    def simulate(
+        self,
+        level: Level,
+        weapon: Optional[str],
+        armor: Optional[str],
+        shield: Optional[str],
+        monster: str,
+        num_battles: int,
+    ) -> CombatSimulationSummary:
+        game_state = HeadlessGameState(
+            self.game_info,
+            self.create_hero_party(level, weapon, armor, shield),
+            self.game_info.initial_map,
+        )
+        encounter = SimulatedCombatEncounter(
+            self.game_info, game_state, self.policy, self.max_rounds
+        )
+        monster_info = self.game_info.monsters[monster]
+
+        outcomes: Counter[str] = Counter()
+        rounds_to_kill: Counter[int] = Counter()
+        hero_hp: Counter[int] = Counter()
+        hero_mp: Counter[int] = Counter()
+        audio_player = AudioPlayer()
+        audio_player.set_sounds_muted(True)
+        try:
+            for _ in range(num_battles):
+                result = encounter.simulate(monster_info)
+                outcomes[result.outcome.name] += 1
+                if CombatOutcome.VICTORY == result.outcome:
+                    rounds_to_kill[result.rounds] += 1
+                hero_hp[result.hero_hp] += 1
+                hero_mp[result.hero_mp] += 1
+        finally:
+            audio_player.set_sounds_muted(False)
+
+        return CombatSimulationSummary(
+            level,
+            weapon,
+            armor,
+            shield,
+            monster,
+            num_battles,
+            dict(outcomes),
+            dict(rounds_to_kill),
+            dict(hero_hp),
+            dict(hero_mp),
+        )
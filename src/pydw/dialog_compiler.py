@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+from collections import OrderedDict
+from enum import Enum
+import re
+
+from pydw.game_types import (
+    DialogAction,
+    DialogCheck,
+    DialogGoTo,
+    DialogType,
+    DialogVariable,
+    DialogVendorBuyOptions,
+    DialogVendorBuyOptionsVariable,
+    DialogVendorSellOptions,
+    DialogVendorSellOptionsVariable,
+)
+
+
+class DialogTemplate:
+    """
+    Dialog text split into literal text and the replacement variables, such as [NAME], which it references.
+    Substituting variables into a template only visits the variables referenced by the text rather than every
+    replacement variable which is defined.
+    """
+
+    VARIABLE_REGEX = re.compile(r"(\[[^\[\]]+\])")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        # Literal text is at the even indices and variables are at the odd indices
+        self.segments = DialogTemplate.VARIABLE_REGEX.split(text)
+        self.variables = tuple(self.segments[1::2])
+
+    def references_any(self, variables: Mapping[str, Any]) -> bool:
+        for variable in self.variables:
+            if variable in variables:
+                return True
+        return False
+
+    def substitute(self, variables: Mapping[str, Any]) -> str:
+        if not self.references_any(variables):
+            return self.text
+        segments = list(self.segments)
+        for index in range(1, len(segments), 2):
+            if segments[index] in variables:
+                segments[index] = str(variables[segments[index]])
+        return "".join(segments)
+
+
+class DialogOpcode(Enum):
+    TEXT = 1
+    CALL = 2
+    VARIABLE = 3
+    VENDOR_BUY_OPTIONS_VARIABLE = 4
+    VENDOR_SELL_OPTIONS_VARIABLE = 5
+    OPTIONS = 6
+    VENDOR_BUY_OPTIONS = 7
+    VENDOR_SELL_OPTIONS = 8
+    CHECK = 9
+    ACTION = 10
+
+
+class DialogInstruction(NamedTuple):
+    opcode: DialogOpcode
+    # The parsed dialog item, such as a DialogCheck or a DialogAction, from which the instruction was compiled
+    item: Any = None
+    # The text of a TEXT instruction or the name of a CHECK or ACTION instruction
+    template: Optional[DialogTemplate] = None
+    # The count of a CHECK or ACTION instruction, when it references replacement variables
+    count_template: Optional[DialogTemplate] = None
+    # The dialog called by a CALL instruction or by a CHECK instruction depending on the check result
+    dialog: Optional["CompiledDialog"] = None
+    # The dialog called for each option of an OPTIONS instruction, or None for an option with no dialog
+    options: Optional[Dict[str, Optional["CompiledDialog"]]] = None
+
+
+class CompiledDialog:
+    """
+    Dialog lowered to a flat list of instructions.  Nested dialog and the dialog sequences named by DialogGoTo are
+    referenced directly by CALL instructions rather than being looked up by label as the dialog is traversed.
+    """
+
+    def __init__(self, label: Optional[str] = None) -> None:
+        self.label = label
+        self.instructions: List[DialogInstruction] = []
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.label!r}, {len(self.instructions)} instructions)"
+
+
+class DialogCompiler:
+    """
+    Compiles dialog as parsed by GameInfo.parse_dialog into CompiledDialog.
+
+    The labeled dialog sequences are compiled once and shared by every dialog which goes to them, which allows a
+    sequence to go to itself.  Other dialog is compiled on first use and the result is cached for the most recently
+    used dialog.
+    """
+
+    def __init__(
+        self, dialog_sequences: Dict[str, DialogType], max_cached_dialogs: int = 256
+    ) -> None:
+        self.dialog_sequences = dialog_sequences
+        self.max_cached_dialogs = max_cached_dialogs
+        self.sequences: Dict[str, Tuple[DialogType, CompiledDialog]] = {}
+        # Keyed by the id of the dialog, which stays valid as the cache holds a reference to the dialog
+        self.cached_dialogs: "OrderedDict[int, Tuple[DialogType, CompiledDialog]]" = (
+            OrderedDict()
+        )
+        self.missing_labels: Set[str] = set()
+
+    def compile_sequences(self, referenced_labels: Iterable[str] = ()) -> Set[str]:
+        """
+        Compile all of the labeled dialog sequences and resolve the labels gone to by any other dialog, reporting any
+        DialogGoTo for which there is no sequence.
+
+        :param referenced_labels: The labels of the DialogGoTo in dialog other than the labeled dialog sequences, such
+          as NPC or item use dialog, which is otherwise only compiled on first use
+        :return: The labels which were referenced but not found
+        """
+        for label in list(self.dialog_sequences):
+            self.get_sequence(label)
+        for label in sorted(set(referenced_labels)):
+            self.get_sequence(label)
+        return self.missing_labels
+
+    def get_sequence(self, label: str) -> Optional[CompiledDialog]:
+        dialog = self.dialog_sequences.get(label)
+        if dialog is None:
+            if label not in self.missing_labels:
+                print("ERROR: " + label + " not found in dialogSequences", flush=True)
+                self.missing_labels.add(label)
+            return None
+
+        sequence = self.sequences.get(label)
+        if sequence is not None and sequence[0] is dialog:
+            return sequence[1]
+
+        # Register the sequence before compiling it so that a go to back to the sequence resolves to it
+        compiled_dialog = CompiledDialog(label)
+        self.sequences[label] = (dialog, compiled_dialog)
+        self.compile_instructions(dialog, compiled_dialog)
+        return compiled_dialog
+
+    def compile(self, dialog: Union[DialogType, str]) -> CompiledDialog:
+        if isinstance(dialog, str):
+            compiled_dialog = CompiledDialog()
+            self.compile_instructions([dialog], compiled_dialog)
+            return compiled_dialog
+
+        key = id(dialog)
+        cached_dialog = self.cached_dialogs.get(key)
+        if cached_dialog is not None and cached_dialog[0] is dialog:
+            self.cached_dialogs.move_to_end(key)
+            return cached_dialog[1]
+
+        compiled_dialog = CompiledDialog()
+        self.compile_instructions(dialog, compiled_dialog)
+        self.cached_dialogs[key] = (dialog, compiled_dialog)
+        while len(self.cached_dialogs) > self.max_cached_dialogs:
+            self.cached_dialogs.popitem(last=False)
+        return compiled_dialog
+
+    def compile_nested(self, dialog: Optional[DialogType]) -> Optional[CompiledDialog]:
+        if not dialog:
+            return None
+        compiled_dialog = CompiledDialog()
+        self.compile_instructions(dialog, compiled_dialog)
+        return compiled_dialog
+
+    def compile_instructions(
+        self, dialog: DialogType, compiled_dialog: CompiledDialog
+    ) -> None:
+        instructions = compiled_dialog.instructions
+        for item in dialog:
+            if isinstance(item, str):
+                instructions.append(
+                    DialogInstruction(DialogOpcode.TEXT, item, DialogTemplate(item))
+                )
+
+            elif isinstance(item, list):
+                instructions.append(
+                    DialogInstruction(
+                        DialogOpcode.CALL, item, dialog=self.compile_nested(item)
+                    )
+                )
+
+            elif isinstance(item, DialogGoTo):
+                sequence = self.get_sequence(item.label)
+                if sequence is not None:
+                    instructions.append(
+                        DialogInstruction(DialogOpcode.CALL, item, dialog=sequence)
+                    )
+
+            elif isinstance(item, DialogVariable):
+                instructions.append(DialogInstruction(DialogOpcode.VARIABLE, item))
+
+            elif isinstance(item, DialogVendorBuyOptionsVariable):
+                instructions.append(
+                    DialogInstruction(DialogOpcode.VENDOR_BUY_OPTIONS_VARIABLE, item)
+                )
+
+            elif isinstance(item, DialogVendorSellOptionsVariable):
+                instructions.append(
+                    DialogInstruction(DialogOpcode.VENDOR_SELL_OPTIONS_VARIABLE, item)
+                )
+
+            elif isinstance(item, dict):
+                instructions.append(
+                    DialogInstruction(
+                        DialogOpcode.OPTIONS,
+                        item,
+                        options={
+                            option: self.compile_nested(option_dialog)
+                            for option, option_dialog in item.items()
+                        },
+                    )
+                )
+
+            elif isinstance(item, DialogVendorBuyOptions):
+                instructions.append(
+                    DialogInstruction(DialogOpcode.VENDOR_BUY_OPTIONS, item)
+                )
+
+            elif isinstance(item, DialogVendorSellOptions):
+                instructions.append(
+                    DialogInstruction(DialogOpcode.VENDOR_SELL_OPTIONS, item)
+                )
+
+            elif isinstance(item, DialogCheck):
+                instructions.append(
+                    DialogInstruction(
+                        DialogOpcode.CHECK,
+                        item,
+                        DialogTemplate(str(item.name)),
+                        DialogCompiler.compile_count(item.count),
+                        self.compile_nested(item.dialog),
+                    )
+                )
+
+            elif isinstance(item, DialogAction):
+                instructions.append(
+                    DialogInstruction(
+                        DialogOpcode.ACTION,
+                        item,
+                        DialogTemplate(str(item.name)),
+                        DialogCompiler.compile_count(item.count),
+                    )
+                )
+
+            else:
+                print("ERROR: Not a supported type", item, flush=True)
+
+    @staticmethod
+    def compile_count(count: Union[int, str]) -> Optional[DialogTemplate]:
+        if isinstance(count, str):
+            count_template = DialogTemplate(count)
+            if 0 < len(count_template.variables):
+                return count_template
+        return None
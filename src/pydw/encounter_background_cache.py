@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+from typing import Dict, Iterable, Optional
+
+from collections import OrderedDict
+import concurrent.futures
+import threading
+
+import pygame
+
+
+class EncounterBackgroundCache:
+    """
+    Least recently used cache of encounter background images, which are loaded from disk the first time they are used.
+
+    Images are evicted once the size of the cached images exceeds max_bytes, though the most recently used image is
+    always retained.  Images may also be decoded ahead of use on a background thread (see prefetch).
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.images: "OrderedDict[str, pygame.surface.Surface]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="EncounterBackgroundCache"
+        )
+        self.futures: Dict[str, concurrent.futures.Future[None]] = {}
+
+    def get(self, image_path: str) -> pygame.surface.Surface:
+        with self.lock:
+            image = self.images.get(image_path)
+            if image is not None:
+                self.hits += 1
+                self.images.move_to_end(image_path)
+                return image
+            self.misses += 1
+            future = self.futures.pop(image_path, None)
+
+        # Pick up an image being decoded in the background rather than loading it a second time
+        if future is not None and not future.cancel():
+            concurrent.futures.wait([future])
+            with self.lock:
+                image = self.images.get(image_path)
+            if image is not None:
+                return image
+
+        image = pygame.image.load(image_path)
+        self.put(image_path, image)
+        return image
+
+    def put(self, image_path: str, image: pygame.surface.Surface) -> None:
+        with self.lock:
+            if image_path in self.images:
+                self.size_bytes -= EncounterBackgroundCache.get_size_bytes(
+                    self.images.pop(image_path)
+                )
+            self.images[image_path] = image
+            self.size_bytes += EncounterBackgroundCache.get_size_bytes(image)
+            while self.size_bytes > self.max_bytes and 1 < len(self.images):
+                _, evicted_image = self.images.popitem(last=False)
+                self.size_bytes -= EncounterBackgroundCache.get_size_bytes(
+                    evicted_image
+                )
+                self.evictions += 1
+
+    def prefetch(self, image_paths: Iterable[str]) -> None:
+        """Decode the images on a background thread so that they are cached before they are needed"""
+        with self.lock:
+            for image_path in image_paths:
+                if image_path in self.images:
+                    continue
+                future = self.futures.get(image_path)
+                if future is not None and not future.done():
+                    continue
+                self.futures[image_path] = self.executor.submit(
+                    self.load, image_path
+                )
+
+    def load(self, image_path: str) -> None:
+        try:
+            self.put(image_path, pygame.image.load(image_path))
+        except Exception as exc:
+            print(
+                f"ERROR: Failed to load encounter background {image_path}: {exc}",
+                flush=True,
+            )
+        finally:
+            with self.lock:
+                self.futures.pop(image_path, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.images.clear()
+            self.size_bytes = 0
+
+    @staticmethod
+    def get_size_bytes(image: pygame.surface.Surface) -> int:
+        return image.get_width() * image.get_height() * image.get_bytesize()
+
+
+# Cache shared by all encounter backgrounds, which is created on first use so that importing the game types does not
+# start a background thread
+_encounter_background_cache: Optional[EncounterBackgroundCache] = None
+_encounter_background_cache_lock = threading.Lock()
+
+
+def get_encounter_background_cache() -> EncounterBackgroundCache:
+    global _encounter_background_cache
+    with _encounter_background_cache_lock:
+        if _encounter_background_cache is None:
+            _encounter_background_cache = EncounterBackgroundCache()
+        return _encounter_background_cache
@@ -108,6 +108,13 @@ def main() -> None:
         default=None,
         help="Window height - should be specified alongside --width",
     )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        default=True,
+        help="Parse the game configuration without using or updating the game info cache",
+    )
     parser.add_argument("save", nargs="?", help="Load a specific saved game file")
     args = parser.parse_args()
     # print('args =', args, flush=True)
@@ -228,6 +235,20 @@ def main() -> None:
     elif args.verbose:
         print("Running with a save path of", saves_path, flush=True)
 
+    # Identify the path for the cached game info
+    cache_path_found, cache_path = get_writeable_application_path(
+        application_path, application_name, "cache"
+    )
+    if not args.use_cache:
+        cache_path_found = False
+    elif not cache_path_found:
+        print(
+            "ERROR: Failed to identify a cache path to which the current user has write access",
+            flush=True,
+        )
+    elif args.verbose:
+        print("Running with a cache path of", cache_path, flush=True)
+
     os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = (
         "1"  # Silence pygame outputs to standard out
     )
@@ -235,6 +256,7 @@ def main() -> None:
     from generic_utils.point import Point
     from pygame_utils.audio_player import AudioPlayer
     from pydw.game_dialog import GameDialog
+    from pydw.game_info import GameInfo
     from pydw.game_loop import GameLoop
 
     pygame.init()
@@ -249,6 +271,8 @@ def main() -> None:
             print("ERROR: Failed to load", icon_image_filename, flush=True)
 
     GameDialog.force_use_menus_for_text_entry = args.gamepad
+    if cache_path_found:
+        GameInfo.cache_path = cache_path
 
     # Initialize the game
     win_size_pixels: Optional[Point] = None  # Point(2560, 1340)
@@ -2,8 +2,9 @@
 
 # Imports to support type annotations
 from __future__ import annotations
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from collections import OrderedDict
 from enum import Enum
 import math
 import os
@@ -53,6 +54,25 @@ class GameDialog:
     selection_indicator_pixels = 16
     border_image: Optional[pygame.surface.Surface] = None
 
+    # The most recently created persistent status dialog and the status it displays
+    persistent_status_dialog: Optional[GameDialog] = None
+    persistent_status_dialog_key: Optional[Tuple[Any, ...]] = None
+
+    # Least recently used cache of rendered text surfaces keyed by (text, color, anti_alias)
+    rendered_text_cache: OrderedDict[
+        Tuple[str, Tuple[int, ...], bool], pygame.surface.Surface
+    ] = OrderedDict()
+    max_rendered_text_cache_entries = 512
+    rendered_text_cache_hits = 0
+    rendered_text_cache_misses = 0
+
+    # Widths of words in pixels and least recently used cache of messages wrapped to a width in pixels
+    word_width_cache: Dict[str, int] = {}
+    wrapped_message_cache: OrderedDict[Tuple[str, int], Tuple[str, ...]] = (
+        OrderedDict()
+    )
+    max_wrapped_message_cache_entries = 256
+
     @staticmethod
     def static_init(
         win_size_tiles: Point,
@@ -147,6 +167,7 @@ class GameDialog:
             return pygame.font.Font(font_name, font_size)
 
         GameDialog.font = create_font(font_name)
+        GameDialog.clear_rendered_text_cache()
 
         # Determine the widest character
         for character in GameDialog.get_all_characters():
@@ -238,11 +259,45 @@ class GameDialog:
 
     @staticmethod
     def render_font(text: str, color: pygame.Color) -> pygame.surface.Surface:
+        # The returned surface is shared through the cache and must only be blitted, never drawn on
+        key = (text, tuple(color), GameDialog.anti_alias)
+        font_surface = GameDialog.rendered_text_cache.get(key)
+        if font_surface is not None:
+            GameDialog.rendered_text_cache_hits += 1
+            GameDialog.rendered_text_cache.move_to_end(key)
+            return font_surface
+        GameDialog.rendered_text_cache_misses += 1
+
         if text in GameDialog.UNICODE_CHARACTERS:
-            return GameDialog.render_unicode_character(text, color)
-        return GameDialog.get_font().render(
-            text, GameDialog.anti_alias, color, pygame.Color("black")
+            font_surface = GameDialog.render_unicode_character(text, color)
+        else:
+            font_surface = GameDialog.get_font().render(
+                text, GameDialog.anti_alias, color, pygame.Color("black")
+            )
+
+        GameDialog.rendered_text_cache[key] = font_surface
+        while (
+            len(GameDialog.rendered_text_cache)
+            > GameDialog.max_rendered_text_cache_entries
+        ):
+            GameDialog.rendered_text_cache.popitem(last=False)
+        return font_surface
+
+    @staticmethod
+    def get_rendered_text_cache_hit_rate() -> float:
+        lookups = (
+            GameDialog.rendered_text_cache_hits
+            + GameDialog.rendered_text_cache_misses
         )
+        if 0 == lookups:
+            return 0.0
+        return GameDialog.rendered_text_cache_hits / lookups
+
+    @staticmethod
+    def clear_rendered_text_cache() -> None:
+        GameDialog.rendered_text_cache.clear()
+        GameDialog.word_width_cache.clear()
+        GameDialog.wrapped_message_cache.clear()
 
     @staticmethod
     def render_unicode_character(
@@ -368,6 +423,8 @@ class GameDialog:
         self.initialize_image()
 
         self.displayed_message_lines: List[str] = []
+        # The message lines drawn on the image when it can be updated a line at a time, else None
+        self.rendered_message_lines: Optional[List[str]] = None
         self.remainder_of_current_line: str = ""
         self.remaining_message_lines: List[str] = []
         self.acknowledged = True
@@ -608,6 +665,10 @@ class GameDialog:
 
     @staticmethod
     def create_persistent_status_dialog(party: HeroParty) -> GameDialog:
+        """
+        The persistent status dialog is drawn every frame, so the dialog is reused until the displayed status or the
+        dialog font color changes.  The returned dialog must not be modified.
+        """
         title: Optional[str] = None
         if 1 == len(party.combat_members):
             title = party.main_character.name
@@ -626,9 +687,22 @@ class GameDialog:
                 status_data[2].append(str(member.hp))
                 status_data[3].append(str(member.mp))
 
-        return GameDialog.create_status_dialog(
-            Point(1, 1), None, title, status_data, spacing_type=spacing_type
+        key = (
+            title,
+            spacing_type,
+            tuple(tuple(row) for row in status_data),
+            tuple(GameDialog.default_font_color),
+            GameDialog.tile_size_pixels,
         )
+        if (
+            GameDialog.persistent_status_dialog is None
+            or GameDialog.persistent_status_dialog_key != key
+        ):
+            GameDialog.persistent_status_dialog = GameDialog.create_status_dialog(
+                Point(1, 1), None, title, status_data, spacing_type=spacing_type
+            )
+            GameDialog.persistent_status_dialog_key = key
+        return GameDialog.persistent_status_dialog
 
     @staticmethod
     def create_exploring_status_dialog(party: HeroParty) -> GameDialog:
@@ -711,33 +785,63 @@ class GameDialog:
             row_data,
         )
 
+    @staticmethod
+    def get_word_width(word: str) -> int:
+        word_width = GameDialog.word_width_cache.get(word)
+        if word_width is None:
+            word_width = int(GameDialog.font.size(word)[0])
+            GameDialog.word_width_cache[word] = word_width
+        return word_width
+
     @staticmethod
     def convert_message_to_lines(message: Optional[str], width_px: int) -> List[str]:
-        lines: List[str] = []
         if message is None:
-            return lines
+            return []
+        key = (message, width_px)
+        lines = GameDialog.wrapped_message_cache.get(key)
+        if lines is not None:
+            GameDialog.wrapped_message_cache.move_to_end(key)
+            return list(lines)
+
+        lines = tuple(GameDialog.wrap_message(message, width_px))
+        GameDialog.wrapped_message_cache[key] = lines
+        while (
+            len(GameDialog.wrapped_message_cache)
+            > GameDialog.max_wrapped_message_cache_entries
+        ):
+            GameDialog.wrapped_message_cache.popitem(last=False)
+        return list(lines)
+
+    @staticmethod
+    def wrap_message(message: str, width_px: int) -> List[str]:
+        """
+        Wrap each line of the message in a single pass, measuring the width of a line as the sum of the widths of its
+        words and the spaces between them rather than measuring the whole line each time a word is added.
+        """
+        lines: List[str] = []
+        max_line_width = width_px - 2 * GameDialog.outside_spacing_pixels
+        space_width = GameDialog.get_word_width(" ")
         for line in message.split("\n"):
             line_to_display = ""
+            line_to_display_width = 0
             for word in line.split(" "):
-                # print('word =', word, flush=True)
+                word_width = GameDialog.get_word_width(word)
                 if line_to_display == "":
                     line_to_evaluate = word
+                    line_to_evaluate_width = word_width
                 else:
                     line_to_evaluate = line_to_display + " " + word
-                line_to_evaluate_size = Point(GameDialog.font.size(line_to_evaluate))
-                # print('line_to_evaluate =', line_to_evaluate, flush=True)
-                if (
-                    line_to_evaluate_size[0] + 2 * GameDialog.outside_spacing_pixels
-                    <= width_px
-                ):
+                    line_to_evaluate_width = (
+                        line_to_display_width + space_width + word_width
+                    )
+                if line_to_evaluate_width <= max_line_width:
                     line_to_display = line_to_evaluate
-                    # print('line_to_display =', line_to_display, flush=True)
+                    line_to_display_width = line_to_evaluate_width
                 else:
                     lines.append(line_to_display)
                     line_to_display = word
-                    # print('line_to_display =', line_to_display, flush=True)
-            if line_to_display is not None:
-                lines.append(line_to_display)
+                    line_to_display_width = word_width
+            lines.append(line_to_display)
         return lines
 
     def add_message(
@@ -843,6 +947,7 @@ class GameDialog:
 
     def clear(self) -> None:
         self.displayed_message_lines = []
+        self.rendered_message_lines = None
         self.remainder_of_current_line = ""
         self.remaining_message_lines = []
         self.row_data = None
@@ -888,6 +993,11 @@ class GameDialog:
             self.remainder_of_current_line = self.remainder_of_current_line[
                 characters_to_advance:
             ]
+
+            # Only the last line changed so there is no need to redraw the whole dialog
+            self.refresh_last_line()
+            self.acknowledged = False
+            return False, was_in_quotation or self.is_in_quotation
         else:
             # Shift in one row at a time from remaining_message_lines
             self.lines_since_last_acknowledgement += 1
@@ -905,9 +1015,49 @@ class GameDialog:
 
         return False, was_in_quotation or self.is_in_quotation
 
+    def refresh_last_line(self) -> None:
+        """
+        Redraw only the last displayed message line.  Falls back to refresh_image if anything else drawn on the image
+        has changed since it was last refreshed, such as when the lines have scrolled.
+        """
+        if (
+            self.rendered_message_lines is None
+            or self.row_data is not None
+            or 0 == len(self.displayed_message_lines)
+            or len(self.rendered_message_lines) != len(self.displayed_message_lines)
+            or self.rendered_message_lines[:-1] != self.displayed_message_lines[:-1]
+        ):
+            self.refresh_image()
+            return
+
+        last_line = self.displayed_message_lines[-1]
+        if last_line == self.rendered_message_lines[-1]:
+            return
+
+        # Clear the row and draw the whole line so that the result matches a full refresh of the image
+        col_pos_x = GameDialog.outside_spacing_pixels
+        row_pos_y = self.get_row_pos_y(len(self.displayed_message_lines) - 1)
+        self.image.fill(
+            "black",
+            pygame.Rect(
+                col_pos_x,
+                row_pos_y,
+                self.image.get_width() - 2 * GameDialog.outside_spacing_pixels,
+                GameDialog.font.get_height(),
+            ),
+        )
+        self.image.blit(
+            GameDialog.render_font(last_line, self.font_color), (col_pos_x, row_pos_y)
+        )
+        self.rendered_message_lines[-1] = last_line
+
     def refresh_image(self) -> None:
         # Clear the image
         self.initialize_image()
+        if self.row_data is None:
+            self.rendered_message_lines = list(self.displayed_message_lines)
+        else:
+            self.rendered_message_lines = None
 
         # Blit lines to dialog
         col_pos_x = GameDialog.outside_spacing_pixels
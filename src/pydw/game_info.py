@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 import concurrent.futures
 import os
@@ -10,7 +10,6 @@ import sys
 # xml.etree doesn't support nested xincludes prior to Python 3.9 (see https://github.com/python/cpython/issues/65127)
 # Prior to Python 3.9, use lxml.etree
 if sys.version_info[0] == 3 and sys.version_info[1] < 9:
-    from typing import Callable
     import lxml.etree as ET
     import lxml.ElementInclude as ETI
 
@@ -38,7 +37,9 @@ from generic_utils.point import Point
 
 from pygame_utils.audio_player import AudioPlayer, MusicTrack, SoundTrack
 
+from pydw.dialog_compiler import DialogCompiler
 from pydw.game_dialog import GameDialog
+from pydw.game_info_cache import GameInfoCache
 from pydw.game_types import (
     ActionCategoryTypeEnum,
     AnyTransition,
@@ -85,11 +86,19 @@ from pydw.game_types import (
     Tool,
     Weapon,
 )
+from pydw.progress_marker_expression import ProgressMarkerExpression
+from pydw.progress_marker_set import ProgressMarkerSet
 
 
 class GameInfo:
     TRANSPARENT_COLOR = pygame.Color(0, 0, 0, 0)
 
+    # Directory in which parsed game info is cached between launches, or None to always parse the game info
+    cache_path: Optional[str] = None
+
+    # Called with the name of each phase of the construction of a GameInfo as the phase completes
+    phase_callback: Optional[Callable[[str], None]] = None
+
     def __init__(
         self,
         base_path: str,
@@ -100,7 +109,10 @@ class GameInfo:
         self.game_xml_path = game_xml_path
         self.tile_size_pixels = tile_size_pixels
         self.dialog_sequences: Dict[str, DialogType] = {}
+        # The labels of every DialogGoTo parsed, which are resolved when the dialog is compiled
+        self.dialog_go_to_labels: Set[str] = set()
         self.map_being_parsed: Optional[str] = None
+        self.progress_marker_names: List[str] = []
 
         # Find image_px_step_size.  Select step size nearest to 1/6 of a tile which yields a value where
         # tile_size_pixels is divisible by image_px_step_size.
@@ -118,18 +130,46 @@ class GameInfo:
                 else:
                     break
 
+        # Restore from the cache, if present
+        cache: Optional[GameInfoCache] = None
+        if GameInfo.cache_path is not None:
+            cache = GameInfoCache(
+                GameInfo.cache_path,
+                base_path,
+                game_xml_path,
+                tile_size_pixels,
+                int(win_size_pixels.y),
+            )
+            cached_state = cache.load()
+            if cached_state is not None:
+                GameInfo.init_audio_player(
+                    cached_state["audio_xml_root"], cached_state["data_path"]
+                )
+                self.__dict__.update(cached_state["game_info"])
+                ProgressMarkerSet.intern_all(self.progress_marker_names)
+                self.compile_dialog_sequences()
+                GameInfo.end_phase("cache_load")
+                return
+
         # Parse XML
         xml_root = ET.parse(game_xml_path).getroot()
         ETI.include(xml_root)
         data_path = os.path.join(base_path, xml_root.attrib["dataPath"])
         image_path = os.path.join(data_path, xml_root.attrib["imagePath"])
+        GameInfo.end_phase("xml")
+
+        # Assign ids to all of the progress markers up front, in the order they are referenced
+        self.progress_marker_names = GameInfo.parse_progress_marker_names(xml_root)
+        ProgressMarkerSet.intern_all(self.progress_marker_names)
 
         GameInfo.init_audio_player(xml_root, data_path)
+        GameInfo.end_phase("audio")
 
         # Parse the encounter background images
         self.encounter_backgrounds = GameInfo.parse_encounter_backgrounds(
             xml_root, image_path
         )
+        GameInfo.end_phase("encounter_backgrounds")
 
         # Parse map locations - self.locations is a dictionary of Map name -> Location name -> NamedLocation
         self.locations = GameInfo.parse_map_locations(xml_root)
@@ -141,25 +181,30 @@ class GameInfo:
         self.armors = GameInfo.parse_armors(xml_root, self.items)
         self.shields = GameInfo.parse_shields(xml_root, self.items)
         self.tools = self.parse_tools(xml_root)
+        GameInfo.end_phase("locations_and_items")
 
         # Parse tiles
         # TODO: Combine all of these into an tiles type?
         self.tiles, self.tile_symbols, self.tile_probabilities = GameInfo.parse_tiles(
             xml_root, image_path, self.tile_size_pixels
         )
+        GameInfo.end_phase("tiles")
 
         # Parse decorations
         self.decorations = GameInfo.parse_decoration(
             xml_root, image_path, self.tile_size_pixels
         )
+        GameInfo.end_phase("decorations")
 
         # Parse spells
         self.spells = self.parse_spells(xml_root)
+        GameInfo.end_phase("spells")
 
         # Parse characters
         self.character_types = GameInfo.parse_character_types(
             xml_root, image_path, self.spells, self.tile_size_pixels
         )
+        GameInfo.end_phase("character_types")
 
         # Parse monsters
         self.monsters = self.parse_monsters(
@@ -168,11 +213,13 @@ class GameInfo:
 
         # Parse monster sets
         self.monster_sets = GameInfo.parse_monster_sets(xml_root)
+        GameInfo.end_phase("monsters")
 
         # Parse maps
         self.maps = self.parse_maps(
             xml_root, os.path.join(data_path, xml_root.attrib["mapsPath"])
         )
+        GameInfo.end_phase("maps")
 
         # Parse dialog scripts
         for element in xml_root.findall("./DialogScripts/DialogScript"):
@@ -193,6 +240,38 @@ class GameInfo:
             self.death_map, death_state_element
         )
         self.death_dialog = self.parse_dialog(death_state_element)
+        GameInfo.end_phase("dialog_scripts")
+
+        # Save to the cache.  Only the audio mappings of the XML are needed to initialize the audio player.
+        if cache is not None:
+            audio_xml_root = ET.Element(xml_root.tag, xml_root.attrib)
+            audio_xml_root.extend(xml_root.findall("./MusicMappings"))
+            audio_xml_root.extend(xml_root.findall("./SoundMappings"))
+            cache.save(
+                {
+                    "audio_xml_root": audio_xml_root,
+                    "data_path": data_path,
+                    "game_info": self.__dict__,
+                }
+            )
+            GameInfo.end_phase("cache_save")
+
+        # The compiled dialog is not cached as it is quick to rebuild from the parsed dialog
+        self.compile_dialog_sequences()
+        GameInfo.end_phase("dialog_compile")
+
+    def compile_dialog_sequences(self) -> None:
+        """
+        Compile the labeled dialog sequences and resolve the labels gone to by all other parsed dialog, which reports
+        every go to a label with no dialog sequence at load rather than when the dialog is first run
+        """
+        self.dialog_compiler = DialogCompiler(self.dialog_sequences)
+        self.dialog_compiler.compile_sequences(self.dialog_go_to_labels)
+
+    @staticmethod
+    def end_phase(phase_name: str) -> None:
+        if GameInfo.phase_callback is not None:
+            GameInfo.phase_callback(phase_name)
 
     @staticmethod
     def static_init(
@@ -366,6 +445,23 @@ class GameInfo:
                 )
         return font_names, dialog_border_image_filename
 
+    @staticmethod
+    def parse_progress_marker_names(xml_root: ET.Element) -> List[str]:
+        """
+        :return: The names of the progress markers referenced by the game configuration, in document order
+        """
+        progress_marker_names: Dict[str, None] = {}
+        for element in xml_root.iter():
+            if element.tag == "ProgressMarker" and "name" in element.attrib:
+                progress_marker_names[element.attrib["name"]] = None
+            for attrib_name in ("progressMarker", "inverseProgressMarker"):
+                if attrib_name in element.attrib:
+                    for name in ProgressMarkerExpression.get_progress_markers(
+                        element.attrib[attrib_name]
+                    ):
+                        progress_marker_names[name] = None
+        return list(progress_marker_names)
+
     @staticmethod
     def parse_encounter_backgrounds(
         xml_root: ET.Element, image_path: str
@@ -385,35 +481,31 @@ class GameInfo:
                     element_encounter_path, image_element.attrib["source"]
                 )
 
-                # print('Loading', encounter_background_name, flush=True)
-                try:
-                    encounter_background_image = pygame.image.load(image_path)
-                    encounter_backgrounds[encounter_background_name] = (
-                        EncounterBackground(
-                            encounter_background_name,
-                            encounter_background_image,
-                            image_path,
-                            (
-                                image_element.attrib["artist"]
-                                if "artist" in image_element.attrib
-                                else "Uncredited"
-                            ),
-                            (
-                                image_element.attrib["artist_url"]
-                                if "artist_url" in image_element.attrib
-                                else None
-                            ),
-                            (
-                                image_element.attrib["url"]
-                                if "url" in image_element.attrib
-                                else None
-                            ),
-                        )
-                    )
-                except Exception:
+                # The image is loaded on first use, so only check that it is present
+                if not os.path.isfile(image_path):
                     print(
                         "ERROR: Failed to load", encounter_background_name, flush=True
                     )
+                    continue
+                encounter_backgrounds[encounter_background_name] = EncounterBackground(
+                    encounter_background_name,
+                    image_path,
+                    (
+                        image_element.attrib["artist"]
+                        if "artist" in image_element.attrib
+                        else "Uncredited"
+                    ),
+                    (
+                        image_element.attrib["artist_url"]
+                        if "artist_url" in image_element.attrib
+                        else None
+                    ),
+                    (
+                        image_element.attrib["url"]
+                        if "url" in image_element.attrib
+                        else None
+                    ),
+                )
         return encounter_backgrounds
 
     @staticmethod
@@ -1020,9 +1112,6 @@ class GameInfo:
         # Scale monster images up assuming they are scaled to a Nintendo resolution of 240 vertical pixels
         monster_scale_factor = window_height / 240
 
-        # import time
-        # print('Starting to load monsters...', flush=True)
-        # start_time = time.time()
         monsters: Dict[str, MonsterInfo] = {}
         with concurrent.futures.ProcessPoolExecutor() as executor:
             futures = {
@@ -1042,7 +1131,6 @@ class GameInfo:
                     monsters[monster.name] = monster
                 except Exception as exc:
                     print(f"{futures[future]} throws {exc}", flush=True)
-        # print(f'Time elapsed loading {len(monsters)} monsters: {time.time()-start_time}', flush=True)
         return monsters
 
     @staticmethod
@@ -1428,6 +1516,7 @@ class GameInfo:
             map_overlay_dat = None
             if map_dat_file_name.endswith(".tmx"):
                 map_tiled_file_name = map_dat_file_name
+                map_size = GameInfo.read_tiled_map_size(map_tiled_file_name)
             else:
                 with open(map_dat_file_name, "r") as map_dat_file:
                     # Future: Could corner turn data from row,col (y,x) into col,row (x,y)
@@ -1436,6 +1525,7 @@ class GameInfo:
                         map_dat.append(line)
                         # TODO: Validate the map is rectangular and all tiles are defined
                 map_dat_size = Point(len(map_dat[0]), len(map_dat))
+                map_size = map_dat_size
 
                 # Conditionally load map dat overlap file
                 if "overlayTiles" in element.attrib:
@@ -1499,30 +1589,40 @@ class GameInfo:
 
             # Save the map information
             # print('Save the map information', flush=True)
-            maps[map_name] = Map(
+            maps[map_name] = Map.create(
                 map_name,
-                map_tiled_file_name,
                 map_dat,
-                map_overlay_dat,
-                music,
-                light_diameter,
-                leaving_transition,
-                point_transitions,
-                incoming_transitions,
-                transitions_by_map,
-                transitions_by_map_and_name,
-                transitions_by_name,
-                map_decorations,
-                npcs,
-                monster_zones,
-                encounter_background,
-                special_monsters,
-                is_outside,
-                origin,
+                tiled_filename=map_tiled_file_name,
+                overlay_dat=map_overlay_dat,
+                music=music,
+                light_diameter=light_diameter,
+                leaving_transition=leaving_transition,
+                point_transitions=point_transitions,
+                incoming_transitions=incoming_transitions,
+                transitions_by_map=transitions_by_map,
+                transitions_by_map_and_name=transitions_by_map_and_name,
+                transitions_by_name=transitions_by_name,
+                map_decorations=map_decorations,
+                npcs=npcs,
+                monster_zones=monster_zones,
+                encounter_background=encounter_background,
+                special_monsters=special_monsters,
+                is_outside=is_outside,
+                origin=origin,
+                map_size=map_size,
             )
             self.map_being_parsed = None
         return maps
 
+    @staticmethod
+    def read_tiled_map_size(tiled_file_name: str) -> Point:
+        """Read the size of a Tiled map in tiles from the map element, without parsing the rest of the map"""
+        for _, map_element in ET.iterparse(tiled_file_name, events=("start",)):
+            return Point(
+                int(map_element.attrib["width"]), int(map_element.attrib["height"])
+            )
+        return Point(0, 0)
+
     def get_location(self, map_name: Optional[str], element: ET.Element) -> Point:
         if map_name and "location" in element.attrib:
             return self.locations[map_name][element.attrib["location"]].point
@@ -1683,6 +1783,7 @@ class GameInfo:
             if element.tag == "DialogGoTo":
                 if label is not None:
                     dialog.append(DialogGoTo(label))
+                    self.dialog_go_to_labels.add(label)
 
             elif element.tag == "Dialog":
                 if element.text is not None:
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+from typing import IO, Any, Dict, List, Literal, Optional, Tuple
+
+import glob
+import hashlib
+import io
+import os
+import pickle
+import sys
+
+import pygame
+
+# Pixel formats in which cached surfaces are stored
+CachedSurfaceFormatType = Literal["RGB", "RGBA"]
+
+
+class SurfacePickler(pickle.Pickler):
+    """
+    Pickler which stores pygame surfaces as references to raw pixel buffers which follow the pickled data.
+
+    The pixel buffers are kept out of the pickle so that the unpickler doesn't hold every buffer in its memo until
+    the load completes.
+    """
+
+    def __init__(self, file: IO[bytes]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.surfaces: List[Tuple[pygame.surface.Surface, CachedSurfaceFormatType]] = []
+        self.pixels_len = 0
+
+    def persistent_id(self, obj: Any) -> Any:
+        if isinstance(obj, pygame.surface.Surface):
+            pixel_format: CachedSurfaceFormatType = (
+                "RGBA" if obj.get_flags() & pygame.SRCALPHA else "RGB"
+            )
+            pixels_len = obj.get_width() * obj.get_height() * len(pixel_format)
+            pid = ("Surface", self.pixels_len, pixels_len, obj.get_size(), pixel_format)
+            self.surfaces.append((obj, pixel_format))
+            self.pixels_len += pixels_len
+            return pid
+        return None
+
+    def write_pixels(self, file: IO[bytes]) -> None:
+        for surface, pixel_format in self.surfaces:
+            file.write(pygame.image.tobytes(surface, pixel_format))
+
+
+class SurfaceUnpickler(pickle.Unpickler):
+    """Unpickler which restores the pygame surfaces stored by SurfacePickler"""
+
+    def __init__(self, file: IO[bytes], pixels_offset: int) -> None:
+        super().__init__(file)
+        self.file = file
+        self.pixels_offset = pixels_offset
+        self.convert_surfaces = pygame.display.get_surface() is not None
+
+    def persistent_load(self, pid: Any) -> Any:
+        type_tag, offset, pixels_len, size, pixel_format = pid
+        if type_tag != "Surface":
+            raise pickle.UnpicklingError(f"Unsupported persistent id {type_tag}")
+        pickle_pos = self.file.tell()
+        self.file.seek(self.pixels_offset + offset)
+        surface = pygame.image.frombytes(self.file.read(pixels_len), size, pixel_format)
+        self.file.seek(pickle_pos)
+        if self.convert_surfaces:
+            if pixel_format == "RGBA":
+                return surface.convert_alpha()
+            return surface.convert()
+        return surface
+
+
+class GameInfoCache:
+    """
+    On-disk cache of the parsed GameInfo structures and pre-scaled images.
+
+    Cache files are keyed by the cache version, the game xml path, the tile size, the window height, the Python
+    sources of the packages whose classes are pickled into the cache and the modification times and sizes of the
+    source files in the directory tree of the game xml file.
+    """
+
+    VERSION = 5
+    PICKLE_LEN_BYTES = 8
+    SOURCE_FILE_EXTENSIONS = (
+        ".xml",
+        ".dat",
+        ".tmx",
+        ".tsx",
+        ".png",
+        ".gif",
+        ".jpg",
+        ".jpeg",
+        ".jfif",
+        ".bmp",
+    )
+    # Packages, relative to the parent directory of this package, whose classes are pickled into the cache
+    SOURCE_PACKAGES = ("generic_utils", "pydw", "pygame_utils")
+
+    # Hash of the sources of SOURCE_PACKAGES, which is computed once per process
+    source_hash: Optional[str] = None
+
+    def __init__(
+        self,
+        cache_path: str,
+        base_path: str,
+        game_xml_path: str,
+        tile_size_pixels: int,
+        window_height: int,
+    ) -> None:
+        self.cache_path = cache_path
+        self.base_path = os.path.abspath(base_path)
+        self.game_xml_path = os.path.abspath(game_xml_path)
+        self.tile_size_pixels = tile_size_pixels
+        self.window_height = window_height
+        self.cache_file_prefix = (
+            "game_info_"
+            + os.path.splitext(os.path.basename(self.game_xml_path))[0]
+            + "_"
+        )
+        self.cache_file_path = os.path.join(
+            self.cache_path, self.cache_file_prefix + self.get_key() + ".pickle"
+        )
+
+    def get_key(self) -> str:
+        key = hashlib.sha256()
+        key.update(
+            repr(
+                (
+                    GameInfoCache.VERSION,
+                    sys.version_info[:2],
+                    pygame.version.ver,
+                    self.base_path,
+                    self.game_xml_path,
+                    self.tile_size_pixels,
+                    self.window_height,
+                    GameInfoCache.get_source_hash(),
+                )
+            ).encode()
+        )
+        source_path = os.path.dirname(self.game_xml_path)
+        for dir_path, dir_names, file_names in os.walk(source_path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if not file_name.lower().endswith(GameInfoCache.SOURCE_FILE_EXTENSIONS):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                file_stat = os.stat(file_path)
+                key.update(
+                    repr(
+                        (
+                            os.path.relpath(file_path, source_path),
+                            file_stat.st_mtime_ns,
+                            file_stat.st_size,
+                        )
+                    ).encode()
+                )
+        return key.hexdigest()
+
+    @staticmethod
+    def get_source_hash() -> str:
+        if GameInfoCache.source_hash is None:
+            source_hash = hashlib.sha256()
+            packages_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            for package in GameInfoCache.SOURCE_PACKAGES:
+                for file_path in sorted(
+                    glob.glob(os.path.join(packages_path, package, "*.py"))
+                ):
+                    source_hash.update(
+                        os.path.relpath(file_path, packages_path).encode()
+                    )
+                    with open(file_path, "rb") as source_file:
+                        source_hash.update(source_file.read())
+            GameInfoCache.source_hash = source_hash.hexdigest()
+        return GameInfoCache.source_hash
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.cache_file_path):
+            return None
+        try:
+            with open(self.cache_file_path, "rb") as cache_file:
+                pickle_len = int.from_bytes(
+                    cache_file.read(GameInfoCache.PICKLE_LEN_BYTES), "little"
+                )
+                return SurfaceUnpickler(  # type: ignore
+                    cache_file, GameInfoCache.PICKLE_LEN_BYTES + pickle_len
+                ).load()
+        except Exception as exc:
+            print(
+                f"ERROR: Failed to load game info cache {self.cache_file_path}: {exc}",
+                flush=True,
+            )
+        return None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+
+            # Write to a temporary file first so that an interrupted save never leaves a truncated cache file
+            # The file holds the length of the pickled data, the pickled data and then the surface pixel buffers.
+            buffer = io.BytesIO()
+            pickler = SurfacePickler(buffer)
+            pickler.dump(state)
+            temp_file_path = self.cache_file_path + ".tmp"
+            with open(temp_file_path, "wb") as cache_file:
+                cache_file.write(
+                    len(buffer.getbuffer()).to_bytes(
+                        GameInfoCache.PICKLE_LEN_BYTES, "little"
+                    )
+                )
+                cache_file.write(buffer.getbuffer())
+                pickler.write_pixels(cache_file)
+            os.replace(temp_file_path, self.cache_file_path)
+
+            # Remove stale cache files for the same game xml
+            for stale_file_path in glob.glob(
+                os.path.join(self.cache_path, self.cache_file_prefix + "*.pickle")
+            ):
+                if stale_file_path != self.cache_file_path:
+                    os.remove(stale_file_path)
+        except Exception as exc:
+            print(
+                f"ERROR: Failed to save game info cache {self.cache_file_path}: {exc}",
+                flush=True,
+            )
@@ -101,6 +101,7 @@ class GameLoop:
         self.game_state.is_running = True
         self.title_screen_loop(pc_name_or_file_name)
         self.exploring_loop()
+        self.game_state.map_prefetcher.shutdown()
 
     def title_screen(self, text: str) -> None:
         # Play title music and display title screen
@@ -753,6 +754,8 @@ class GameLoop:
 
             # At destination - now determine if an encounter should start
             if not self.game_state.make_map_transition(transition):
+                self.game_state.prefetch_neighbouring_maps()
+
                 # Check for special monster encounters as well as random monsters
                 if self.game_state.get_special_monster() is not None or (
                     len(self.game_state.get_tile_monsters()) > 0
@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import abc
+from collections import OrderedDict
 from heapq import heappush, heappop
 import math
+import numpy
 import random
 
 import pygame
@@ -19,14 +21,17 @@ from pydw.game_types import (
     CharacterType,
     Direction,
     EncounterBackground,
+    Map,
     MapDecoration,
     Tile,
 )
+from pydw.game_info import GameInfo
 from pydw.hero_party import HeroParty
 from pydw.hero_state import HeroState
 from pydw.legacy_map_data import LegacyMapData
 from pydw.padded_tiled_map_data import PaddedTiledMapData
 from pydw.map_character_state import MapCharacterState
+from pydw.map_data_cache import MapDataCache, MapDataCacheEntry, MapDataCacheKey
 from pydw.npc_state import NpcState
 
 
@@ -35,6 +40,17 @@ class GameMapInterface(metaclass=abc.ABCMeta):
     def get_tile_info(self, tile: Optional[Point] = None) -> Tile:
         pass
 
+    def get_tile_movement_speed_factor(self, tile: Point) -> float:
+        return self.get_tile_info(tile).movement_speed_factor
+
+    def add_character_occupancy(self, sprite: "CharacterSprite") -> None:
+        """Called after a character sprite has been placed on its current and destination tiles"""
+        pass
+
+    def remove_character_occupancy(self, sprite: "CharacterSprite") -> None:
+        """Called before a character sprite is moved off of its current and destination tiles"""
+        pass
+
     @abc.abstractmethod
     def can_move_to_tile(
         self,
@@ -57,6 +73,27 @@ class GameMapInterface(metaclass=abc.ABCMeta):
             tile, enforce_npc_hp_penalty_limit, enforce_npc_dof_limit, True, prev_tile
         )
 
+    @abc.abstractmethod
+    def size(self, with_padding: bool = False) -> Point:
+        pass
+
+    def get_walkability_version(self) -> int:
+        """Version which changes whenever the walkability of any tile on the map changes"""
+        return 0
+
+    def get_npc_path_cost(self, tile: Point) -> float:
+        tile_info = self.get_tile_info(tile)
+        return (
+            1.0 if tile_info.name == "path" else 3.0
+        ) / tile_info.movement_speed_factor
+
+    def get_npc_distance_field(self, goal: Point) -> Optional[numpy.ndarray]:
+        """
+        :return: Array indexed by [x, y] of the NPC path cost from each tile to goal, or None if the map does not
+                 support distance fields
+        """
+        return None
+
     def compute_npc_path(
         self, start: Point, goal: Point, verbose: bool = False
     ) -> Optional[List[Point]]:
@@ -64,33 +101,59 @@ class GameMapInterface(metaclass=abc.ABCMeta):
         if verbose:
             print(f"in compute_npc_path; start={start}; goal={goal}", flush=True)
 
-        def h(n: Point) -> float:
-            return abs(goal.x - n.x) + abs(goal.y - n.y)
+        # Tiles are tracked by a flat index of x * map_h + y so that the bookkeeping can be done with lists rather
+        # than dictionaries keyed by Point.  This index ordering also keeps ties in the open set ordered the same as
+        # they would be for Points.
+        map_w, map_h = self.size().get_as_int_tuple()
+        start_x, start_y = start.get_as_int_tuple()
+        goal_x, goal_y = goal.get_as_int_tuple()
+        if not (0 <= start_x < map_w and 0 <= start_y < map_h) or not (
+            0 <= goal_x < map_w and 0 <= goal_y < map_h
+        ):
+            if verbose:
+                print("in compute_npc_path; start or goal is off the map", flush=True)
+            return None
+
+        def h(x: int, y: int) -> float:
+            return abs(goal_x - x) + abs(goal_y - y)
 
-        open_set: List[Tuple[float, Point]] = []
-        heappush(open_set, (h(start), start))
-        came_from: Dict[Point, Point] = {}
-        g_score: Dict[Point, float] = {start: 0.0}
-        f_score: Dict[Point, float] = {start: h(start)}
+        start_idx = start_x * map_h + start_y
+        goal_idx = goal_x * map_h + goal_y
+        direction_vectors = [
+            direction.get_vector().get_as_int_tuple() for direction in Direction
+        ]
+        open_set: List[Tuple[float, int]] = []
+        heappush(open_set, (h(start_x, start_y), start_idx))
+        came_from = [-1] * (map_w * map_h)
+        g_score = [math.inf] * (map_w * map_h)
+        f_score = [math.inf] * (map_w * map_h)
+        g_score[start_idx] = 0.0
+        f_score[start_idx] = h(start_x, start_y)
         while 0 < len(open_set):
-            queued_f_score, current = heappop(open_set)
-            if queued_f_score != f_score[current]:
+            queued_f_score, current_idx = heappop(open_set)
+            if queued_f_score != f_score[current_idx]:
                 if verbose:
                     print(
-                        f"\tin compute_npc_path; ignoring current={current}; open_set={open_set}",
+                        f"\tin compute_npc_path; ignoring current={current_idx}; open_set={open_set}",
                         flush=True,
                     )
                 continue
             if verbose:
                 print(
-                    f"\tin compute_npc_path; current={current}; open_set={open_set}",
+                    f"\tin compute_npc_path; current={current_idx}; open_set={open_set}",
                     flush=True,
                 )
-            if current == goal:
+            if current_idx == goal_idx:
                 break
 
-            for direction in Direction:
-                neighbor = current + direction.get_vector()
+            current_x, current_y = divmod(current_idx, map_h)
+            current = Point(current_x, current_y)
+            for vector_x, vector_y in direction_vectors:
+                neighbor_x = current_x + vector_x
+                neighbor_y = current_y + vector_y
+                if not (0 <= neighbor_x < map_w and 0 <= neighbor_y < map_h):
+                    continue
+                neighbor = Point(neighbor_x, neighbor_y)
                 if verbose:
                     print(f"\t\tin compute_npc_path; neighbor={neighbor}", flush=True)
                 if not self.can_npc_move_to_tile(
@@ -102,34 +165,32 @@ class GameMapInterface(metaclass=abc.ABCMeta):
                             flush=True,
                         )
                     continue
-                neighbor_tile = self.get_tile_info(neighbor)
-                tile_score = (
-                    1.0 if neighbor_tile.name == "path" else 3.0
-                ) / neighbor_tile.movement_speed_factor
-                tentative_g_score = g_score[current] + tile_score
+                neighbor_idx = neighbor_x * map_h + neighbor_y
+                tentative_g_score = g_score[current_idx] + self.get_npc_path_cost(
+                    neighbor
+                )
                 if verbose:
                     print(
                         f"\t\t\tin compute_npc_path; tentative_g_score={tentative_g_score}",
                         flush=True,
                     )
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                    tentative_f_score = tentative_g_score + h(neighbor)
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_f_score
-                    heappush(open_set, (tentative_f_score, neighbor))
-
-        if goal in came_from:
+                if tentative_g_score < g_score[neighbor_idx]:
+                    tentative_f_score = tentative_g_score + h(neighbor_x, neighbor_y)
+                    came_from[neighbor_idx] = current_idx
+                    g_score[neighbor_idx] = tentative_g_score
+                    f_score[neighbor_idx] = tentative_f_score
+                    heappush(open_set, (tentative_f_score, neighbor_idx))
+
+        if came_from[goal_idx] != -1:
             # Reconstruct the path
             reverse_path = []
-            while goal != start:
-                reverse_path.append(goal)
-                goal = came_from[goal]
+            path_idx = goal_idx
+            while path_idx != start_idx:
+                reverse_path.append(Point(*divmod(path_idx, map_h)))
+                path_idx = came_from[path_idx]
             return list(reversed(reverse_path))
         elif verbose:
-            print(
-                f"in compute_npc_path; goal is not in came_from={came_from}", flush=True
-            )
+            print(f"in compute_npc_path; no path to goal={goal}", flush=True)
 
         # No path exists
         return None
@@ -230,6 +291,15 @@ class CharacterSprite(MapSprite):
             self.get_phase_image_index()
         ]
 
+    def set_pos_dat_tiles(
+        self, curr_pos_dat_tile: Point, dest_pos_dat_tile: Point
+    ) -> None:
+        """Set the current and destination tiles of the character, keeping the map occupancy up to date"""
+        self.game_map.remove_character_occupancy(self)
+        self.character.curr_pos_dat_tile = curr_pos_dat_tile
+        self.character.dest_pos_dat_tile = dest_pos_dat_tile
+        self.game_map.add_character_occupancy(self)
+
     def get_rect(self) -> pygame.rect.Rect:
         char_rect = self.image.get_rect()
         char_rect.midbottom = (
@@ -255,7 +325,7 @@ class CharacterSprite(MapSprite):
             nearest_tile = character.curr_pos_dat_tile
         else:
             nearest_tile = character.dest_pos_dat_tile
-        return self.game_map.get_tile_info(nearest_tile).movement_speed_factor
+        return self.game_map.get_tile_movement_speed_factor(nearest_tile)
 
     def update(self, *args: Any, **kwargs: Any) -> None:
         # Move the character in steps to the destination tile
@@ -279,7 +349,9 @@ class CharacterSprite(MapSprite):
                 self.character.curr_pos_offset_img_px.mag() / MapSprite.tile_size_pixels
                 >= direction_vector.mag()
             ):
-                self.character.curr_pos_dat_tile = self.character.dest_pos_dat_tile
+                self.set_pos_dat_tiles(
+                    self.character.dest_pos_dat_tile, self.character.dest_pos_dat_tile
+                )
                 self.character.curr_pos_offset_img_px = Point(0, 0)
 
         # Check for phase updates
@@ -368,6 +440,12 @@ class NpcSprite(CharacterSprite):
         self.destination_waypoint: Optional[Point] = None
         self.no_path_count = 0
 
+        # Path to the destination waypoint, which is followed a step at a time and only recomputed when it is no
+        # longer valid.  The path starts from destination_path_start_tile.
+        self.destination_path: Optional[List[Point]] = None
+        self.destination_path_start_tile: Optional[Point] = None
+        self.destination_path_walkability_version = -1
+
         # Increase updates_per_phase_change for characters which are not moving so they step less frequently
         if not self.character.npc_info.walking:
             self.updates_per_phase_change *= 5
@@ -390,23 +468,24 @@ class NpcSprite(CharacterSprite):
                         self.destination_waypoint = random.choice(
                             self.character.npc_info.waypoints
                         )
+                        self.destination_path = None
                         new_waypoint = True
                         print(
                             f"NPC moving to waypoint {self.destination_waypoint}",
                             flush=True,
                         )
 
-                    # Determine path to waypoint
-                    path = self.game_map.compute_npc_path(
-                        self.character.curr_pos_dat_tile, self.destination_waypoint
-                    )
+                    # Determine the next step toward the waypoint
+                    next_tile = self.get_destination_step()
                     if new_waypoint:
                         print(
-                            f"NPC path to waypoint={path} from {self.character.curr_pos_dat_tile}",
+                            f"NPC next step to waypoint={next_tile} from {self.character.curr_pos_dat_tile}",
                             flush=True,
                         )
-                    if path is not None and 0 < len(path):
-                        self.character.dest_pos_dat_tile = path[0]
+                    if next_tile is not None:
+                        self.set_pos_dat_tiles(
+                            self.character.curr_pos_dat_tile, next_tile
+                        )
                         self.character.direction = Direction.get_direction(
                             self.character.dest_pos_dat_tile
                             - self.character.curr_pos_dat_tile
@@ -415,7 +494,7 @@ class NpcSprite(CharacterSprite):
                     else:
                         self.no_path_count += 1
                         if self.no_path_count > 3:
-                            self.destination_waypoint is None
+                            self.destination_waypoint = None
                 else:
                     # Randomly choose a directions
                     self.character.direction = random.choice(list(Direction))
@@ -426,12 +505,134 @@ class NpcSprite(CharacterSprite):
                     if self.game_map.can_npc_move_to_tile(
                         dest_tile, prev_tile=self.character.curr_pos_dat_tile
                     ):
-                        self.character.dest_pos_dat_tile = dest_tile
+                        self.set_pos_dat_tiles(
+                            self.character.curr_pos_dat_tile, dest_tile
+                        )
 
         super().update(args, kwargs)
 
+    def get_destination_step(self) -> Optional[Point]:
+        """Get the next tile to move to on the way to the destination waypoint"""
+        if self.destination_waypoint is None:
+            return None
+
+        # Prefer the distance field shared by all NPCs heading to the same waypoint, in which case only the dynamic
+        # occupancy of the neighboring tiles needs to be checked.  This is skipped while following a detour from a
+        # previous step so that the NPC does not step straight back toward the blocked tiles.
+        if not self.is_following_destination_path():
+            distance_field = self.game_map.get_npc_distance_field(
+                self.destination_waypoint
+            )
+            if distance_field is not None:
+                next_tile = self.get_distance_field_step(distance_field)
+                if next_tile is not None:
+                    return next_tile
+
+        # Fall back to an A* path over the current occupancy, which is able to detour around characters blocking every
+        # downhill neighbor in the distance field
+        path = self.get_destination_path()
+        if path is None or 0 == len(path):
+            self.destination_path = None
+            return None
+        self.destination_path = path[1:]
+        self.destination_path_start_tile = path[0]
+        return path[0]
+
+    def is_following_destination_path(self) -> bool:
+        """Determine if the NPC is partway along a path to the destination waypoint computed on a previous step"""
+        return (
+            self.destination_path is not None
+            and 0 < len(self.destination_path)
+            and self.destination_path_start_tile == self.character.curr_pos_dat_tile
+        )
+
+    def get_distance_field_step(self, distance_field: numpy.ndarray) -> Optional[Point]:
+        """Get the unoccupied neighboring tile which is the most downhill in the distance field, if any"""
+        curr_tile = self.character.curr_pos_dat_tile
+        curr_x, curr_y = curr_tile.get_as_int_tuple()
+        field_w, field_h = distance_field.shape
+        if not (0 <= curr_x < field_w and 0 <= curr_y < field_h):
+            return None
+        curr_distance = distance_field[curr_x, curr_y]
+        candidates: List[Tuple[float, Point]] = []
+        for direction in Direction:
+            neighbor = curr_tile + direction.get_vector()
+            neighbor_x, neighbor_y = neighbor.get_as_int_tuple()
+            if 0 <= neighbor_x < field_w and 0 <= neighbor_y < field_h:
+                neighbor_distance = distance_field[neighbor_x, neighbor_y]
+                if neighbor_distance < curr_distance:
+                    candidates.append((neighbor_distance, neighbor))
+        for _, neighbor in sorted(candidates, key=lambda candidate: candidate[0]):
+            if self.game_map.can_npc_move_to_tile(
+                neighbor, enforce_npc_dof_limit=False, prev_tile=curr_tile
+            ):
+                return neighbor
+        return None
+
+    def get_destination_path(self) -> Optional[List[Point]]:
+        """Get the path to the destination waypoint, reusing the previously computed path while it remains valid"""
+        if self.destination_waypoint is None:
+            return None
+        if (
+            self.destination_path is not None
+            and 0 < len(self.destination_path)
+            and self.destination_path_start_tile == self.character.curr_pos_dat_tile
+            and self.destination_path_walkability_version
+            == self.game_map.get_walkability_version()
+            and self.game_map.can_npc_move_to_tile(
+                self.destination_path[0],
+                enforce_npc_dof_limit=False,
+                prev_tile=self.character.curr_pos_dat_tile,
+            )
+        ):
+            return self.destination_path
+
+        self.destination_path = self.game_map.compute_npc_path(
+            self.character.curr_pos_dat_tile, self.destination_waypoint
+        )
+        self.destination_path_start_tile = self.character.curr_pos_dat_tile
+        self.destination_path_walkability_version = (
+            self.game_map.get_walkability_version()
+        )
+        return self.destination_path
+
 
 class GameMap(GameMapInterface):
+    # Light masks for dark maps, keyed by surface size, light diameter, tile size and shape.  The light diameter only
+    # changes a few times per dungeon so these are shared across maps.
+    light_masks: Dict[
+        Tuple[Tuple[int, int], float, int, bool], pygame.surface.Surface
+    ] = {}
+    circular_light_mask = False
+    light_mask_colorkey = pygame.Color("magenta")
+
+    # Loaded map data and renderers, which are reused when returning to a recently visited map
+    map_data_cache = MapDataCache()
+
+    # Composite gate encounter backgrounds, keyed by gate image path, terrain background name and size
+    gate_encounter_backgrounds: "OrderedDict[Tuple[str, str, Tuple[int, int]], EncounterBackground]" = OrderedDict()
+    max_gate_encounter_backgrounds = 8
+
+    # Widest neighbourhood of a tile considered when determining its encounter background
+    encounter_background_border = 3
+
+    # Tile types and elevations which determine encounter backgrounds
+    forested_tiles = ["deciduous_forest", "pine_forest", "jungle"]
+    shore_tiles = [
+        "shore",
+        "shore_walkable",
+        "shore_cliff",
+        "shore_cliff_walkable",
+        "beach",
+        "beach_walkable",
+    ]
+    shore_tile_name_to_tile_name_map = {
+        "shore": "plain",
+        "shore_cliff": "plain",
+        "beach": "desert",
+    }
+    elevations = ["volcano", "close_mountain", "distant_mountain", "cliff", "hill"]
+
     def __init__(
         self,
         game_state: GameStateInterface,
@@ -460,25 +661,61 @@ class GameMap(GameMapInterface):
             for npc in self.map.npcs:
                 self.npcs.append(NpcState(npc))
 
-        # Create the map data
-        if self.map.tiled_filename is not None:
-            self.map_data = PaddedTiledMapData(
-                self.map.tiled_filename,
-                self.game_state.get_image_pad_tiles(),
-                desired_tile_size=self.game_state.get_game_info().tile_size_pixels,
-            )
-        else:
-            self.map_data = LegacyMapData(
+        # Reuse the map data, renderer and tile grids of a recently visited or prefetched map, else load them
+        map_data_cache_key = GameMap.get_map_data_cache_key(self.game_state, map_name)
+        map_data_cache_entry = GameMap.map_data_cache.get(map_data_cache_key, self.map)
+        if map_data_cache_entry is None:
+            map_data_cache_entry = GameMap.create_map_data_cache_entry(
                 self.game_state.get_game_info(),
-                self.map.name,
+                self.map,
                 self.game_state.get_image_pad_tiles(),
             )
-
-        # Create renderer
-        self.map_layer = pyscroll.BufferedRenderer(
-            self.map_data, self.game_state.screen.get_size()
+        if map_data_cache_entry.map_layer is None:
+            # Newly loaded or prefetched map data, which is (re)added to the cache to account for the renderer
+            map_layer = GameMap.create_map_layer(
+                map_data_cache_entry, self.game_state.screen.get_size()
+            )
+            GameMap.map_data_cache.put(map_data_cache_key, map_data_cache_entry)
+        else:
+            map_layer = map_data_cache_entry.map_layer
+            map_data_cache_entry.map_data.reset_render_state()
+            map_layer.redraw_tiles(map_layer._buffer)
+        self.map_data = map_data_cache_entry.map_data
+        self.map_size_tiles = (
+            Point(self.map_data.map_size) - 2 * self.game_state.get_image_pad_tiles()
         )
 
+        # Tile information for each of the tile type names of a Tiled map
+        self.tiled_tile_types = map_data_cache_entry.tiled_tile_types
+
+        # Precompute the per tile movement information so that movement checks are simple array lookups.  Arrays are
+        # indexed by [x, y] and cover the map without padding.
+        self.tile_grid_version = 0
+        self.set_base_tile_grids(map_data_cache_entry.tile_grids)
+        self.update_tile_walkable(pygame.Rect((0, 0), self.map_size_tiles.get_as_int_tuple()))
+
+        # Grids built on first use, such as the encounter background name of each tile, are kept with the map data so
+        # that they outlive this GameMap
+        self.map_data_tile_grids = map_data_cache_entry.tile_grids
+
+        # Distance fields to NPC waypoints, which are shared by all of the NPCs heading to the same waypoint.  These are
+        # discarded whenever the tile grid changes.
+        self.npc_distance_fields: Dict[Point, numpy.ndarray] = {}
+        self.npc_distance_fields_version = self.tile_grid_version
+
+        # Index the decorations by each tile they overlap and the NPCs by the tiles they occupy and by name
+        self.decorations_by_tile: Dict[Point, List[MapDecoration]] = {}
+        for decoration in self.map_decorations:
+            self.add_decoration_to_index(decoration)
+        self.npc_sprites_by_tile: Dict[Point, List[NpcSprite]] = {}
+        self.npc_sprites_by_name: Dict[str, NpcSprite] = {}
+
+        # Renderer
+        self.map_layer = map_layer
+
+        # When the PC moves into or out of an overlay, redraw only the affected tiles rather than the whole buffer
+        self.incremental_overlay_redraw = True
+
         # Create the pyscroll group to support character and decoration sprites
         self.group = pyscroll.PyscrollGroup(
             map_layer=self.map_layer, default_layer=self.map_data.decoration_layer
@@ -515,19 +752,312 @@ class GameMap(GameMapInterface):
                 HeroSprite(hero, hero_party, self), layer=self.map_data.character_layer
             )
         for npc_info in self.npcs:
-            self.group.add(
-                NpcSprite(npc_info, self), layer=self.map_data.character_layer
-            )
+            npc_sprite = NpcSprite(npc_info, self)
+            self.group.add(npc_sprite, layer=self.map_data.character_layer)
+            self.add_character_occupancy(npc_sprite)
+            npc_name = npc_info.npc_info.name
+            if npc_name is not None and npc_name not in self.npc_sprites_by_name:
+                self.npc_sprites_by_name[npc_name] = npc_sprite
 
     def size(self, with_padding: bool = False) -> Point:
         # Doesn't include padding, just the size of data size of the map
         if with_padding:
             return Point(self.map_data.map_size)
         else:
-            return (
-                Point(self.map_data.map_size)
-                - 2 * self.game_state.get_image_pad_tiles()
+            return self.map_size_tiles
+
+    @staticmethod
+    def get_map_data_cache_key(
+        game_state: GameStateInterface, map_name: str
+    ) -> MapDataCacheKey:
+        return (
+            map_name,
+            game_state.get_game_info().tile_size_pixels,
+            game_state.get_image_pad_tiles().get_as_int_tuple(),
+            game_state.screen.get_size(),
+        )
+
+    @staticmethod
+    def create_map_data_cache_entry(
+        game_info: GameInfo,
+        map: Map,
+        image_pad_tiles: Point,
+    ) -> MapDataCacheEntry:
+        """
+        Load the map data for a map and build the tile grids for it.  This does not depend on any game state beyond the
+        game info and does not use pygame surfaces so that maps may be loaded in the background (see MapPrefetcher).
+        The tile images and renderer are left to create_map_layer.
+        """
+        map_data = GameMap.load_map_data(
+            game_info, map, image_pad_tiles, load_tile_images=False
+        )
+        tiled_tile_types = GameMap.calc_tiled_tile_types(game_info, map_data)
+        tile_grids = GameMap.calc_base_tile_grids(
+            game_info,
+            map,
+            map_data,
+            tiled_tile_types,
+            Point(map_data.map_size) - 2 * image_pad_tiles,
+        )
+        return MapDataCacheEntry(map, map_data, None, tiled_tile_types, tile_grids)
+
+    @staticmethod
+    def create_map_layer(
+        map_data_cache_entry: MapDataCacheEntry, screen_size: Tuple[int, int]
+    ) -> pyscroll.BufferedRenderer:
+        """Load the tile images of the map data and create the renderer for it, which must be done on the main thread"""
+        if isinstance(map_data_cache_entry.map_data, PaddedTiledMapData):
+            map_data_cache_entry.map_data.load_tile_images()
+        map_layer = pyscroll.BufferedRenderer(
+            map_data_cache_entry.map_data, screen_size
+        )
+        map_data_cache_entry.map_layer = map_layer
+        return map_layer
+
+    @staticmethod
+    def load_map_data(
+        game_info: GameInfo,
+        map: Map,
+        image_pad_tiles: Point,
+        load_tile_images: bool = True,
+    ) -> Union[PaddedTiledMapData, LegacyMapData]:
+        if map.tiled_filename is not None:
+            return PaddedTiledMapData(
+                map.tiled_filename,
+                image_pad_tiles,
+                desired_tile_size=game_info.tile_size_pixels,
+                load_tile_images=load_tile_images,
             )
+        return LegacyMapData(game_info, map.name, image_pad_tiles)
+
+    @staticmethod
+    def calc_tiled_tile_types(
+        game_info: GameInfo, map_data: Union[PaddedTiledMapData, LegacyMapData]
+    ) -> List[Tile]:
+        """Map the tile type names of Tiled maps to the tile information"""
+        tiled_tile_types: List[Tile] = []
+        if isinstance(map_data, PaddedTiledMapData):
+            for tile_name in map_data.tile_type_names:
+                if tile_name in game_info.tiles:
+                    tiled_tile_types.append(game_info.tiles[tile_name])
+                else:
+                    tiled_tile_types.append(Tile.default_tile())
+        return tiled_tile_types
+
+    @staticmethod
+    def calc_base_tile_grids(
+        game_info: GameInfo,
+        map: Map,
+        map_data: Union[PaddedTiledMapData, LegacyMapData],
+        tiled_tile_types: List[Tile],
+        map_size_tiles: Point,
+    ) -> Dict[str, numpy.ndarray]:
+        """
+        :return: The per tile grids which depend only on the map data and not on the map decorations, keyed by the
+                 name of the GameMap attribute they are stored in
+        """
+        map_size_w, map_size_h = map_size_tiles.get_as_int_tuple()
+        tile_base_walkable = numpy.zeros((map_size_w, map_size_h), dtype=bool)
+        tile_hp_penalty = numpy.zeros((map_size_w, map_size_h), dtype=numpy.int32)
+        tile_movement_speed_factor = numpy.ones(
+            (map_size_w, map_size_h), dtype=numpy.float64
+        )
+        tile_interior = numpy.zeros((map_size_w, map_size_h), dtype=bool)
+        tile_npc_path_cost = numpy.ones((map_size_w, map_size_h), dtype=numpy.float64)
+        for x in range(map_size_w):
+            for y in range(map_size_h):
+                tile = Point(x, y)
+                tile_info = GameMap.lookup_tile_info(
+                    game_info, map, map_data, tiled_tile_types, tile
+                )
+                tile_base_walkable[x, y] = tile_info.walkable
+                tile_hp_penalty[x, y] = tile_info.hp_penalty
+                tile_movement_speed_factor[x, y] = tile_info.movement_speed_factor
+                tile_interior[x, y] = map_data.is_interior(tile)
+                tile_npc_path_cost[x, y] = (
+                    1.0 if tile_info.name == "path" else 3.0
+                ) / tile_info.movement_speed_factor
+        return {
+            "tile_base_walkable": tile_base_walkable,
+            "tile_hp_penalty": tile_hp_penalty,
+            "tile_movement_speed_factor": tile_movement_speed_factor,
+            "tile_interior": tile_interior,
+            "tile_npc_path_cost": tile_npc_path_cost,
+        }
+
+    def set_base_tile_grids(self, tile_grids: Dict[str, numpy.ndarray]) -> None:
+        # The base grids are never modified so they may be shared with the map data cache
+        self.tile_base_walkable = tile_grids["tile_base_walkable"]
+        self.tile_hp_penalty = tile_grids["tile_hp_penalty"]
+        self.tile_movement_speed_factor = tile_grids["tile_movement_speed_factor"]
+        self.tile_interior = tile_grids["tile_interior"]
+        self.tile_npc_path_cost = tile_grids["tile_npc_path_cost"]
+        self.tile_walkable = numpy.zeros(self.tile_base_walkable.shape, dtype=bool)
+
+    def update_tile_walkable(self, rect: pygame.Rect) -> None:
+        """Recompute the walkable flags for the tiles in rect from the tile types and the map decorations"""
+        rect = rect.clip(pygame.Rect((0, 0), self.map_size_tiles.get_as_int_tuple()))
+        if rect.w <= 0 or rect.h <= 0:
+            return
+
+        # A decoration which is not walkable prevents movement to a tile that otherwise allowed movement while a
+        # walkable decoration allows movement to a tile to which movement was otherwise prevented.
+        blocked = numpy.zeros((rect.w, rect.h), dtype=bool)
+        allowed = numpy.zeros((rect.w, rect.h), dtype=bool)
+        for decoration in self.map_decorations:
+            if decoration.type is None or decoration.type.walkable is None:
+                continue
+            overlap = decoration.collision_rect.clip(rect)
+            if overlap.w <= 0 or overlap.h <= 0:
+                continue
+            overlap.move_ip(-rect.x, -rect.y)
+            if decoration.type.walkable:
+                allowed[overlap.left : overlap.right, overlap.top : overlap.bottom] = (
+                    True
+                )
+            else:
+                blocked[overlap.left : overlap.right, overlap.top : overlap.bottom] = (
+                    True
+                )
+
+        self.tile_walkable[rect.left : rect.right, rect.top : rect.bottom] = (
+            self.tile_base_walkable[rect.left : rect.right, rect.top : rect.bottom]
+            & ~blocked
+        ) | allowed
+        self.tile_grid_version += 1
+
+    def is_tile_in_bounds(self, tile: Point) -> bool:
+        tile_x, tile_y = tile.get_as_int_tuple()
+        return (
+            0 <= tile_x < self.map_size_tiles.w and 0 <= tile_y < self.map_size_tiles.h
+        )
+
+    def get_walkability_version(self) -> int:
+        return self.tile_grid_version
+
+    def get_npc_path_cost(self, tile: Point) -> float:
+        if self.is_tile_in_bounds(tile):
+            return float(self.tile_npc_path_cost[tile.get_as_int_tuple()])
+        return super().get_npc_path_cost(tile)
+
+    def get_npc_distance_field(self, goal: Point) -> Optional[numpy.ndarray]:
+        if self.npc_distance_fields_version != self.tile_grid_version:
+            self.npc_distance_fields = {}
+            self.npc_distance_fields_version = self.tile_grid_version
+        if goal not in self.npc_distance_fields:
+            self.npc_distance_fields[goal] = self.compute_npc_distance_field(goal)
+        return self.npc_distance_fields[goal]
+
+    def compute_npc_distance_field(self, goal: Point) -> numpy.ndarray:
+        """
+        Run Dijkstra's algorithm outward from goal over the static NPC movement restrictions (walkability, HP penalty
+        and interior/exterior transitions).  Occupancy by characters is not considered as it changes every step.
+        """
+        # Work on flat lists indexed by x * map_h + y, which matches the ravel ordering of the tile grid arrays
+        map_w, map_h = self.map_size_tiles.get_as_int_tuple()
+        enterable = (self.tile_walkable & (self.tile_hp_penalty == 0)).ravel().tolist()
+        interior = self.tile_interior.ravel().tolist()
+        path_cost = self.tile_npc_path_cost.ravel().tolist()
+        distance = [math.inf] * (map_w * map_h)
+
+        if self.is_tile_in_bounds(goal):
+            goal_x, goal_y = goal.get_as_int_tuple()
+            goal_idx = goal_x * map_h + goal_y
+            distance[goal_idx] = 0.0
+            open_set: List[Tuple[float, int]] = [(0.0, goal_idx)]
+            while 0 < len(open_set):
+                current_distance, current_idx = heappop(open_set)
+                if current_distance != distance[current_idx]:
+                    continue
+
+                # Only relax through tiles an NPC is able to move onto
+                if not enterable[current_idx]:
+                    continue
+
+                current_x, current_y = divmod(current_idx, map_h)
+                neighbor_distance = current_distance + path_cost[current_idx]
+                for neighbor_idx, in_bounds in (
+                    (current_idx - map_h, 0 < current_x),
+                    (current_idx + map_h, current_x < map_w - 1),
+                    (current_idx - 1, 0 < current_y),
+                    (current_idx + 1, current_y < map_h - 1),
+                ):
+                    if (
+                        in_bounds
+                        and interior[neighbor_idx] == interior[current_idx]
+                        and neighbor_distance < distance[neighbor_idx]
+                    ):
+                        distance[neighbor_idx] = neighbor_distance
+                        heappush(open_set, (neighbor_distance, neighbor_idx))
+
+        return numpy.array(distance, dtype=numpy.float64).reshape((map_w, map_h))
+
+    def get_tile_movement_speed_factor(self, tile: Point) -> float:
+        if self.is_tile_in_bounds(tile):
+            return float(self.tile_movement_speed_factor[tile.get_as_int_tuple()])
+        return self.get_tile_info(tile).movement_speed_factor
+
+    @staticmethod
+    def get_decoration_tiles(decoration: MapDecoration) -> List[Point]:
+        rect = decoration.collision_rect
+        return [
+            Point(x, y)
+            for x in range(rect.left, rect.right)
+            for y in range(rect.top, rect.bottom)
+        ]
+
+    def add_decoration_to_index(self, decoration: MapDecoration) -> None:
+        for tile in self.get_decoration_tiles(decoration):
+            if tile in self.decorations_by_tile:
+                self.decorations_by_tile[tile].append(decoration)
+            else:
+                self.decorations_by_tile[tile] = [decoration]
+
+    def remove_decoration_from_index(self, decoration: MapDecoration) -> None:
+        for tile in self.get_decoration_tiles(decoration):
+            if tile in self.decorations_by_tile:
+                tile_decorations = self.decorations_by_tile[tile]
+                if decoration in tile_decorations:
+                    tile_decorations.remove(decoration)
+                if 0 == len(tile_decorations):
+                    del self.decorations_by_tile[tile]
+
+    def get_overlapping_decorations(self, tile: Point) -> List[MapDecoration]:
+        if tile in self.decorations_by_tile:
+            return self.decorations_by_tile[tile]
+        return []
+
+    @staticmethod
+    def get_occupied_tiles(sprite: CharacterSprite) -> List[Point]:
+        if sprite.character.curr_pos_dat_tile == sprite.character.dest_pos_dat_tile:
+            return [sprite.character.curr_pos_dat_tile]
+        return [sprite.character.curr_pos_dat_tile, sprite.character.dest_pos_dat_tile]
+
+    def add_character_occupancy(self, sprite: CharacterSprite) -> None:
+        # Only NPCs are indexed.  Hero positions are set directly from outside of the map and the party is small.
+        if not isinstance(sprite, NpcSprite):
+            return
+        for tile in self.get_occupied_tiles(sprite):
+            if tile in self.npc_sprites_by_tile:
+                self.npc_sprites_by_tile[tile].append(sprite)
+            else:
+                self.npc_sprites_by_tile[tile] = [sprite]
+
+    def remove_character_occupancy(self, sprite: CharacterSprite) -> None:
+        if not isinstance(sprite, NpcSprite):
+            return
+        for tile in self.get_occupied_tiles(sprite):
+            if tile in self.npc_sprites_by_tile:
+                tile_sprites = self.npc_sprites_by_tile[tile]
+                if sprite in tile_sprites:
+                    tile_sprites.remove(sprite)
+                if 0 == len(tile_sprites):
+                    del self.npc_sprites_by_tile[tile]
+
+    def get_npc_sprite_at_tile(self, tile: Point) -> Optional[NpcSprite]:
+        if tile in self.npc_sprites_by_tile:
+            return self.npc_sprites_by_tile[tile][0]
+        return None
 
     def update(self) -> None:
         self.group.update()
@@ -553,7 +1083,10 @@ class GameMap(GameMapInterface):
         if self.map_data.set_pc_character_tile(
             self.game_state.get_hero_party().get_curr_pos_dat_tile()
         ):
-            self.map_layer.redraw_tiles(self.map_layer._buffer)
+            if self.incremental_overlay_redraw:
+                self.redraw_overlay_tiles()
+            else:
+                self.map_layer.redraw_tiles(self.map_layer._buffer)
 
         # tell the map_layer (BufferedRenderer) to draw to the surface
         # the draw function requires a rect to draw to.
@@ -561,54 +1094,108 @@ class GameMap(GameMapInterface):
 
         light_diameter = self.game_state.get_hero_party().light_diameter
         if light_diameter is not None:
-            light_radius_px = (
-                light_diameter * self.game_state.get_game_info().tile_size_pixels / 2
+            surface.blit(
+                self.get_light_mask(
+                    surface.get_size(),
+                    light_diameter,
+                    self.game_state.get_game_info().tile_size_pixels,
+                ),
+                (0, 0),
             )
 
+    @staticmethod
+    def get_light_mask(
+        size: Tuple[int, int], light_diameter: float, tile_size_pixels: int
+    ) -> pygame.surface.Surface:
+        """Get the cached mask which blacks out everything outside the light around the center of a surface"""
+        key = (size, light_diameter, tile_size_pixels, GameMap.circular_light_mask)
+        if key in GameMap.light_masks:
+            return GameMap.light_masks[key]
+
+        # An opaque surface where the light is the colorkey blits faster than a per pixel alpha surface, especially as
+        # RLE acceleration skips over the lit runs
+        light_mask = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            light_mask = light_mask.convert()
+        light_mask.fill(GameMap.light_mask_colorkey)
+        light_radius_px = light_diameter * tile_size_pixels / 2
+        width, height = size
+        if GameMap.circular_light_mask:
+            light_mask.fill("black")
+            pygame.draw.circle(
+                light_mask,
+                GameMap.light_mask_colorkey,
+                (width / 2, height / 2),
+                light_radius_px,
+            )
+        else:
             # Left
-            surface.fill(
+            light_mask.fill(
                 "black",
-                pygame.Rect(
-                    0,
-                    0,
-                    surface.get_width() / 2 - light_radius_px,
-                    surface.get_height(),
-                ),
+                pygame.Rect(0, 0, width / 2 - light_radius_px, height),
             )
 
             # Right
-            surface.fill(
+            light_mask.fill(
                 "black",
                 pygame.Rect(
-                    surface.get_width() / 2 + light_radius_px,
+                    width / 2 + light_radius_px,
                     0,
-                    surface.get_width() / 2 - light_radius_px,
-                    surface.get_height(),
+                    width / 2 - light_radius_px,
+                    height,
                 ),
             )
 
             # Top
-            surface.fill(
+            light_mask.fill(
                 "black",
-                pygame.Rect(
-                    0,
-                    0,
-                    surface.get_width(),
-                    surface.get_height() / 2 - light_radius_px,
-                ),
+                pygame.Rect(0, 0, width, height / 2 - light_radius_px),
             )
 
             # Bottom
-            surface.fill(
+            light_mask.fill(
                 "black",
                 pygame.Rect(
                     0,
-                    surface.get_height() / 2 + light_radius_px,
-                    surface.get_width(),
-                    surface.get_height() / 2 - light_radius_px,
+                    height / 2 + light_radius_px,
+                    width,
+                    height / 2 - light_radius_px,
                 ),
             )
 
+        light_mask.set_colorkey(GameMap.light_mask_colorkey, pygame.RLEACCEL)
+        GameMap.light_masks[key] = light_mask
+        return light_mask
+
+    def redraw_overlay_tiles(self) -> None:
+        """Redraw only the tiles affected by the PC moving into or out of an overlay rather than the whole buffer"""
+        redraw_rect = self.map_data.get_overlay_redraw_rect()
+        if redraw_rect is None:
+            self.map_layer.redraw_tiles(self.map_layer._buffer)
+            return
+
+        buffer = self.map_layer._buffer
+        tile_view = self.map_layer._tile_view
+        tile_w, tile_h = self.map_data.tile_size
+        if self.map_data.is_rendering_bounded():
+            # Everything outside of the redraw rect is masked to black
+            buffer.fill("black")
+
+        redraw_rect = redraw_rect.clip(tile_view)
+        if redraw_rect.w <= 0 or redraw_rect.h <= 0:
+            return
+        self.map_layer._clear_surface(
+            buffer,
+            (
+                (redraw_rect.x - tile_view.x) * tile_w,
+                (redraw_rect.y - tile_view.y) * tile_h,
+                redraw_rect.w * tile_w,
+                redraw_rect.h * tile_h,
+            ),
+        )
+        self.map_layer._tile_queue = self.map_data.get_tile_images_by_rect(redraw_rect)
+        self.map_layer._flush_tile_queue(buffer)
+
     def draw_character_sprites(self) -> None:
         map_center_offset = self.group._map_layer.get_center_offset()
         for sprite in self.group.get_sprites_from_layer(self.map_data.character_layer):
@@ -622,36 +1209,33 @@ class GameMap(GameMapInterface):
     ) -> Tile:
         if tile is None:
             tile = self.game_state.get_hero_party().main_character.curr_pos_dat_tile
+        return GameMap.lookup_tile_info(
+            self.game_state.get_game_info(),
+            self.map,
+            self.map_data,
+            self.tiled_tile_types,
+            tile,
+            use_second,
+        )
 
-        if isinstance(self.map_data, PaddedTiledMapData):
-            tile_name = None
+    @staticmethod
+    def lookup_tile_info(
+        game_info: GameInfo,
+        map: Map,
+        map_data: Union[PaddedTiledMapData, LegacyMapData],
+        tiled_tile_types: List[Tile],
+        tile: Point,
+        use_second: bool = False,
+    ) -> Tile:
+        if isinstance(map_data, PaddedTiledMapData):
             tile_x, tile_y = tile.get_as_int_tuple()
-            for layer_idx in reversed(self.map_data.base_tile_layers):
-                tile_properties = self.map_data.get_tile_properties(
-                    tile_x, tile_y, layer_idx
-                )
-                if (
-                    tile_properties is not None
-                    and "type" in tile_properties
-                    and tile_properties["type"] is not None
-                    and len(tile_properties["type"]) > 0
-                ):
-                    tile_name = tile_properties["type"]
-                    if use_second:
-                        use_second = False
-                    else:
-                        break
-            if (
-                tile_name is not None
-                and tile_name in self.game_state.get_game_info().tiles
-            ):
-                return self.game_state.get_game_info().tiles[tile_name]
+            tile_type_idx = map_data.get_tile_type_index(tile_x, tile_y, use_second)
+            if tile_type_idx != -1:
+                return tiled_tile_types[tile_type_idx]
         else:
             try:
-                return self.game_state.get_game_info().tiles[
-                    self.game_state.get_game_info().tile_symbols[
-                        self.map.dat[int(tile.y)][int(tile.x)]
-                    ]
+                return game_info.tiles[
+                    game_info.tile_symbols[map.dat[int(tile.y)][int(tile.x)]]
                 ]
             except IndexError:
                 pass
@@ -667,7 +1251,7 @@ class GameMap(GameMapInterface):
         decorations = []
         if tile is None:
             tile = self.game_state.get_hero_party().get_curr_pos_dat_tile()
-        for decoration in self.map_decorations:
+        for decoration in self.get_overlapping_decorations(tile):
             if decoration.point == tile and self.game_state.check_progress_markers(
                 decoration.progress_marker, decoration.inverse_progress_marker
             ):
@@ -709,67 +1293,54 @@ class GameMap(GameMapInterface):
         return decoration
 
     def get_npc_to_talk_to(self) -> Optional[NpcState]:
-        def get_npc_sprite_at_tile(pos_dat_tile: Point) -> Optional[NpcState]:
-            for sprite in self.group:
-                if isinstance(sprite, NpcSprite):
-                    npc_state = sprite.character
-                    npc_info = npc_state.npc_info
-                else:
-                    continue
+        def get_npc_to_talk_to_at_tile(pos_dat_tile: Point) -> Optional[NpcState]:
+            sprite = self.get_npc_sprite_at_tile(pos_dat_tile)
+            if sprite is None:
+                return None
+            npc_state = sprite.character
+            npc_info = npc_state.npc_info
+
+            # NPC should turn to face you if they have something to say
+            if npc_info.dialog is not None:
+                sprite.set_pos_dat_tiles(pos_dat_tile, pos_dat_tile)
+                sprite.character.curr_pos_offset_img_px = Point(0, 0)
+                sprite.character.direction = (
+                    self.game_state.get_hero_party().members[0].direction.get_opposite()
+                )
+                sprite.update_count = 0
+                sprite.update()
 
-                if npc_info is not None and (
-                    pos_dat_tile == sprite.character.curr_pos_dat_tile
-                    or pos_dat_tile == sprite.character.dest_pos_dat_tile
-                ):
-                    # NPC should turn to face you if they have something to say
-                    if npc_info.dialog is not None:
-                        sprite.character.curr_pos_dat_tile = (
-                            sprite.character.dest_pos_dat_tile
-                        ) = pos_dat_tile
-                        sprite.character.curr_pos_offset_img_px = Point(0, 0)
-                        sprite.character.direction = (
-                            self.game_state.get_hero_party()
-                            .members[0]
-                            .direction.get_opposite()
-                        )
-                        sprite.update_count = 0
-                        sprite.update()
+                # Stationary characters should resume looking in the default direction after talking to the player.
+                if not npc_info.walking:
+                    sprite.character.direction = npc_info.direction
 
-                        # Stationary characters should resume looking in the default direction after talking to the
-                        # player.
-                        if not npc_info.walking:
-                            sprite.character.direction = npc_info.direction
-
-                    return npc_state
-            return None
+            return npc_state
 
         talk_dest_dat_tile = (
             self.game_state.get_hero_party().members[0].curr_pos_dat_tile
             + self.game_state.get_hero_party().members[0].direction.get_vector()
         )
-        npc_to_talk_to = get_npc_sprite_at_tile(talk_dest_dat_tile)
+        npc_to_talk_to = get_npc_to_talk_to_at_tile(talk_dest_dat_tile)
         if npc_to_talk_to is None:
             talk_dest_tile_type = self.game_state.get_tile_info(talk_dest_dat_tile)
             can_talk_over = talk_dest_tile_type.can_talk_over
 
             # Check if a decoration prevents talking over a tile that otherwise allowed talking
             if can_talk_over:
-                for decoration in self.map_decorations:
+                for decoration in self.get_overlapping_decorations(talk_dest_dat_tile):
                     if (
                         decoration.type is not None
                         and decoration.type.can_talk_over is False
-                        and decoration.overlaps(talk_dest_dat_tile)
                     ):
                         can_talk_over = False
                         # print('Talking over not allowed: decoration', decoration, flush=True)
                         break
             # Check if a decoration allows talking over a tile to where talking was otherwise prevented
             if not can_talk_over:
-                for decoration in self.map_decorations:
+                for decoration in self.get_overlapping_decorations(talk_dest_dat_tile):
                     if (
                         decoration.type is not None
                         and decoration.type.can_talk_over is True
-                        and decoration.overlaps(talk_dest_dat_tile)
                     ):
                         can_talk_over = True
                         # print('Talking over allowed: decoration', decoration, flush=True)
@@ -780,17 +1351,13 @@ class GameMap(GameMapInterface):
                     talk_dest_dat_tile
                     + self.game_state.get_hero_party().members[0].direction.get_vector()
                 )
-                npc_to_talk_to = get_npc_sprite_at_tile(talk_dest_dat_tile)
+                npc_to_talk_to = get_npc_to_talk_to_at_tile(talk_dest_dat_tile)
 
         return npc_to_talk_to
 
     def get_npc_by_name(self, name: str) -> Optional[MapCharacterState]:
-        for sprite in self.group:
-            if isinstance(sprite, NpcSprite):
-                npc_state = sprite.character
-                if name == npc_state.npc_info.name:
-                    return npc_state
-
+        if name in self.npc_sprites_by_name:
+            return self.npc_sprites_by_name[name].character
         return None
 
     def get_tile_degrees_of_freedom(
@@ -823,39 +1390,15 @@ class GameMap(GameMapInterface):
     ) -> bool:
         movement_allowed = False
 
-        # Check if native tile allows movement
-        if 0 <= tile.x < self.size().w and 0 <= tile.y < self.size().h:
-            movement_allowed = self.get_tile_info(tile).walkable
-            # print('Tile info =', self.get_tile_info(tile), self.get_tile_info(tile), flush=True)
-
-        # Check if a decoration prevents movement to the tile that otherwise allowed movement
-        if movement_allowed:
-            for decoration in self.map_decorations:
-                if (
-                    decoration.type is not None
-                    and decoration.type.walkable is False
-                    and decoration.overlaps(tile)
-                ):
-                    movement_allowed = False
-                    # print('Movement not allowed: decoration not walkable', decoration, flush=True)
-                    break
-        # Check if a decoration allows movement to a tile to which movement was otherwise prevented
-        if not movement_allowed:
-            for decoration in self.map_decorations:
-                if (
-                    decoration.type is not None
-                    and decoration.type.walkable is True
-                    and decoration.overlaps(tile)
-                ):
-                    movement_allowed = True
-                    # print('Movement allowed: decoration walkable', decoration, flush=True)
-                    break
+        # Check if the tile allows movement, taking into account the decorations on the tile
+        if self.is_tile_in_bounds(tile):
+            movement_allowed = bool(self.tile_walkable[tile.get_as_int_tuple()])
 
         if movement_allowed:
             if (
                 movement_allowed
                 and enforce_npc_hp_penalty_limit
-                and self.get_tile_info(tile).hp_penalty != 0
+                and self.tile_hp_penalty[tile.get_as_int_tuple()] != 0
             ):
                 movement_allowed = False
                 # print('Movement not allowed: NPC HP penalty limited', flush=True)
@@ -883,12 +1426,9 @@ class GameMap(GameMapInterface):
                         movement_allowed = False
                         # print('Movement not allowed: PC in the way', flush=True)
                         break
-            if movement_allowed:
-                for npc in self.npcs:
-                    if tile == npc.curr_pos_dat_tile or tile == npc.dest_pos_dat_tile:
-                        movement_allowed = False
-                        # print('Movement not allowed: NPC in the way', flush=True)
-                        break
+            if movement_allowed and tile in self.npc_sprites_by_tile:
+                movement_allowed = False
+                # print('Movement not allowed: NPC in the way', flush=True)
         # else:
         #     print('Movement not allowed: tile not walkable', flush=True)
 
@@ -922,6 +1462,8 @@ class GameMap(GameMapInterface):
     def is_interior(self, pos_dat_tile: Optional[Point] = None) -> bool:
         if pos_dat_tile is None:
             pos_dat_tile = self.game_state.get_hero_party().get_curr_pos_dat_tile()
+        if self.is_tile_in_bounds(pos_dat_tile):
+            return bool(self.tile_interior[pos_dat_tile.get_as_int_tuple()])
         return self.map_data.is_interior(pos_dat_tile)
 
     def is_exterior(self, pos_dat_tile: Optional[Point] = None) -> bool:
@@ -974,6 +1516,8 @@ class GameMap(GameMapInterface):
         # Remove the decoration from the map (if present)
         if decoration in self.map_decorations and decoration.type is not None:
             self.map_decorations.remove(decoration)
+            self.remove_decoration_from_index(decoration)
+            self.update_tile_walkable(decoration.collision_rect)
 
             for sprite in self.group.remove_sprites_of_layer(
                 self.map_data.decoration_layer
@@ -1061,127 +1605,376 @@ class GameMap(GameMapInterface):
         if self.game_state.get_hero_party().light_diameter is not None:
             return "darkness"
 
-        # Determine the base tile
         if tile is None:
             tile = self.game_state.get_hero_party().get_curr_pos_dat_tile()
-        tile_info = self.get_tile_info(tile)
-        tile_name = tile_info.name.replace("_walkable", "")
 
-        # Handle gates, which we should be able to see through to the local terrain
-        background_prefix = ""
-        if "gate" == tile_name:
-            background_prefix = "gate:"
-            tile_info = self.get_tile_info(tile, use_second=True)
-            tile_name = tile_info.name.replace("_walkable", "")
+        # Look up the background from the grid of backgrounds for the map, which is built on first use and cached with
+        # the map data.  Tiles outside of the map are rare so their background is determined tile by tile.
+        map_w, map_h = self.map_size_tiles.get_as_int_tuple()
+        tile_x, tile_y = tile.get_as_int_tuple()
+        if 0 <= tile_x < map_w and 0 <= tile_y < map_h:
+            encounter_background_name: str = self.get_encounter_background_name_grid(
+                backgrounds
+            )[tile_x, tile_y]
+        else:
+            encounter_background_name = self.calc_encounter_background_name(
+                tile, backgrounds
+            )
+
+        if encounter_background_name == "DEFAULT TILE":
+            print("WARN: default tile at", tile, flush=True)
 
+        return encounter_background_name
+
+    def get_encounter_background_name_grid(
+        self, backgrounds: Optional[List[str]] = None
+    ) -> numpy.ndarray:
+        key = "encounter_background_name_grid"
+        if backgrounds is not None:
+            key += ":" + ",".join(backgrounds)
+        encounter_background_name_grid = self.map_data_tile_grids.get(key)
+        if encounter_background_name_grid is None:
+            tile_type_names, tile_type_grid, second_tile_type_grid = (
+                GameMap.calc_tile_type_name_grids(
+                    self.game_state.get_game_info(),
+                    self.map,
+                    self.map_data,
+                    self.tiled_tile_types,
+                    self.map_size_tiles,
+                    GameMap.encounter_background_border,
+                )
+            )
+            encounter_background_name_grid = (
+                GameMap.calc_encounter_background_name_grid(
+                    tile_type_names,
+                    tile_type_grid,
+                    second_tile_type_grid,
+                    GameMap.encounter_background_border,
+                    backgrounds,
+                )
+            )
+            self.map_data_tile_grids[key] = encounter_background_name_grid
+        return encounter_background_name_grid
+
+    def calc_encounter_background_name(
+        self, tile: Point, backgrounds: Optional[List[str]] = None
+    ) -> str:
+        """Determine the encounter background name of a single tile when not dark"""
+        # Determine the base tile
+        tile_name = self.get_tile_info(tile).name.replace("_walkable", "")
+
+        # Handle gates, which we should be able to see through to the local terrain
+        is_gate = "gate" == tile_name
+        if is_gate:
+            tile_name = self.get_tile_info(tile, use_second=True).name.replace(
+                "_walkable", ""
+            )
         if tile_name in ["hill", "cliff"]:
             tile_name = "plain"
 
         # Handle background for forested tiles, taking into account if we are deep in the forest or on the perimeter.
-        forested_tiles = ["deciduous_forest", "pine_forest", "jungle"]
-        if tile_name in forested_tiles:
+        forest_level = -1
+        if tile_name in GameMap.forested_tiles:
             adjacent_tiles_of_same_type = (
                 self.get_surrounding_tile_type_count(tile, 1, [tile_name]) - 1
             )
             if adjacent_tiles_of_same_type >= 7:
-                return background_prefix + tile_name + "_dark"
+                forest_level = 0
             elif adjacent_tiles_of_same_type >= 2:
-                return background_prefix + tile_name
+                forest_level = 1
             else:
-                return background_prefix + tile_name + "_light"
+                forest_level = 2
 
         # Handle shore backgrounds
-        shore_tiles = [
-            "shore",
-            "shore_walkable",
-            "shore_cliff",
-            "shore_cliff_walkable",
-            "beach",
-            "beach_walkable",
-        ]
-        shore_tile_name_to_tile_name_map = {
-            "shore": "plain",
-            "shore_cliff": "plain",
-            "beach": "desert",
-        }
-        shore_counts = self.get_adjacent_tile_type_counts(tile, shore_tiles)
-        for tile_type, count in shore_counts.items():
-            if count > 0:
-                shore_tile_name = tile_type.replace("_walkable", "")
-                if (
-                    shore_tile_name in shore_tile_name_to_tile_name_map
-                    and tile_name == shore_tile_name_to_tile_name_map[shore_tile_name]
-                ):
-                    return background_prefix + shore_tile_name
+        shore = -1
+        shore_counts = self.get_adjacent_tile_type_counts(tile, GameMap.shore_tiles)
+        for shore_idx, tile_type in enumerate(GameMap.shore_tiles):
+            shore_tile_name = tile_type.replace("_walkable", "")
+            if (
+                shore_counts[tile_type] > 0
+                and tile_name
+                == GameMap.shore_tile_name_to_tile_name_map.get(shore_tile_name)
+            ):
+                shore = shore_idx
+                break
+
+        # Factor in vegetation
+        vegetation = -1
+        vegetation_count = 0
+        vegetation_counts = self.get_surrounding_tile_type_counts(
+            tile, 1, GameMap.forested_tiles
+        )
+        for vegetation_idx, tile_type in enumerate(GameMap.forested_tiles):
+            if vegetation_counts[tile_type] > vegetation_count:
+                vegetation, vegetation_count = (
+                    vegetation_idx,
+                    vegetation_counts[tile_type],
+                )
+
+        # Factor in elevation
+        elevation = -1
+        if self.get_surrounding_tile_type_count(tile, 3, ["volcano"]) > 0:
+            elevation = 0
+        elif self.get_surrounding_tile_type_count(tile, 1, ["mountain"]) > 0:
+            elevation = 1
+        elif self.get_surrounding_tile_type_count(tile, 3, ["mountain"]) > 5:
+            elevation = 2
+        elif self.get_surrounding_tile_type_count(tile, 1, ["cliff", "cliff_walkable"]) > 1:
+            elevation = 3
+        elif self.get_surrounding_tile_type_count(tile, 1, ["hill"]) > 1:
+            elevation = 4
+
+        return GameMap.compose_encounter_background_name(
+            is_gate, tile_name, forest_level, shore, vegetation, elevation, backgrounds
+        )
+
+    @staticmethod
+    def compose_encounter_background_name(
+        is_gate: bool,
+        tile_name: str,
+        forest_level: int,
+        shore: int,
+        vegetation: int,
+        elevation: int,
+        backgrounds: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Compose the encounter background name of a tile from the features of its surroundings.
+
+        :param is_gate: If the tile is a gate, which we should be able to see through to the local terrain
+        :param tile_name: Name of the tile type, or of the tile type under the gate, with hills and cliffs as plains
+        :param forest_level: For forested tiles, 0 if deep in the forest, 1 if in the forest and 2 if on the perimeter
+        :param shore: Index into shore_tiles of the first shore tile type adjacent to the tile which borders tile_name
+        :param vegetation: Index into forested_tiles of the most common forested tile type near the tile
+        :param elevation: Index into elevations of the nearby elevation
+        :param backgrounds: The available backgrounds
+        """
+        background_prefix = "gate:" if is_gate else ""
+
+        # Handle background for forested tiles
+        if forest_level >= 0:
+            return background_prefix + tile_name + ["_dark", "", "_light"][forest_level]
+
+        # Handle shore backgrounds
+        if shore >= 0:
+            return background_prefix + GameMap.shore_tiles[shore].replace(
+                "_walkable", ""
+            )
 
         # Handle backgrounds on some other tile types, taking into account surrounding vegetation and elevation.
-        if tile_name in ["plain", "desert"]:
-            # Factor in vegetation
+        if tile_name in ["plain", "desert"] and backgrounds is not None:
             vegetation_suffix = ""
-            vegetation_counts = self.get_surrounding_tile_type_counts(
-                tile, 1, forested_tiles
-            )
-            vegetation = None
-            vegetation_count = 0
-            for tile_type, count in vegetation_counts.items():
-                if count > vegetation_count:
-                    vegetation, vegetation_count = tile_type, count
-            if vegetation is not None:
-                vegetation_suffix = "_" + vegetation
-
-            # Factor in elevation
+            if vegetation >= 0:
+                vegetation_suffix = "_" + GameMap.forested_tiles[vegetation]
             elevation_suffix = ""
-            elevation = None
-            if self.get_surrounding_tile_type_count(tile, 3, ["volcano"]) > 0:
-                elevation = "volcano"
-            else:
-                mountain_count = self.get_surrounding_tile_type_count(
-                    tile, 1, ["mountain"]
-                )
-                if mountain_count > 0:
-                    elevation = "close_mountain"
-                else:
-                    mountain_count = self.get_surrounding_tile_type_count(
-                        tile, 3, ["mountain"]
-                    )
-                    if mountain_count > 15:
-                        elevation = "distant_mountain"  # 'big_distant_mountain'
-                    elif mountain_count > 5:
-                        elevation = "distant_mountain"  # 'small_distant_mountain'
-                    else:
-                        cliff_count = self.get_surrounding_tile_type_count(
-                            tile, 1, ["cliff", "cliff_walkable"]
-                        )
-                        if cliff_count > 1:
-                            elevation = "cliff"
-                        elif elevation != "hill":
-                            hill_count = self.get_surrounding_tile_type_count(
-                                tile, 1, ["hill"]
-                            )
-                            if hill_count > 1:
-                                elevation = "hill"
-            if elevation is not None:
-                elevation_suffix = "_" + elevation
-
-            background = tile_name + vegetation_suffix + elevation_suffix
-            if backgrounds is not None:
+            if elevation >= 0:
+                elevation_suffix = "_" + GameMap.elevations[elevation]
+
+            for background in [
+                tile_name + vegetation_suffix + elevation_suffix,
+                tile_name + vegetation_suffix,
+                tile_name + elevation_suffix,
+            ]:
                 if background in backgrounds:
                     return background_prefix + background
-                # print(f'WARN: No encounter background for {background} at {tile}', flush=True)
 
-                background = tile_name + vegetation_suffix
-                if background in backgrounds:
-                    return background_prefix + background
+        # For all other tiles, just use the tile name
+        return tile_name
 
-                background = tile_name + elevation_suffix
-                if background in backgrounds:
-                    return background_prefix + background
+    @staticmethod
+    def calc_tile_type_name_grids(
+        game_info: GameInfo,
+        map: Map,
+        map_data: Union[PaddedTiledMapData, LegacyMapData],
+        tiled_tile_types: List[Tile],
+        map_size_tiles: Point,
+        border: int,
+    ) -> Tuple[List[str], numpy.ndarray, numpy.ndarray]:
+        """
+        Index the tile type names of the map, matching lookup_tile_info, including a border around the map.
 
-        # For all other tiles, just use the tile name
-        if tile_name == "DEFAULT TILE":
-            print("WARN: default tile at", tile, flush=True)
+        :return: The distinct tile type names, the grid of indices into them of the tile types, and the grid of indices
+                 into them of the second tile types.  Grids are indexed by [x + border, y + border].
+        """
+        map_w, map_h = map_size_tiles.get_as_int_tuple()
+        xs = numpy.arange(-border, map_w + border)
+        ys = numpy.arange(-border, map_h + border)
+        if isinstance(map_data, PaddedTiledMapData):
+            # Tile type indices of -1 are the default tile, and tiles outside of the map are clamped to the map
+            tile_type_names = [tile_info.name for tile_info in tiled_tile_types]
+            tile_type_names.append(Tile.default_tile().name)
+            default_idx = len(tile_type_names) - 1
+            xi = numpy.clip(xs, 0, map_w - 1)
+            yi = numpy.clip(ys, 0, map_h - 1)
+            grids = []
+            for grid in [map_data.tile_type_grid, map_data.second_tile_type_grid]:
+                grid = numpy.where(grid == -1, default_idx, grid)
+                grids.append(grid[numpy.ix_(xi, yi)])
+            return tile_type_names, grids[0], grids[1]
+
+        # Legacy maps index the map rows from the end for negative positions and use the default tile for positions
+        # past the ends of the map.  These have no second tile type.
+        symbols = numpy.array([list(row) for row in map.dat]).T
+        unique_symbols, symbol_idxs = numpy.unique(symbols, return_inverse=True)
+        symbol_idxs = symbol_idxs.reshape(symbols.shape)
+        tile_type_names = [
+            game_info.tiles[game_info.tile_symbols[symbol]].name
+            for symbol in unique_symbols
+        ]
+        tile_type_names.append(Tile.default_tile().name)
+        default_idx = len(tile_type_names) - 1
+        xi = numpy.where(xs < 0, xs + map_w, numpy.minimum(xs, map_w - 1))
+        yi = numpy.where(ys < 0, ys + map_h, numpy.minimum(ys, map_h - 1))
+        grid = symbol_idxs[numpy.ix_(xi, yi)]
+        grid[(xs < -map_w) | (xs >= map_w), :] = default_idx
+        grid[:, (ys < -map_h) | (ys >= map_h)] = default_idx
+        return tile_type_names, grid, grid
 
-        return tile_name
+    @staticmethod
+    def calc_encounter_background_name_grid(
+        tile_type_names: List[str],
+        tile_type_grid: numpy.ndarray,
+        second_tile_type_grid: numpy.ndarray,
+        border: int,
+        backgrounds: Optional[List[str]] = None,
+    ) -> numpy.ndarray:
+        """
+        :return: The encounter background name for each tile of the map when not dark, indexed by [x, y].  This is the
+                 vectorized equivalent of calc_encounter_background_name.
+        """
+        map_w = tile_type_grid.shape[0] - 2 * border
+        map_h = tile_type_grid.shape[1] - 2 * border
+        map_slice = (slice(border, border + map_w), slice(border, border + map_h))
+
+        def calc_counts(tile_types: List[str], distance: int) -> numpy.ndarray:
+            """
+            :return: Count of the tiles of the tile types within distance of each tile of the map, including the tile
+                     itself, where a distance of zero is the tile and the tiles adjacent to it
+            """
+            mask = numpy.isin(
+                tile_type_grid,
+                [idx for idx, name in enumerate(tile_type_names) if name in tile_types],
+            ).astype(numpy.int32)
+            if distance == 0:
+                return (
+                    mask[border : border + map_w, border : border + map_h]
+                    + mask[border - 1 : border - 1 + map_w, border : border + map_h]
+                    + mask[border + 1 : border + 1 + map_w, border : border + map_h]
+                    + mask[border : border + map_w, border - 1 : border - 1 + map_h]
+                    + mask[border : border + map_w, border + 1 : border + 1 + map_h]
+                )
+
+            # Box filter through a summed area table
+            summed_area = numpy.zeros(
+                (mask.shape[0] + 1, mask.shape[1] + 1), dtype=numpy.int32
+            )
+            summed_area[1:, 1:] = mask.cumsum(axis=0).cumsum(axis=1)
+            lo = border - distance
+            hi = border + distance + 1
+            return (
+                summed_area[hi : hi + map_w, hi : hi + map_h]
+                - summed_area[lo : lo + map_w, hi : hi + map_h]
+                - summed_area[hi : hi + map_w, lo : lo + map_h]
+                + summed_area[lo : lo + map_w, lo : lo + map_h]
+            )
+
+        # Determine the base tile, looking through gates to the local terrain
+        base_names = [name.replace("_walkable", "") for name in tile_type_names]
+        is_gate = numpy.isin(
+            tile_type_grid[map_slice],
+            [idx for idx, name in enumerate(base_names) if "gate" == name],
+        )
+        tile_type_idxs = numpy.where(
+            is_gate, second_tile_type_grid[map_slice], tile_type_grid[map_slice]
+        )
+        tile_names = sorted(
+            set("plain" if name in ["hill", "cliff"] else name for name in base_names)
+        )
+        tile_name_idxs = numpy.array(
+            [
+                tile_names.index("plain" if name in ["hill", "cliff"] else name)
+                for name in base_names
+            ]
+        )[tile_type_idxs]
+
+        def is_tile_name(names: List[str]) -> numpy.ndarray:
+            return numpy.isin(
+                tile_name_idxs,
+                [tile_names.index(name) for name in names if name in tile_names],
+            )
+
+        # Forested tiles
+        forest_counts = [calc_counts([t], 1) for t in GameMap.forested_tiles]
+        forest_level = numpy.full((map_w, map_h), -1)
+        for tile_type, counts in zip(GameMap.forested_tiles, forest_counts):
+            forest_level = numpy.where(
+                is_tile_name([tile_type]),
+                numpy.select([counts - 1 >= 7, counts - 1 >= 2], [0, 1], 2),
+                forest_level,
+            )
+
+        # Shore tiles
+        shore = numpy.full((map_w, map_h), -1)
+        for shore_idx, tile_type in enumerate(GameMap.shore_tiles):
+            shore_tile_name = tile_type.replace("_walkable", "")
+            if shore_tile_name in GameMap.shore_tile_name_to_tile_name_map:
+                shore = numpy.where(
+                    (shore == -1)
+                    & (calc_counts([tile_type], 0) > 0)
+                    & is_tile_name(
+                        [GameMap.shore_tile_name_to_tile_name_map[shore_tile_name]]
+                    ),
+                    shore_idx,
+                    shore,
+                )
+        shore = numpy.where(forest_level >= 0, -1, shore)
+
+        # Vegetation and elevation, which only matter for plains and deserts
+        is_vegetated = (forest_level == -1) & (shore == -1) & is_tile_name(["plain", "desert"])
+        stacked_forest_counts = numpy.stack(forest_counts)
+        vegetation = numpy.where(
+            is_vegetated & (stacked_forest_counts.max(axis=0) > 0),
+            stacked_forest_counts.argmax(axis=0),
+            -1,
+        )
+        distant_mountain_counts = calc_counts(["mountain"], 3)
+        elevation = numpy.where(
+            is_vegetated,
+            numpy.select(
+                [
+                    calc_counts(["volcano"], 3) > 0,
+                    calc_counts(["mountain"], 1) > 0,
+                    distant_mountain_counts > 5,
+                    calc_counts(["cliff", "cliff_walkable"], 1) > 1,
+                    calc_counts(["hill"], 1) > 1,
+                ],
+                [0, 1, 2, 3, 4],
+                -1,
+            ),
+            -1,
+        )
+
+        # Compose the name once for each distinct combination of features
+        features = numpy.stack(
+            [is_gate, tile_name_idxs, forest_level, shore, vegetation, elevation]
+        ).reshape(6, -1)
+        unique_features, feature_idxs = numpy.unique(
+            features, axis=1, return_inverse=True
+        )
+        names = numpy.empty(unique_features.shape[1], dtype=object)
+        for idx, (gate, tile_name_idx, level, shore_idx, veg, elev) in enumerate(
+            unique_features.T.tolist()
+        ):
+            names[idx] = GameMap.compose_encounter_background_name(
+                bool(gate),
+                tile_names[tile_name_idx],
+                level,
+                shore_idx,
+                veg,
+                elev,
+                backgrounds,
+            )
+        return names[feature_idxs.reshape(-1)].reshape(map_w, map_h)
 
     def get_encounter_background(
         self, tile: Optional[Point] = None
@@ -1197,54 +1990,10 @@ class GameMap(GameMapInterface):
         if encounter_background_name.startswith("gate:"):
             non_gate_background_name = encounter_background_name.replace("gate:", "")
             if "gate" in backgrounds and non_gate_background_name in backgrounds:
-                gate_background = backgrounds["gate"]
-                background_without_gate = backgrounds[non_gate_background_name]
-
-                # Combine the two backgrounds
-                # Scale the background_without_gate image to the dimension and size of the gate_background image
-                original_width = background_without_gate.image.get_width()
-                original_height = background_without_gate.image.get_height()
-                target_width = gate_background.image.get_width()
-                target_height = gate_background.image.get_height()
-                actual_height_to_width_ratio = original_width / original_height
-                target_height_to_width_ratio = target_width / target_height
-                if actual_height_to_width_ratio != target_height_to_width_ratio:
-                    if actual_height_to_width_ratio < target_height_to_width_ratio:
-                        subsurface_height = (
-                            original_width / target_height_to_width_ratio
-                        )
-                        subsurface_rect = pygame.Rect(
-                            0,
-                            (original_height - subsurface_height) // 2,
-                            original_width,
-                            subsurface_height,
-                        )
-                    else:
-                        subsurface_width = (
-                            original_height * target_height_to_width_ratio
-                        )
-                        subsurface_rect = pygame.Rect(
-                            (original_width - subsurface_width) // 2,
-                            0,
-                            subsurface_width,
-                            original_height,
-                        )
-                    background_image_without_gate = (
-                        background_without_gate.image.subsurface(subsurface_rect)
-                    )
-                else:
-                    background_image_without_gate = background_without_gate.image
-                combined_image = pygame.transform.smoothscale(
-                    background_image_without_gate, (target_width, target_height)
-                )
-                combined_image.blit(gate_background.image, (0, 0))
-                return EncounterBackground(
+                return GameMap.get_gate_encounter_background(
                     encounter_background_name,
-                    combined_image,
-                    gate_background.image_path,
-                    gate_background.artist,
-                    gate_background.artist_url,
-                    gate_background.image_url,
+                    backgrounds["gate"],
+                    backgrounds[non_gate_background_name],
                 )
 
         print(
@@ -1253,6 +2002,75 @@ class GameMap(GameMapInterface):
         )
         return None
 
+    @staticmethod
+    def get_gate_encounter_background(
+        encounter_background_name: str,
+        gate_background: EncounterBackground,
+        background_without_gate: EncounterBackground,
+    ) -> EncounterBackground:
+        """Composite the gate background over a terrain background, reusing recently composited backgrounds"""
+        gate_image = gate_background.image
+        target_width = gate_image.get_width()
+        target_height = gate_image.get_height()
+        key = (
+            gate_background.image_path,
+            background_without_gate.name,
+            (target_width, target_height),
+        )
+        if key in GameMap.gate_encounter_backgrounds:
+            GameMap.gate_encounter_backgrounds.move_to_end(key)
+            return GameMap.gate_encounter_backgrounds[key]
+
+        image_without_gate = background_without_gate.image
+
+        # Combine the two backgrounds
+        # Scale the background_without_gate image to the dimension and size of the gate_background image
+        original_width = image_without_gate.get_width()
+        original_height = image_without_gate.get_height()
+        actual_height_to_width_ratio = original_width / original_height
+        target_height_to_width_ratio = target_width / target_height
+        if actual_height_to_width_ratio != target_height_to_width_ratio:
+            if actual_height_to_width_ratio < target_height_to_width_ratio:
+                subsurface_height = original_width / target_height_to_width_ratio
+                subsurface_rect = pygame.Rect(
+                    0,
+                    (original_height - subsurface_height) // 2,
+                    original_width,
+                    subsurface_height,
+                )
+            else:
+                subsurface_width = original_height * target_height_to_width_ratio
+                subsurface_rect = pygame.Rect(
+                    (original_width - subsurface_width) // 2,
+                    0,
+                    subsurface_width,
+                    original_height,
+                )
+            background_image_without_gate = image_without_gate.subsurface(
+                subsurface_rect
+            )
+        else:
+            background_image_without_gate = image_without_gate
+        combined_image = pygame.transform.smoothscale(
+            background_image_without_gate, (target_width, target_height)
+        )
+        combined_image.blit(gate_image, (0, 0))
+        gate_encounter_background = EncounterBackground(
+            encounter_background_name,
+            gate_background.image_path,
+            gate_background.artist,
+            gate_background.artist_url,
+            gate_background.image_url,
+            combined_image,
+        )
+        GameMap.gate_encounter_backgrounds[key] = gate_encounter_background
+        while (
+            len(GameMap.gate_encounter_backgrounds)
+            > GameMap.max_gate_encounter_backgrounds
+        ):
+            GameMap.gate_encounter_backgrounds.popitem(last=False)
+        return gate_encounter_background
+
     def dump_encounter_backgrounds(self) -> None:
         encounter_background_counts = {}
         map_size_x, map_size_y = self.size().get_as_int_tuple()
@@ -18,7 +18,7 @@ from pydw.hero_state import HeroState
 
 
 class GameMapViewer:
-    def __init__(self, base_path: str) -> None:
+    def __init__(self, base_path: str, game_xml_path: Optional[str] = None) -> None:
         self.is_running = True
 
         # Initialize pygame
@@ -43,13 +43,28 @@ class GameMapViewer:
             )
         self.image_pad_tiles = self.win_size_tiles // 2 * 4
 
-        # Initialize GameInfo
-        game_xml_path = os.path.join(base_path, "game.xml")
+        # Initialize GameInfo.  Without a game xml file, use the licensed assets when present and otherwise fall back
+        # to the unlicensed assets as game.py does.
         from pydw.game_info import GameInfo
 
-        self.game_info = GameInfo(
-            base_path, game_xml_path, self.tile_size_pixels, self.win_size_pixels
-        )
+        if game_xml_path is None:
+            try:
+                self.game_info = GameInfo(
+                    base_path,
+                    os.path.join(base_path, "data", "game_licensed_assets.xml"),
+                    self.tile_size_pixels,
+                    self.win_size_pixels,
+                )
+            except FileNotFoundError as e:
+                print(
+                    f"Failed to load using licensed assets, falling back to data/game.xml: {e}",
+                    flush=True,
+                )
+                game_xml_path = os.path.join(base_path, "data", "game.xml")
+        if game_xml_path is not None:
+            self.game_info = GameInfo(
+                base_path, game_xml_path, self.tile_size_pixels, self.win_size_pixels
+            )
 
         # Initialize the hero party
         self.hero_party = HeroParty(
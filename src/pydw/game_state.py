@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy
 import os
 import pygame
 import random
@@ -33,14 +34,20 @@ from pydw.game_state_interface import GameStateInterface
 from pydw.hero_party import HeroParty
 from pydw.hero_state import HeroState
 from pydw.map_character_state import MapCharacterState
+from pydw.map_prefetcher import MapPrefetcher
 from pydw.monster_party import MonsterParty
 from pydw.monster_state import MonsterState
 from pydw.npc_state import NpcState
+from pydw.progress_marker_expression import ProgressMarkerExpression
+from pydw.progress_marker_set import ProgressMarkerSet
 
 
 class GameState(GameStateInterface):
     game_map: GameMap
 
+    # Tiles the player character may move before the maps to prefetch are ranked again
+    prefetch_rank_interval_tiles = 4
+
     def __init__(
         self,
         saves_path: str,
@@ -62,6 +69,15 @@ class GameState(GameStateInterface):
         )
         self.removed_decorations_by_map: Dict[str, List[MapDecoration]] = {}
 
+        # Loads the maps which may be transitioned to next in the background
+        self.map_prefetcher = MapPrefetcher(
+            GameMap.map_data_cache,
+            lambda key: self.game_info.maps[key[0]],
+            lambda key: GameMap.create_map_data_cache_entry(
+                self.game_info, self.game_info.maps[key[0]], Point(key[2])
+            ),
+        )
+
         self.pending_dialog: Optional[DialogType] = None
         self.load()
 
@@ -166,9 +182,116 @@ class GameState(GameStateInterface):
                 ):
                     npcs.append(NpcState(npc))
 
+        # If the new map is being loaded in the background, pick it up rather than loading it again
+        self.map_prefetcher.wait(GameMap.get_map_data_cache_key(self, new_map_name))
         self.game_map = GameMap(
             self, new_map_name, map_decorations, removed_map_decorations, npcs
         )
+        self.set_prefetch_candidates()
+        self.prefetch_neighbouring_maps()
+
+        # Decode the encounter background of maps with a fixed background ahead of the first encounter
+        encounter_background = self.game_info.maps[new_map_name].encounter_background
+        if encounter_background is not None:
+            encounter_background.prefetch_image()
+
+    def set_prefetch_candidates(self) -> None:
+        """Determine the maps which may be transitioned to from the current map for prefetch_neighbouring_maps"""
+        curr_map = self.game_info.maps[self.get_map_name()]
+
+        # Tiles of the point transitions to each map, as an array of (x, y) rows
+        transition_points_by_map: Dict[str, List[Tuple[int, int]]] = {}
+        for point_transition in curr_map.point_transitions:
+            if (
+                point_transition.dest_map != curr_map.name
+                and point_transition.dest_map in self.game_info.maps
+            ):
+                transition_points_by_map.setdefault(
+                    point_transition.dest_map, []
+                ).append(point_transition.point.get_as_int_tuple())
+        self.prefetch_transition_points_by_map = {
+            map_name: numpy.array(points)
+            for map_name, points in transition_points_by_map.items()
+        }
+
+        # Map reached by leaving the bounding box, else the edge of the map
+        self.prefetch_leaving_transition: Optional[Tuple[str, pygame.Rect]] = None
+        if (
+            curr_map.leaving_transition is not None
+            and curr_map.leaving_transition.dest_map != curr_map.name
+            and curr_map.leaving_transition.dest_map in self.game_info.maps
+        ):
+            if curr_map.leaving_transition.bounding_box:
+                bounds = curr_map.leaving_transition.bounding_box
+            else:
+                bounds = pygame.Rect(
+                    (1, 1), (self.game_map.size() - Point(2, 2)).get_as_int_tuple()
+                )
+            self.prefetch_leaving_transition = (
+                curr_map.leaving_transition.dest_map,
+                bounds,
+            )
+
+        # Tile at which the maps to prefetch were last ranked and the maps requested then
+        self.prefetch_ranked_tile: Optional[Point] = None
+        self.prefetch_ranked_map_names: List[str] = []
+
+    def prefetch_neighbouring_maps(self, max_maps: int = 3) -> None:
+        """
+        Load the maps reachable through the transitions nearest to the player character in the background.  This is
+        called after every step so the maps are only ranked again once the player character has moved
+        prefetch_rank_interval_tiles from where they were last ranked, and the prefetcher is only updated when the
+        ranking changes.
+
+        :param max_maps: The maximum number of maps to prefetch
+        """
+        hero_tile = self.hero_party.get_curr_pos_dat_tile()
+        if (
+            self.prefetch_ranked_tile is not None
+            and max(
+                abs(hero_tile.x - self.prefetch_ranked_tile.x),
+                abs(hero_tile.y - self.prefetch_ranked_tile.y),
+            )
+            < GameState.prefetch_rank_interval_tiles
+        ):
+            return
+        self.prefetch_ranked_tile = hero_tile
+
+        # Distance in tiles from the player character to the nearest transition to each map
+        hero_xy = hero_tile.get_as_int_tuple()
+        distance_by_map: Dict[str, int] = {
+            map_name: int(numpy.abs(points - hero_xy).max(axis=1).min())
+            for map_name, points in self.prefetch_transition_points_by_map.items()
+        }
+        if self.prefetch_leaving_transition is not None:
+            map_name, bounds = self.prefetch_leaving_transition
+            distance = (
+                int(
+                    max(
+                        0,
+                        min(
+                            hero_tile.x - bounds.left,
+                            bounds.right - 1 - hero_tile.x,
+                            hero_tile.y - bounds.top,
+                            bounds.bottom - 1 - hero_tile.y,
+                        ),
+                    )
+                )
+                + 1
+            )
+            distance_by_map[map_name] = min(
+                distance, distance_by_map.get(map_name, distance)
+            )
+
+        map_names = sorted(distance_by_map, key=lambda name: distance_by_map[name])[
+            :max_maps
+        ]
+        if map_names == self.prefetch_ranked_map_names:
+            return
+        self.prefetch_ranked_map_names = map_names
+        self.map_prefetcher.prefetch(
+            [GameMap.get_map_data_cache_key(self, map_name) for map_name in map_names]
+        )
 
     def load(self, pc_name_or_file_name: Optional[str] = None) -> None:
         # Set character state for new game
@@ -203,7 +326,9 @@ class GameState(GameStateInterface):
             pc.unequipped_items = self.game_info.pc_unequipped_items
             self.hero_party = HeroParty(pc)
             self.hero_party.gp = self.game_info.pc_gp
-            self.hero_party.progress_markers = self.game_info.pc_progress_markers
+            self.hero_party.progress_markers = ProgressMarkerSet(
+                self.game_info.pc_progress_markers
+            )
 
             self.set_map(
                 self.game_info.initial_map,
@@ -356,7 +481,7 @@ class GameState(GameStateInterface):
             for progress_marker_element in xml_root.findall(
                 "./ProgressMarkers/ProgressMarker"
             ):
-                self.hero_party.progress_markers.append(
+                self.hero_party.progress_markers.add(
                     progress_marker_element.attrib["name"]
                 )
                 # print('Loaded progress marker ' + progressMarkerElement.attrib['name'], flush=True)
@@ -577,8 +702,8 @@ class GameState(GameStateInterface):
             tile = self.hero_party.get_curr_pos_dat_tile()
         for point_transition in self.game_info.maps[
             self.get_map_name()
-        ].point_transitions:
-            if point_transition.point == tile and self.check_progress_markers(
+        ].point_transitions_by_tile.get(tile, []):
+            if self.check_progress_markers(
                 point_transition.progress_marker,
                 point_transition.inverse_progress_marker,
             ):
@@ -616,8 +741,8 @@ class GameState(GameStateInterface):
             tile = self.hero_party.get_curr_pos_dat_tile()
         for special_monster in self.game_info.maps[
             self.get_map_name()
-        ].special_monsters:
-            if special_monster.point == tile and self.check_progress_markers(
+        ].special_monsters_by_tile.get(tile, []):
+            if self.check_progress_markers(
                 special_monster.progress_marker, special_monster.inverse_progress_marker
             ):
                 # print('Found monster at point: ', tile, flush=True)
@@ -643,22 +768,9 @@ class GameState(GameStateInterface):
         return progress_marker_eval and not inverse_progress_marker_eval
 
     def evaluate_progress_marker_string(self, progress_marker_string: str) -> bool:
-        progress_marker_term_string = progress_marker_string
-        logical_tokens = ["(", ")", " and ", " or ", " not ", "&", "|", "!"]
-        for strip_term in logical_tokens:
-            progress_marker_term_string = progress_marker_term_string.replace(
-                strip_term, " "
-            )
-        stripped_logical_tokens = [x.strip() for x in logical_tokens]
-        for term in filter(None, progress_marker_term_string.split(" ")):
-            if term in stripped_logical_tokens:
-                continue
-            progress_marker_string = progress_marker_string.replace(
-                term, str(term in self.hero_party.progress_markers)
-            )
-        if eval(progress_marker_string):
-            return True
-        return False
+        return ProgressMarkerExpression.evaluate(
+            progress_marker_string, self.hero_party.progress_markers
+        )
 
     def can_move_to_tile(
         self,
@@ -675,10 +787,10 @@ class GameState(GameStateInterface):
     def get_tile_monsters(self, tile: Optional[Point] = None) -> List[str]:
         if tile is None:
             tile = self.hero_party.get_curr_pos_dat_tile()
-        for mz in self.game_info.maps[self.get_map_name()].monster_zones:
-            if mz.x <= tile.x <= mz.x + mz.w and mz.y <= tile.y <= mz.y + mz.h:
-                # print('in monsterZone of set ' + mz.setName + ':', self.gameInfo.monsterSets[mz.setName], flush=True)
-                return self.game_info.monster_sets[mz.name]
+        mz = self.game_info.maps[self.get_map_name()].monster_zone_grid.get_zone(tile)
+        if mz is not None:
+            # print('in monsterZone of set ' + mz.setName + ':', self.gameInfo.monsterSets[mz.setName], flush=True)
+            return self.game_info.monster_sets[mz.name]
         return self.game_map.get_tile_monsters(tile)
 
     def is_light_restricted(self) -> bool:
@@ -697,6 +809,7 @@ class GameState(GameStateInterface):
     def make_map_transition(self, transition: Optional[OutgoingTransition]) -> bool:
         if transition is None:
             return False
+        transition_start_ticks = pygame.time.get_ticks()
 
         src_map = self.game_info.maps[self.get_map_name()]
         dest_map = self.game_info.maps[transition.dest_map]
@@ -738,8 +851,10 @@ class GameState(GameStateInterface):
         )
         self.draw_map(True)
 
-        # Slight pause on a map transition
-        pygame.time.wait(250)
+        # Slight pause on a map transition, less the time taken to load and draw the new map
+        pygame.time.wait(
+            max(0, 250 - (pygame.time.get_ticks() - transition_start_ticks))
+        )
 
         return True
 
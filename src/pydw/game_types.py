@@ -6,11 +6,14 @@ from typing import Any, Dict, List, Literal, NamedTuple, Optional, Tuple, Union
 
 from dataclasses import dataclass
 from enum import Enum
+import numpy
 import pygame
 import random
 
 from generic_utils.point import Point
 
+from pydw.encounter_background_cache import get_encounter_background_cache
+
 
 class GameTypes:
     @staticmethod
@@ -484,6 +487,65 @@ class SpecialMonster(NamedTuple):
     inverse_progress_marker: Optional[str] = None
 
 
+class MonsterZoneGrid(NamedTuple):
+    """Monster zones rasterized to a grid so that the monster zone of a tile is an array lookup"""
+
+    zones: List[MonsterZone]
+
+    # Index into zones of the first zone containing each tile of the map, indexed by [x, y], or -1 where there is no
+    # zone
+    grid: numpy.ndarray
+
+    # Zones which extend beyond the map, such as map wide zones
+    unbounded_zones: List[MonsterZone]
+
+    @staticmethod
+    def create(zones: List[MonsterZone], map_size: Point) -> MonsterZoneGrid:
+        # Zones include the tiles at x + w and y + h
+        map_w, map_h = map_size.get_as_int_tuple()
+
+        def is_bounded(zone: MonsterZone) -> bool:
+            return (
+                0 <= zone.x
+                and 0 <= zone.y
+                and zone.x + zone.w < map_w
+                and zone.y + zone.h < map_h
+            )
+
+        dtype = (
+            numpy.int16 if len(zones) <= numpy.iinfo(numpy.int16).max else numpy.int32
+        )
+        grid = numpy.full((map_w, map_h), -1, dtype=dtype)
+
+        # Rasterize the part of each zone on the map in reverse order so that where zones overlap the first zone takes
+        # precedence
+        for zone_idx in reversed(range(len(zones))):
+            zone = zones[zone_idx]
+            grid[
+                max(0, zone.x) : max(0, min(map_w, zone.x + zone.w + 1)),
+                max(0, zone.y) : max(0, min(map_h, zone.y + zone.h + 1)),
+            ] = zone_idx
+
+        return MonsterZoneGrid(
+            zones, grid, [zone for zone in zones if not is_bounded(zone)]
+        )
+
+    def get_zone(self, tile: Point) -> Optional[MonsterZone]:
+        tile_x, tile_y = tile.get_as_int_tuple()
+        if 0 <= tile_x < self.grid.shape[0] and 0 <= tile_y < self.grid.shape[1]:
+            zone_idx = self.grid[tile_x, tile_y]
+            return self.zones[zone_idx] if zone_idx != -1 else None
+
+        # Only zones which extend beyond the map may contain tiles outside of the map
+        for zone in self.unbounded_zones:
+            if (
+                zone.x <= tile.x <= zone.x + zone.w
+                and zone.y <= tile.y <= zone.y + zone.h
+            ):
+                return zone
+        return None
+
+
 class Map(NamedTuple):
     name: str
     tiled_filename: Optional[str]
@@ -503,29 +565,87 @@ class Map(NamedTuple):
     encounter_background: Optional[EncounterBackground]
     special_monsters: List[SpecialMonster]
     is_outside: bool
-    origin: Optional[Point] = None
+    origin: Optional[Point]
+
+    # Lookup structures for the per step checks, which are derived from the fields above by create
+    point_transitions_by_tile: Dict[Point, List[OutgoingTransition]]
+    special_monsters_by_tile: Dict[Point, List[SpecialMonster]]
+    monster_zone_grid: MonsterZoneGrid
 
     @staticmethod
-    def create(name: str, dat: List[str]) -> Map:
+    def create(
+        name: str,
+        dat: List[str],
+        tiled_filename: Optional[str] = None,
+        overlay_dat: Optional[List[str]] = None,
+        music: str = "",
+        light_diameter: Optional[int] = None,
+        leaving_transition: Optional[OutgoingTransition] = None,
+        point_transitions: Optional[List[OutgoingTransition]] = None,
+        incoming_transitions: Optional[List[IncomingTransition]] = None,
+        transitions_by_map: Optional[Dict[str, AnyTransition]] = None,
+        transitions_by_map_and_name: Optional[
+            Dict[str, Dict[str, AnyTransition]]
+        ] = None,
+        transitions_by_name: Optional[Dict[str, AnyTransition]] = None,
+        map_decorations: Optional[List[MapDecoration]] = None,
+        npcs: Optional[List[NpcInfo]] = None,
+        monster_zones: Optional[List[MonsterZone]] = None,
+        encounter_background: Optional[EncounterBackground] = None,
+        special_monsters: Optional[List[SpecialMonster]] = None,
+        is_outside: bool = False,
+        origin: Optional[Point] = None,
+        map_size: Optional[Point] = None,
+    ) -> Map:
+        """
+        :param map_size: Size of the map in tiles, which defaults to the size of dat.  Required for Tiled maps for the
+                         monster zones to be rasterized.
+        """
+        if point_transitions is None:
+            point_transitions = []
+        if special_monsters is None:
+            special_monsters = []
+        if monster_zones is None:
+            monster_zones = []
+        if map_size is None:
+            map_size = Point(len(dat[0]), len(dat)) if 0 < len(dat) else Point(0, 0)
+
+        # Index the point transitions and special monsters by tile and rasterize the monster zones so that the checks
+        # made on every step are constant time
+        point_transitions_by_tile: Dict[Point, List[OutgoingTransition]] = {}
+        for point_transition in point_transitions:
+            point_transitions_by_tile.setdefault(point_transition.point, []).append(
+                point_transition
+            )
+        special_monsters_by_tile: Dict[Point, List[SpecialMonster]] = {}
+        for special_monster in special_monsters:
+            special_monsters_by_tile.setdefault(special_monster.point, []).append(
+                special_monster
+            )
+
         return Map(
             name,
-            None,
+            tiled_filename,
             dat,
-            None,
-            "",
-            None,
-            None,
-            [],
-            [],
-            {},
-            {},
-            {},
-            [],
-            [],
-            [],
-            None,
-            [],
-            False,
+            overlay_dat,
+            music,
+            light_diameter,
+            leaving_transition,
+            point_transitions,
+            [] if incoming_transitions is None else incoming_transitions,
+            {} if transitions_by_map is None else transitions_by_map,
+            {} if transitions_by_map_and_name is None else transitions_by_map_and_name,
+            {} if transitions_by_name is None else transitions_by_name,
+            [] if map_decorations is None else map_decorations,
+            [] if npcs is None else npcs,
+            monster_zones,
+            encounter_background,
+            special_monsters,
+            is_outside,
+            origin,
+            point_transitions_by_tile,
+            special_monsters_by_tile,
+            MonsterZoneGrid.create(monster_zones, map_size),
         )
 
 
@@ -779,12 +899,25 @@ class MapImageInfo(NamedTuple):
 
 class EncounterBackground(NamedTuple):
     name: str
-    image: pygame.surface.Surface
     image_path: str
     artist: str = "Uncredited"
     artist_url: Optional[str] = None
     image_url: Optional[str] = None
 
+    # Image for backgrounds which are not loaded from image_path, such as composite gate backgrounds
+    composite_image: Optional[pygame.surface.Surface] = None
+
+    @property
+    def image(self) -> pygame.surface.Surface:
+        # Images loaded from image_path are loaded on first use
+        if self.composite_image is not None:
+            return self.composite_image
+        return get_encounter_background_cache().get(self.image_path)
+
+    def prefetch_image(self) -> None:
+        if self.composite_image is None:
+            get_encounter_background_cache().prefetch([self.image_path])
+
     def __str__(self) -> str:
         return self.name
 
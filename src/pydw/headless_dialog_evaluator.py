@@ -0,0 +1,508 @@
+#!/usr/bin/env python
+
+# Imports to support type annotations
+from __future__ import annotations
+from typing import cast, Any, Callable, Container, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import pygame
+
+from generic_utils.point import Point
+
+from pydw.dialog_compiler import CompiledDialog, DialogInstruction
+from pydw.game_dialog import GameDialog, GameDialogSpacing
+from pydw.game_dialog_evaluator import DialogTraversal, GameDialogEvaluator
+from pydw.game_info import GameInfo
+from pydw.game_state_interface import GameStateInterface
+from pydw.game_types import (
+    DialogReplacementVariables,
+    DialogType,
+    MapDecoration,
+    MonsterInfo,
+    Tile,
+)
+from pydw.hero_party import HeroParty
+from pydw.hero_state import HeroState
+from pydw.map_character_state import MapCharacterState
+from pydw.progress_marker_expression import ProgressMarkerExpression
+from pydw.progress_marker_set import ProgressMarkerSet
+
+
+class HeadlessDialogStop(Exception):
+    """Raised to end a headless dialog run before the dialog has finished"""
+
+
+class HeadlessMessageDialog:
+    """
+    Stand-in for the message GameDialog which records the messages added to it rather than rendering them.  Only the
+    parts of the GameDialog interface used by GameDialogEvaluator are provided.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.menu_options: List[str] = []
+        self.acknowledged = True
+
+    def add_message(
+        self, new_message: str, append: bool = True, fully_populate: bool = False
+    ) -> None:
+        self.acknowledged = False
+        self.menu_options = []
+        self.lines.append(GameDialog.fix_capitalization(new_message))
+
+    def add_menu_prompt(
+        self,
+        options: Union[List[str], List[List[str]]],
+        num_cols: int,
+        spacing_type: GameDialogSpacing = GameDialogSpacing.EQUAL_COLUMNS,
+        prompt: Optional[str] = None,
+    ) -> None:
+        # Only the first column of options with multiple columns, such as vendor prices, is selectable
+        self.menu_options = [
+            option if isinstance(option, str) else option[0] for option in options
+        ]
+
+    def is_last_row_blank(self) -> bool:
+        return 0 == len(self.lines) or self.lines[-1] == ""
+
+    def is_empty(self) -> bool:
+        return 0 == len(self.lines)
+
+    def clear(self) -> None:
+        self.lines = []
+        self.menu_options = []
+
+    def acknowledge(self) -> None:
+        self.acknowledged = True
+
+    def is_acknowledged(self) -> bool:
+        return self.acknowledged
+
+    def blit(
+        self,
+        surface: pygame.surface.Surface,
+        flip_buffer: bool = False,
+        offset_pixels: Point = Point(0, 0),
+    ) -> None:
+        pass
+
+    def set_font_color(self, font_color: pygame.Color) -> None:
+        pass
+
+
+class HeadlessGameState(GameStateInterface):
+    """
+    Game state for running dialog without a game map or a display.  Changes which would need a map, such as map
+    transitions and combat encounters, are recorded as events rather than performed.
+    """
+
+    def __init__(
+        self, game_info: GameInfo, hero_party: HeroParty, map_name: str
+    ) -> None:
+        super().__init__(pygame.surface.Surface((1, 1)))
+        self.game_info = game_info
+        self.hero_party = hero_party
+        self.map_name = map_name
+        self.in_combat = False
+        self.facing_locked_item = False
+        self.events: List[str] = []
+
+    @staticmethod
+    def create_initial_hero_party(game_info: GameInfo) -> HeroParty:
+        """
+        Create the hero party of a new game, as GameState does when there is no saved game.  The initial game state
+        must already have been parsed with GameInfo.parse_initial_game_state, so that creating a party per run is cheap.
+        """
+        pc = HeroState(
+            game_info.character_types["hero"],
+            game_info.initial_hero_pos_dat_tile,
+            game_info.initial_hero_pos_dir,
+            game_info.pc_name,
+            game_info.pc_xp,
+        )
+        if game_info.pc_hp is not None and game_info.pc_hp < pc.hp:
+            pc.hp = game_info.pc_hp
+        if game_info.pc_mp is not None and game_info.pc_mp < pc.mp:
+            pc.mp = game_info.pc_mp
+        pc.weapon = game_info.pc_weapon
+        pc.armor = game_info.pc_armor
+        pc.shield = game_info.pc_shield
+        # Copy the items so that runs do not share the initial game state
+        pc.other_equipped_items = list(game_info.pc_other_equipped_items)
+        pc.unequipped_items = dict(game_info.pc_unequipped_items)
+        hero_party = HeroParty(pc)
+        hero_party.gp = game_info.pc_gp
+        hero_party.progress_markers = ProgressMarkerSet(game_info.pc_progress_markers)
+        return hero_party
+
+    def get_game_info(self) -> GameInfo:
+        return self.game_info
+
+    def get_tile_info(self, tile: Optional[Point]) -> Tile:
+        raise HeadlessDialogStop("Tiles are not available without a game map")
+
+    def get_image_pad_tiles(self) -> Point:
+        return Point(0, 0)
+
+    def get_hero_party(self) -> HeroParty:
+        return self.hero_party
+
+    def check_progress_markers(
+        self, progress_marker: Optional[str], inverse_progress_marker: Optional[str]
+    ) -> bool:
+        return (
+            progress_marker is None
+            or ProgressMarkerExpression.evaluate(
+                progress_marker, self.hero_party.progress_markers
+            )
+        ) and not (
+            inverse_progress_marker is not None
+            and ProgressMarkerExpression.evaluate(
+                inverse_progress_marker, self.hero_party.progress_markers
+            )
+        )
+
+    def get_dialog_replacement_variables(self) -> DialogReplacementVariables:
+        variables = DialogReplacementVariables()
+        variables.generic["[NAME]"] = self.hero_party.main_character.get_name()
+        variables.generic["[NEXT_LEVEL_XP]"] = str(
+            self.hero_party.main_character.calc_xp_to_next_level()
+        )
+        return variables
+
+    def is_outside(self) -> bool:
+        map = self.game_info.maps.get(self.map_name)
+        return map is not None and map.is_outside
+
+    def is_inside(self) -> bool:
+        return not self.is_outside()
+
+    def is_in_combat(self) -> bool:
+        return self.in_combat
+
+    def is_combat_allowed(self) -> bool:
+        return False
+
+    def is_light_restricted(self) -> bool:
+        return False
+
+    def get_map_name(self) -> str:
+        return self.map_name
+
+    def set_map(
+        self,
+        new_map_name: str,
+        one_time_decorations: Optional[List[MapDecoration]] = None,
+        respawn_decorations: bool = False,
+    ) -> None:
+        self.events.append(f"set_map: {new_map_name}")
+        self.map_name = new_map_name
+
+    def is_facing_locked_item(self) -> bool:
+        return self.facing_locked_item
+
+    def is_facing_openable_item(self) -> bool:
+        return self.facing_locked_item
+
+    def open_locked_item(self) -> Optional[MapDecoration]:
+        self.events.append("open_locked_item")
+        self.facing_locked_item = False
+        return None
+
+    def remove_decoration(self, decoration: MapDecoration) -> None:
+        pass
+
+    def get_npc_by_name(self, name: str) -> Optional[MapCharacterState]:
+        return None
+
+    def draw_map(
+        self,
+        flip_buffer: bool = True,
+        draw_background: bool = True,
+        draw_combat: bool = True,
+        draw_status: bool = True,
+        draw_only_character_sprites: bool = False,
+    ) -> None:
+        pass
+
+    def save(self) -> None:
+        self.events.append("save")
+
+    def get_win_size_pixels(self) -> Point:
+        return Point(self.screen.get_size())
+
+    def initiate_encounter(
+        self,
+        monster_info: Optional[MonsterInfo] = None,
+        approach_dialog: Optional[DialogType] = None,
+        victory_dialog: Optional[DialogType] = None,
+        run_away_dialog: Optional[DialogType] = None,
+        encounter_music: Optional[str] = None,
+        message_dialog: Optional[GameDialog] = None,
+    ) -> None:
+        monster_name = monster_info.name if monster_info is not None else None
+        self.events.append(f"encounter: {monster_name}")
+
+    def handle_death(self, message_dialog: Optional[GameDialog] = None) -> None:
+        self.events.append("death")
+        self.is_running = False
+
+    def handle_quit(self, force: bool = False) -> None:
+        self.events.append("quit")
+        self.is_running = False
+
+    def should_add_math_problems_in_combat(self) -> bool:
+        return False
+
+
+class HeroPartySnapshot(NamedTuple):
+    gp: int
+    # The name, level name, hp, mp and xp of each party member
+    members: Tuple[Tuple[str, str, int, int, int], ...]
+    items: Dict[str, int]
+    progress_markers: ProgressMarkerSet
+
+    @staticmethod
+    def create(hero_party: HeroParty) -> HeroPartySnapshot:
+        items: Dict[str, int] = {}
+        for member in hero_party.members:
+            equipped_items = [member.weapon, member.helm, member.armor, member.shield]
+            for equipped_item in equipped_items + list(member.other_equipped_items):
+                if equipped_item is not None:
+                    items[equipped_item.name] = items.get(equipped_item.name, 0) + 1
+            for item, count in member.unequipped_items.items():
+                items[item.name] = items.get(item.name, 0) + count
+        return HeroPartySnapshot(
+            hero_party.gp,
+            tuple(
+                (
+                    member.get_name(),
+                    member.level.name,
+                    member.hp,
+                    member.mp,
+                    member.xp,
+                )
+                for member in hero_party.members
+            ),
+            items,
+            hero_party.progress_markers.copy(),
+        )
+
+    def diff(self, other: HeroPartySnapshot) -> List[str]:
+        """
+        :return: Descriptions of the changes from this snapshot to the other snapshot
+        """
+        changes = []
+        if self.gp != other.gp:
+            changes.append(f"gp: {self.gp} -> {other.gp}")
+        for item_name in sorted(set(self.items) | set(other.items)):
+            count = self.items.get(item_name, 0)
+            other_count = other.items.get(item_name, 0)
+            if count != other_count:
+                changes.append(f"item {item_name}: {count} -> {other_count}")
+        gained_progress_markers, lost_progress_markers = other.progress_markers.diff(
+            self.progress_markers
+        )
+        for progress_marker in sorted(gained_progress_markers):
+            changes.append(f"gained progress marker {progress_marker}")
+        for progress_marker in sorted(lost_progress_markers):
+            changes.append(f"lost progress marker {progress_marker}")
+        if self.members != other.members:
+            changes.append(f"party: {list(self.members)} -> {list(other.members)}")
+        return changes
+
+
+class HeadlessDialogResult(NamedTuple):
+    messages: List[str]
+    # Menu selections, sounds, visual effects, map changes and other side effects, in the order they occurred
+    events: List[str]
+    state_changes: List[str]
+    # Why the dialog stopped before it finished, if it did
+    stop_reason: Optional[str] = None
+
+
+class HeadlessDialogEvaluator(GameDialogEvaluator):
+    """
+    Evaluates dialog without a display and without waiting.  Menu selections and typed text are taken from scripted
+    answers and every message, side effect and change to the hero party is recorded.
+
+    When the scripted menu answers run out, choose_menu_option picks the answer, which by default is the first
+    option.  A scripted answer of None cancels the menu.  A run is stopped once it has made max_menu_selections menu
+    selections or executed max_instructions instructions so that dialog which loops on its menus always finishes.
+    """
+
+    def __init__(
+        self,
+        game_info: GameInfo,
+        game_state: HeadlessGameState,
+        menu_answers: Iterable[Optional[str]] = (),
+        text_answers: Iterable[str] = (),
+        choose_menu_option: Optional[Callable[[List[str]], Optional[str]]] = None,
+        max_menu_selections: int = 32,
+        max_instructions: int = 10000,
+    ) -> None:
+        self.headless_game_state = game_state
+        self.menu_answers = list(menu_answers)
+        self.text_answers = list(text_answers)
+        self.choose_menu_option = choose_menu_option
+        self.max_menu_selections = max_menu_selections
+        self.max_instructions = max_instructions
+        self.num_menu_selections = 0
+        self.num_instructions = 0
+        self.messages: List[str] = []
+        super().__init__(game_info, game_state)
+
+    @property
+    def events(self) -> List[str]:
+        return self.headless_game_state.events
+
+    def run(self, dialog: Union[DialogType, str]) -> HeadlessDialogResult:
+        """Evaluate the dialog to completion, returning what it displayed and changed"""
+        self.messages = []
+        self.events.clear()
+        self.num_menu_selections = 0
+        self.num_instructions = 0
+        self.game_state.is_running = True
+        self.refresh_game_state()
+        before = HeroPartySnapshot.create(self.hero_party)
+        stop_reason = None
+        try:
+            self.dialog_loop(dialog)
+        except HeadlessDialogStop as exc:
+            stop_reason = str(exc)
+        if stop_reason is None and not self.game_state.is_running:
+            stop_reason = "The game was quit"
+        return HeadlessDialogResult(
+            self.messages,
+            list(self.events),
+            before.diff(HeroPartySnapshot.create(self.hero_party)),
+            stop_reason,
+        )
+
+    def dialog_loop(
+        self, dialog: Union[DialogType, str], npc: Optional[MapCharacterState] = None
+    ) -> None:
+        self.traverse_dialog(
+            cast(GameDialog, HeadlessMessageDialog()), dialog, npc=npc
+        )
+
+    def execute_dialog(
+        self, traversal: DialogTraversal, compiled_dialog: CompiledDialog
+    ) -> None:
+        self.num_instructions += len(compiled_dialog.instructions)
+        if self.num_instructions > self.max_instructions:
+            raise HeadlessDialogStop(
+                f"Exceeded {self.max_instructions} dialog instructions"
+            )
+        super().execute_dialog(traversal, compiled_dialog)
+
+    def add_and_wait_for_message(
+        self, message: str, message_dialog: GameDialog
+    ) -> None:
+        message_dialog.add_message(message)
+        if message != "":
+            self.messages.append(GameDialog.fix_capitalization(message))
+
+    def wait_for_message_to_fully_display(self, message_dialog: GameDialog) -> None:
+        pass
+
+    def wait_for_acknowledgement(
+        self, message_dialog: Optional[GameDialog] = None
+    ) -> None:
+        if message_dialog is not None:
+            message_dialog.acknowledge()
+        self.wait_before_new_text = False
+
+    def wait_for_user_input(
+        self,
+        message_dialog: GameDialog,
+        prompt: str,
+        allowed_input: Optional[str] = None,
+    ) -> Tuple[str, float]:
+        if 0 == len(self.text_answers):
+            raise HeadlessDialogStop(f"No scripted answer for the prompt: {prompt}")
+        text_answer = self.text_answers.pop(0)
+        self.events.append(f"input: {prompt} -> {text_answer}")
+        # Answer immediately
+        return text_answer, 0.0
+
+    def get_menu_result(
+        self, menu_dialog: GameDialog, allow_quit: bool = True
+    ) -> Optional[str]:
+        if self.num_menu_selections >= self.max_menu_selections:
+            raise HeadlessDialogStop(
+                f"Exceeded {self.max_menu_selections} menu selections"
+            )
+        self.num_menu_selections += 1
+
+        options = cast(HeadlessMessageDialog, menu_dialog).menu_options
+        if 0 < len(self.menu_answers):
+            menu_result = self.menu_answers.pop(0)
+        elif self.choose_menu_option is not None:
+            menu_result = self.choose_menu_option(options)
+        elif 0 < len(options):
+            menu_result = options[0]
+        else:
+            menu_result = None
+        self.events.append(f"menu: {options} -> {menu_result}")
+        return menu_result
+
+    def execute_vendor_buy_options(
+        self, traversal: DialogTraversal, instruction: DialogInstruction
+    ) -> bool:
+        self.check_vendor_options_variable(
+            instruction.item.name_and_gp_row_data,
+            self.replacement_variables.vendor_buy_options,
+        )
+        return super().execute_vendor_buy_options(traversal, instruction)
+
+    def execute_vendor_sell_options(
+        self, traversal: DialogTraversal, instruction: DialogInstruction
+    ) -> bool:
+        self.check_vendor_options_variable(
+            instruction.item.item_types, self.replacement_variables.vendor_sell_options
+        )
+        return super().execute_vendor_sell_options(traversal, instruction)
+
+    @staticmethod
+    def check_vendor_options_variable(
+        vendor_options: Union[List[Any], str], variables: Container[str]
+    ) -> None:
+        """
+        Stop when vendor options name a variable which has not been set.  The variables are set by the dialog of the
+        vendor before it goes to the shared buy and sell dialog, so the shared dialog run on its own would otherwise
+        only ever show the fallback for a vendor without options.
+        """
+        if isinstance(vendor_options, str) and vendor_options not in variables:
+            raise HeadlessDialogStop(
+                f"Vendor options variable {vendor_options} is not set by the vendor dialog"
+            )
+
+    def update_status_dialog(
+        self, flip_buffer: bool = False, message_dialog: Optional[GameDialog] = None
+    ) -> None:
+        pass
+
+    def action_play_sound(
+        self, traversal: DialogTraversal, instruction: DialogInstruction
+    ) -> None:
+        self.events.append(f"sound: {instruction.item.name}")
+
+    def action_play_music(
+        self, traversal: DialogTraversal, instruction: DialogInstruction
+    ) -> None:
+        self.events.append(f"music: {instruction.item.name}")
+
+    def action_visual_effect(
+        self, traversal: DialogTraversal, instruction: DialogInstruction
+    ) -> None:
+        self.events.append(f"visual effect: {instruction.item.name}")
+        if instruction.item.name == "hideDialog":
+            traversal.message_dialog.clear()
+        elif instruction.item.name == "evilDeathLoop":
+            # The game can only be quit from this effect
+            raise HeadlessDialogStop("Reached the evilDeathLoop visual effect")
+
+    def action_wait(
+        self, traversal: DialogTraversal, instruction: DialogInstruction
+    ) -> None:
+        self.events.append(f"wait: {instruction.item.count}")
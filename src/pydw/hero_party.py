@@ -11,6 +11,7 @@ from pydw.game_types import DialogType, Direction, ItemType
 from pydw.hero_state import HeroState
 from pydw.map_character_state import MapCharacterState
 from pydw.monster_party import MonsterParty
+from pydw.progress_marker_set import ProgressMarkerSet
 
 
 class HeroParty(CombatParty):
@@ -19,7 +20,7 @@ class HeroParty(CombatParty):
         self.main_character = main_character
         self.members = [main_character]  # in party order
         self.gp = 0
-        self.progress_markers: List[str] = []
+        self.progress_markers = ProgressMarkerSet()
 
         self.light_diameter: Optional[float] = (
             None  # None indicates the light diameter is unlimited
@@ -183,7 +184,7 @@ class HeroParty(CombatParty):
 
     def gain_progress_marker(self, progress_marker: str) -> None:
         if progress_marker not in self.progress_markers:
-            self.progress_markers.append(progress_marker)
+            self.progress_markers.add(progress_marker)
             # print('Gained progress marker', progress_marker, flush=True)
         else:
             print(
@@ -194,7 +195,7 @@ class HeroParty(CombatParty):
 
     def lose_progress_marker(self, progress_marker: str) -> None:
         if progress_marker in self.progress_markers:
-            self.progress_markers.remove(progress_marker)
+            self.progress_markers.discard(progress_marker)
             # print('Lost progress marker', progress_marker, flush=True)
         else:
             print("WARN: Unable to remove progress marker", progress_marker, flush=True)
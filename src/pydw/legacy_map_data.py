@@ -43,9 +43,11 @@ class LegacyMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
             self.game_info.maps[map_name].dat
         )
         self.overlay_images = None
+        self.overlay_redraw_rect: Optional[pygame.Rect] = None
         overlay_dat = self.game_info.maps[map_name].overlay_dat
         if overlay_dat is not None:
             self.overlay_images = self.get_map_images_from_game_info(overlay_dat)
+            self.overlay_redraw_rect = self.calc_overlay_redraw_rect()
         self.layers_to_render = self.all_tile_layers
 
     def get_map_images_from_game_info(
@@ -110,6 +112,40 @@ class LegacyMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
 
         return map_images
 
+    def calc_overlay_redraw_rect(self) -> pygame.Rect:
+        """
+        :return: Bounding rect, in padded tile coordinates, of the tiles with overlay images
+        """
+        overlay_rect = pygame.Rect(0, 0, 0, 0)
+        if self.overlay_images is None:
+            return overlay_rect
+        for y, overlay_images_row in enumerate(self.overlay_images):
+            for x, overlay_image in enumerate(overlay_images_row):
+                if overlay_image is None:
+                    continue
+                if 0 == overlay_rect.w:
+                    overlay_rect = pygame.Rect(x, y, 1, 1)
+                else:
+                    overlay_rect.union_ip(pygame.Rect(x, y, 1, 1))
+        return overlay_rect
+
+    def get_overlay_redraw_rect(self) -> Optional[pygame.Rect]:
+        """
+        :return: Rect, in padded tile coordinates, of the tiles which need to be redrawn after set_pc_character_tile
+                 reports that a redraw is needed, or None if the whole map needs to be redrawn
+        """
+        return self.overlay_redraw_rect
+
+    def is_rendering_bounded(self) -> bool:
+        """
+        :return: If tiles outside of the overlay redraw rect are currently masked to black
+        """
+        return False
+
+    def reset_render_state(self) -> None:
+        """Restore the rendering state of newly loaded map data so that the map data can be reused"""
+        self.layers_to_render = self.all_tile_layers
+
     def set_pc_character_tile(self, pos_dat_tile: Point) -> bool:
         """
         :param pos_dat_tile: Tile position of player character
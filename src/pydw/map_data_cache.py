@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+
+import numpy
+import pygame
+import pyscroll
+
+from pydw.game_types import Map, Tile
+from pydw.legacy_map_data import LegacyMapData
+from pydw.padded_tiled_map_data import PaddedTiledMapData
+
+# Map name, tile size in pixels, image pad tiles and screen size in pixels
+MapDataCacheKey = Tuple[str, int, Tuple[int, int], Tuple[int, int]]
+
+
+@dataclass
+class MapDataCacheEntry:
+    map: Map
+    map_data: Union[PaddedTiledMapData, LegacyMapData]
+
+    # Renderer, which is created on the main thread when the map is first used (see GameMap.create_map_layer)
+    map_layer: Optional[pyscroll.BufferedRenderer]
+
+    # Tile information for each of the tile type names of a Tiled map
+    tiled_tile_types: List[Tile]
+
+    # Per tile grids which depend only on the map data, indexed by [x, y] and covering the map without padding
+    tile_grids: Dict[str, numpy.ndarray]
+
+    size_bytes: int = 0
+
+
+class MapDataCache:
+    """
+    Least recently used cache of loaded map data and the renderers built on them.
+
+    Entries are evicted once the estimated size of the cached entries exceeds max_bytes, though the most recently used
+    entry is always retained.  The cache may be filled from a background thread (see MapPrefetcher).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[MapDataCacheKey, MapDataCacheEntry]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def contains(self, key: MapDataCacheKey, map: Map) -> bool:
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and entry.map is map
+
+    def get(self, key: MapDataCacheKey, map: Map) -> Optional[MapDataCacheEntry]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.map is not map:
+                # Entries built from a different Map (e.g. from a reloaded GameInfo) are stale
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: MapDataCacheKey, entry: MapDataCacheEntry) -> None:
+        entry.size_bytes = MapDataCache.estimate_size_bytes(entry)
+        with self.lock:
+            if key in self.entries:
+                self.size_bytes -= self.entries.pop(key).size_bytes
+            self.entries[key] = entry
+            self.size_bytes += entry.size_bytes
+            while self.size_bytes > self.max_bytes and 1 < len(self.entries):
+                _, evicted_entry = self.entries.popitem(last=False)
+                self.size_bytes -= evicted_entry.size_bytes
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size_bytes = 0
+
+    @staticmethod
+    def get_surface_size_bytes(surface: Optional[pygame.surface.Surface]) -> int:
+        if surface is None:
+            return 0
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    @staticmethod
+    def estimate_size_bytes(entry: MapDataCacheEntry) -> int:
+        size_bytes = sum(grid.nbytes for grid in entry.tile_grids.values())
+        if entry.map_layer is not None:
+            size_bytes += MapDataCache.get_surface_size_bytes(entry.map_layer._buffer)
+            size_bytes += MapDataCache.get_surface_size_bytes(
+                entry.map_layer._zoom_buffer
+            )
+        if isinstance(entry.map_data, PaddedTiledMapData):
+            # The pre-zoomed tile images are owned by the map data
+            if entry.map_data.tile_images_loaded:
+                size_bytes += sum(
+                    MapDataCache.get_surface_size_bytes(image)
+                    for image in entry.map_data.tmx.images
+                )
+            size_bytes += entry.map_data.tile_type_grid.nbytes
+            size_bytes += entry.map_data.second_tile_type_grid.nbytes
+            size_bytes += sum(
+                grid.nbytes for grid in entry.map_data.overlay_mask_render_grids.values()
+            )
+        else:
+            # The tile images are shared with the game info, leaving only the references in the image grids
+            map_w, map_h = entry.map_data.map_size
+            image_grid_count = 1 if entry.map_data.overlay_images is None else 2
+            size_bytes += map_w * map_h * image_grid_count * 8
+        return size_bytes
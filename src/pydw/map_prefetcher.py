@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+from typing import Callable, Dict, List
+
+import concurrent.futures
+
+from pydw.game_types import Map
+from pydw.map_data_cache import MapDataCache, MapDataCacheEntry, MapDataCacheKey
+
+
+class MapPrefetcher:
+    """
+    Loads map data into a MapDataCache on a background thread so that map transitions to the prefetched maps are
+    cache hits.
+
+    Maps are loaded one at a time in the order most recently requested.  Loads which have not yet started are dropped
+    whenever a new set of maps is requested.
+    """
+
+    def __init__(
+        self,
+        map_data_cache: MapDataCache,
+        get_map: Callable[[MapDataCacheKey], Map],
+        load_entry: Callable[[MapDataCacheKey], MapDataCacheEntry],
+    ) -> None:
+        self.map_data_cache = map_data_cache
+        self.get_map = get_map
+        self.load_entry = load_entry
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="MapPrefetcher"
+        )
+        self.futures: Dict[MapDataCacheKey, concurrent.futures.Future[None]] = {}
+
+    def prefetch(self, keys: List[MapDataCacheKey]) -> None:
+        """
+        :param keys: The maps to load, in order of priority
+        """
+        # Drop finished loads and loads which have not started yet so that the pending loads match the new priorities
+        for key, future in list(self.futures.items()):
+            if future.done() or future.cancel():
+                self.report_failure(key, future)
+                del self.futures[key]
+
+        for key in keys:
+            if key in self.futures or self.map_data_cache.contains(
+                key, self.get_map(key)
+            ):
+                continue
+            self.futures[key] = self.executor.submit(self.load, key)
+
+    def wait(self, key: MapDataCacheKey) -> None:
+        """
+        Wait for a map being loaded in the background to be added to the cache.  A load which has not yet started is
+        dropped as the caller is about to load the map itself.
+        """
+        future = self.futures.pop(key, None)
+        if future is None or future.cancel():
+            return
+        concurrent.futures.wait([future])
+        self.report_failure(key, future)
+
+    def shutdown(self) -> None:
+        """Drop any pending loads and wait for a load in progress to finish"""
+        # Cancel the pending loads here as Executor.shutdown only supports cancel_futures from Python 3.9
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=True)
+
+    def load(self, key: MapDataCacheKey) -> None:
+        self.map_data_cache.put(key, self.load_entry(key))
+
+    @staticmethod
+    def report_failure(
+        key: MapDataCacheKey, future: "concurrent.futures.Future[None]"
+    ) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            print(f"ERROR: Failed to prefetch map {key[0]}: {exc}", flush=True)
@@ -10,6 +10,7 @@ from typing import Any, Callable, cast, Deque, Dict, Iterator, List, Optional, T
 
 import xml.etree.ElementTree as ET
 
+import numpy
 import pygame
 import pyscroll
 import pytmx
@@ -30,7 +31,13 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
         tmx_filename: str,
         image_pad_tiles: Point = Point(0, 0),
         desired_tile_size: Optional[int] = None,
+        load_tile_images: bool = True,
     ):
+        """
+        :param load_tile_images: If the tile images should be loaded.  When False they must be loaded with
+                                 load_tile_images before rendering, which allows the map to be parsed off of the main
+                                 thread as loading the images uses pygame surfaces.
+        """
         super().__init__()
 
         # Extract out any image layers - image layers are only being used to compare the Tiled map to a template image.
@@ -39,34 +46,19 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
         for image_layer_element in xml_root.findall(".//imagelayer"):
             xml_root.remove(image_layer_element)
 
-        # load data from pytmx
+        # load data from pytmx, leaving the tile images to load_tile_images
         # Would use the following if not for the imagelayer issue: pytmx.util_pygame.load_pygame(tmx_filename)
-        self.tmx = pytmx.TiledMap(image_loader=pytmx.util_pygame.pygame_image_loader)
+        self.tmx = pytmx.TiledMap()
         self.tmx.filename = tmx_filename
         self.tmx.parse_xml(xml_root)
+        self.tile_images_loaded = False
 
         # Determine desired amount of pre-zoom
         self.pre_zoom = 1.0
         if desired_tile_size is not None:
             self.pre_zoom = desired_tile_size / self.tmx.tilewidth
 
-        # Pre-zoom tile images
-        if self.pre_zoom != 1.0:
-            images: List[Optional[pygame.surface.Surface]] = []
-            for i in self.tmx.images:
-                if i is not None:
-                    images.append(pygame.transform.scale(i, self.tile_size))
-                else:
-                    images.append(None)
-            self.tmx.images = images
-
-        # Add an image of black
-        black_tile = self.tmx.images[-1].copy()
-        black_tile.fill("black")
-        self.tmx.images.append(black_tile)
-
         self.image_pad_tiles = image_pad_tiles.ceil()
-        self.reload_animations()
         self.overlay_layer_offset = 0
         self._base_tile_layers = self.calc_base_tile_layers()
         self._overlay_tile_layers = self.calc_overlay_tile_layers()
@@ -90,6 +82,23 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
         self._decoration_layer = decoration_layer
         self._character_layer = character_layer
 
+        # Precompute which tiles are rendered while the PC is within each overlay mask object group
+        self.overlay_mask_render_grids = self.calc_overlay_mask_render_grids()
+        self.overlay_mask_render_bounds = {
+            layer_idx: self.calc_overlay_mask_render_bounds(render_grid)
+            for layer_idx, render_grid in self.overlay_mask_render_grids.items()
+        }
+
+        # Resolve the tile types of the base tile layers up front so that tile type lookups are array lookups
+        (
+            self.tile_type_names,
+            self.tile_type_grid,
+            self.second_tile_type_grid,
+        ) = self.calc_tile_type_grids()
+
+        if load_tile_images:
+            self.load_tile_images()
+
         """print('self.tmx', self.tmx, flush=True)
         print('self.tmx.tilewidth', self.tmx.tilewidth, flush=True)
         print('self.tmx.tileheight', self.tmx.tileheight, flush=True)
@@ -116,6 +125,37 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
         print('decoration layer', self.decoration_layer, flush=True)
         print('character layer', self.character_layer, flush=True)"""
 
+    def load_tile_images(self) -> None:
+        """Load and pre-zoom the tile images and set up the tile animations, which must be done on the main thread"""
+        if self.tile_images_loaded:
+            return
+        self.tmx.image_loader = pytmx.util_pygame.pygame_image_loader
+        self.tmx.reload_images()
+
+        # Pre-zoom tile images
+        if self.pre_zoom != 1.0:
+            images: List[Optional[pygame.surface.Surface]] = []
+            for i in self.tmx.images:
+                if i is not None:
+                    images.append(pygame.transform.scale(i, self.tile_size))
+                else:
+                    images.append(None)
+            self.tmx.images = images
+
+        # Add an image of black
+        black_tile = self.tmx.images[-1].copy()
+        black_tile.fill("black")
+        self.tmx.images.append(black_tile)
+
+        self.reload_animations()
+        self.tile_images_loaded = True
+
+    def reset_render_state(self) -> None:
+        """Restore the rendering state of newly loaded map data so that the map data can be reused"""
+        self.layers_to_render = self.all_tile_layers
+        self.object_group_to_bound_rendering = None
+        self.reload_animations()
+
     def set_pc_character_tile(self, pos_dat_tile: Point) -> bool:
         """
         :param pos_dat_tile: Tile position of player character
@@ -133,6 +173,22 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
             object_group_to_bound_rendering_orig != self.object_group_to_bound_rendering
         )
 
+    def get_overlay_redraw_rect(self) -> Optional[pygame.Rect]:
+        """
+        :return: Rect, in padded tile coordinates, of the tiles which need to be redrawn after set_pc_character_tile
+                 reports that a redraw is needed, or None if the whole map needs to be redrawn
+        """
+        # Leaving an overlay mask restores tiles throughout the map which were masked, requiring a full redraw
+        if self.object_group_to_bound_rendering is None:
+            return None
+        return self.overlay_mask_render_bounds[self.object_group_to_bound_rendering]
+
+    def is_rendering_bounded(self) -> bool:
+        """
+        :return: If tiles outside of the overlay redraw rect are currently masked to black
+        """
+        return self.object_group_to_bound_rendering is not None
+
     def is_interior(self, pos_dat_tile: Point) -> bool:
         return self.get_overlapping_overlay_mask_layer_index(pos_dat_tile) is not None
 
@@ -349,6 +405,129 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
             if isinstance(layer, pytmx.TiledObjectGroup)
         )
 
+    def calc_overlay_mask_render_grids(self) -> Dict[int, numpy.ndarray]:
+        """Determine the tiles to render when rendering is bounded by each of the overlay mask object groups
+
+        :return: Grids keyed by object group layer index.  Grids are indexed by [x + 1, y + 1], where x and y are
+                 unpadded tile positions, so that the one tile border around the objects is included.
+        """
+        overlay_mask_render_grids = {}
+        grid_rect = pygame.Rect(0, 0, self.tmx.width + 2, self.tmx.height + 2)
+        for layer_idx, layer in enumerate(self.tmx.layers):
+            if not isinstance(layer, pytmx.pytmx.TiledObjectGroup) or not (
+                "is_overlay" in layer.properties and layer.properties["is_overlay"]
+            ):
+                continue
+            render_grid = numpy.zeros(grid_rect.size, dtype=bool)
+            for obj in layer:
+                rect = pygame.Rect(
+                    obj.x / self.tmx.tilewidth,
+                    obj.y / self.tmx.tileheight,
+                    obj.width / self.tmx.tilewidth,
+                    obj.height / self.tmx.tileheight,
+                )
+                rect.inflate_ip(2, 2)
+                rect.move_ip(1, 1)
+                rect = rect.clip(grid_rect)
+                render_grid[rect.left : rect.right, rect.top : rect.bottom] = True
+            overlay_mask_render_grids[layer_idx] = render_grid
+        return overlay_mask_render_grids
+
+    def calc_overlay_mask_render_bounds(self, render_grid: numpy.ndarray) -> pygame.Rect:
+        """
+        :return: Bounding rect, in padded tile coordinates, of the tiles rendered according to an overlay mask render
+                 grid
+        """
+        render_columns = numpy.flatnonzero(render_grid.any(axis=1))
+        render_rows = numpy.flatnonzero(render_grid.any(axis=0))
+        if 0 == len(render_columns):
+            return pygame.Rect(0, 0, 0, 0)
+        return pygame.Rect(
+            int(render_columns[0]) - 1 + self.image_pad_tiles.x,
+            int(render_rows[0]) - 1 + self.image_pad_tiles.y,
+            int(render_columns[-1] - render_columns[0]) + 1,
+            int(render_rows[-1] - render_rows[0]) + 1,
+        )
+
+    def is_rendered_with_overlay_mask(self, x: int, y: int) -> bool:
+        """
+        :return: If the tile at the unpadded tile position should be rendered given the current overlay mask
+        """
+        if self.object_group_to_bound_rendering is None:
+            return True
+        render_grid = self.overlay_mask_render_grids[
+            self.object_group_to_bound_rendering
+        ]
+        grid_w, grid_h = render_grid.shape
+        return (
+            0 <= x + 1 < grid_w
+            and 0 <= y + 1 < grid_h
+            and bool(render_grid[x + 1, y + 1])
+        )
+
+    def calc_tile_type_grids(self) -> Tuple[List[str], numpy.ndarray, numpy.ndarray]:
+        """Determine the "type" property of the topmost and second topmost typed base layer tile of every tile
+
+        :return: The distinct tile type names, the grid of indices into them of the topmost tile type, and the grid of
+                 indices into them of the second topmost tile type (or the topmost if there is no second).  Grids are
+                 indexed by [x, y] without padding and are -1 for tiles without a tile type.
+        """
+        tile_type_names: List[str] = []
+        tile_type_name_indices: Dict[str, int] = {}
+        tile_type_grid = numpy.full(
+            (self.tmx.width, self.tmx.height), -1, dtype=numpy.int16
+        )
+        second_tile_type_grid = numpy.full(
+            (self.tmx.width, self.tmx.height), -1, dtype=numpy.int16
+        )
+
+        # Tiles sharing a gid share their properties, so resolve each gid only once
+        gid_tile_type_indices: Dict[int, int] = {0: -1}
+        for layer_idx in reversed(self.base_tile_layers):
+            for y, row in enumerate(self.tmx.layers[layer_idx].data):
+                for x, gid in enumerate(row):
+                    if gid not in gid_tile_type_indices:
+                        tile_properties = self.tmx.get_tile_properties_by_gid(gid)
+                        if (
+                            tile_properties is not None
+                            and "type" in tile_properties
+                            and tile_properties["type"] is not None
+                            and len(tile_properties["type"]) > 0
+                        ):
+                            tile_type_name = tile_properties["type"]
+                            if tile_type_name not in tile_type_name_indices:
+                                tile_type_name_indices[tile_type_name] = len(
+                                    tile_type_names
+                                )
+                                tile_type_names.append(tile_type_name)
+                            gid_tile_type_indices[gid] = tile_type_name_indices[
+                                tile_type_name
+                            ]
+                        else:
+                            gid_tile_type_indices[gid] = -1
+                    tile_type_idx = gid_tile_type_indices[gid]
+                    if tile_type_idx == -1:
+                        continue
+                    if tile_type_grid[x, y] == -1:
+                        tile_type_grid[x, y] = tile_type_idx
+                    elif second_tile_type_grid[x, y] == -1:
+                        second_tile_type_grid[x, y] = tile_type_idx
+
+        second_tile_type_grid = numpy.where(
+            second_tile_type_grid == -1, tile_type_grid, second_tile_type_grid
+        )
+        return tile_type_names, tile_type_grid, second_tile_type_grid
+
+    def get_tile_type_index(self, x: int, y: int, use_second: bool = False) -> int:
+        """
+        :return: Index into tile_type_names of the tile type at the unpadded tile position, or -1 if there is none
+        """
+        x = min(max(0, x), self.tmx.width - 1)
+        y = min(max(0, y), self.tmx.height - 1)
+        if use_second:
+            return int(self.second_tile_type_grid[x, y])
+        return int(self.tile_type_grid[x, y])
+
     def get_tile_properties(
         self, x: int, y: int, layer_idx: int
     ) -> Optional[Dict[str, str]]:
@@ -381,21 +560,8 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
             # Without image_indexing, coord (0,0) is where the Tiled map starts.
             x = min(max(0, x - self.image_pad_tiles.x), self.tmx.width - 1)
             y = min(max(0, y - self.image_pad_tiles.y), self.tmx.height - 1)
-        if self.object_group_to_bound_rendering is not None:
-            render_tile = False
-            for obj in self.tmx.layers[self.object_group_to_bound_rendering]:
-                rect = pygame.Rect(
-                    obj.x / self.tmx.tilewidth,
-                    obj.y / self.tmx.tileheight,
-                    obj.width / self.tmx.tilewidth,
-                    obj.height / self.tmx.tileheight,
-                )
-                rect.inflate_ip(2, 2)
-                if rect.collidepoint(x, y):
-                    render_tile = True
-                    break
-            if not render_tile:
-                return cast(Optional[pygame.surface.Surface], self.tmx.images[-1])
+        if not self.is_rendered_with_overlay_mask(x, y):
+            return cast(Optional[pygame.surface.Surface], self.tmx.images[-1])
         try:
             return cast(
                 Optional[pygame.surface.Surface],
@@ -429,6 +595,13 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
         tracked_gids = self._tracked_gids
         anim_map = self._animation_map
         track = bool(self._animation_queue)
+        render_grid = None
+        if self.object_group_to_bound_rendering is not None:
+            render_grid = self.overlay_mask_render_grids[
+                self.object_group_to_bound_rendering
+            ]
+            render_grid_w, render_grid_h = render_grid.shape
+        pad_x, pad_y = self.image_pad_tiles.get_as_int_tuple()
 
         for layer_idx in self.visible_tile_layers:
             if layer_idx not in self.base_tile_layers:
@@ -439,34 +612,23 @@ class PaddedTiledMapData(pyscroll.data.PyscrollDataAdapter):  # type: ignore
 
             for y in range(y1, y2 + 1):
                 row = layers[layer_idx].data[
-                    min(max(0, y - self.image_pad_tiles[1]), self.tmx.height - 1)
+                    min(max(0, y - pad_y), self.tmx.height - 1)
                 ]
 
                 for x in range(x1, x2 + 1):
-                    gid = row[
-                        min(max(0, x - self.image_pad_tiles[0]), self.tmx.width - 1)
-                    ]
+                    gid = row[min(max(0, x - pad_x), self.tmx.width - 1)]
                     if not gid:
                         continue
 
-                    if self.object_group_to_bound_rendering is not None:
-                        render_tile = False
-                        for obj in self.tmx.layers[
-                            self.object_group_to_bound_rendering
-                        ]:
-                            rect = pygame.Rect(
-                                obj.x / self.tmx.tilewidth,
-                                obj.y / self.tmx.tileheight,
-                                obj.width / self.tmx.tilewidth,
-                                obj.height / self.tmx.tileheight,
-                            )
-                            rect.inflate_ip(2, 2)
-                            if rect.collidepoint(
-                                x - self.image_pad_tiles[0], y - self.image_pad_tiles[1]
-                            ):
-                                render_tile = True
-                                break
-                        if not render_tile:
+                    if render_grid is not None:
+                        # The render grid includes a one tile border, hence the + 1
+                        grid_x = x - pad_x + 1
+                        grid_y = y - pad_y + 1
+                        if not (
+                            0 <= grid_x < render_grid_w
+                            and 0 <= grid_y < render_grid_h
+                            and render_grid[grid_x, grid_y]
+                        ):
                             yield x, y, layer_idx, images[-1]
                             continue
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+from typing import Callable, Container, Dict, List, NoReturn, Optional
+
+import re
+
+ProgressMarkerPredicate = Callable[[Container[str]], bool]
+
+
+class ProgressMarkerExpression:
+    """
+    Compiler of progress marker expressions, such as "PM_A and not (PM_B or PM_C)", into predicates over the set of
+    progress markers that have been gained.
+
+    The operators are and, or and not, the symbolic & and |, and !.  As the expressions used to be evaluated with
+    eval, the operators have their Python precedence: & binds tighter than |, which binds tighter than not, and, or
+    in that order, so "not PM_A & PM_B" is "not (PM_A & PM_B)" and "PM_A | PM_B and PM_C" is
+    "(PM_A | PM_B) and PM_C".  ! never evaluated with eval, so it is given the precedence of the unary ~ operator
+    and binds tightest.  Expressions are compiled once and the predicates are cached by expression.
+    """
+
+    TOKEN_REGEX = re.compile(r"\s*(\(|\)|&|\||!|[^\s()&|!]+)")
+    OPERATOR_TOKENS = ("(", ")", "and", "&", "or", "|", "not", "!")
+
+    predicates: Dict[str, ProgressMarkerPredicate] = {}
+
+    @staticmethod
+    def evaluate(expression: str, progress_markers: Container[str]) -> bool:
+        return ProgressMarkerExpression.compile(expression)(progress_markers)
+
+    @staticmethod
+    def compile(expression: str) -> ProgressMarkerPredicate:
+        predicate = ProgressMarkerExpression.predicates.get(expression)
+        if predicate is None:
+            predicate = ProgressMarkerExpression(expression).parse()
+            ProgressMarkerExpression.predicates[expression] = predicate
+        return predicate
+
+    @staticmethod
+    def get_progress_markers(expression: str) -> List[str]:
+        """
+        :return: The progress markers referenced by the expression
+        """
+        return [
+            token
+            for token in ProgressMarkerExpression.tokenize(expression)
+            if token not in ProgressMarkerExpression.OPERATOR_TOKENS
+        ]
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = ProgressMarkerExpression.tokenize(expression)
+        self.pos = 0
+
+    @staticmethod
+    def tokenize(expression: str) -> List[str]:
+        tokens = []
+        pos = 0
+        expression = expression.rstrip()
+        while pos < len(expression):
+            match = ProgressMarkerExpression.TOKEN_REGEX.match(expression, pos)
+            if match is None:
+                raise ValueError(f"Invalid progress marker expression: {expression}")
+            tokens.append(match.group(1))
+            pos = match.end()
+        return tokens
+
+    def parse(self) -> ProgressMarkerPredicate:
+        predicate = self.parse_or()
+        if self.pos != len(self.tokens):
+            self.raise_error()
+        return predicate
+
+    def parse_or(self) -> ProgressMarkerPredicate:
+        return self.parse_any("or", self.parse_and)
+
+    def parse_and(self) -> ProgressMarkerPredicate:
+        return self.parse_all("and", self.parse_not)
+
+    def parse_not(self) -> ProgressMarkerPredicate:
+        if self.peek() == "not":
+            self.pos += 1
+            predicate = self.parse_not()
+            return lambda progress_markers: not predicate(progress_markers)
+        return self.parse_bitwise_or()
+
+    def parse_bitwise_or(self) -> ProgressMarkerPredicate:
+        return self.parse_any("|", self.parse_bitwise_and)
+
+    def parse_bitwise_and(self) -> ProgressMarkerPredicate:
+        return self.parse_all("&", self.parse_invert)
+
+    def parse_invert(self) -> ProgressMarkerPredicate:
+        if self.peek() == "!":
+            self.pos += 1
+            predicate = self.parse_invert()
+            return lambda progress_markers: not predicate(progress_markers)
+        return self.parse_term()
+
+    def parse_any(
+        self,
+        operator: str,
+        parse_operand: Callable[[], ProgressMarkerPredicate],
+    ) -> ProgressMarkerPredicate:
+        predicates = [parse_operand()]
+        while self.peek() == operator:
+            self.pos += 1
+            predicates.append(parse_operand())
+        if 1 == len(predicates):
+            return predicates[0]
+        return lambda progress_markers: any(p(progress_markers) for p in predicates)
+
+    def parse_all(
+        self,
+        operator: str,
+        parse_operand: Callable[[], ProgressMarkerPredicate],
+    ) -> ProgressMarkerPredicate:
+        predicates = [parse_operand()]
+        while self.peek() == operator:
+            self.pos += 1
+            predicates.append(parse_operand())
+        if 1 == len(predicates):
+            return predicates[0]
+        return lambda progress_markers: all(p(progress_markers) for p in predicates)
+
+    def parse_term(self) -> ProgressMarkerPredicate:
+        token = self.peek()
+        if token == "(":
+            self.pos += 1
+            predicate = self.parse_or()
+            if self.peek() != ")":
+                self.raise_error()
+            self.pos += 1
+            return predicate
+        if token is None or token in ProgressMarkerExpression.OPERATOR_TOKENS:
+            self.raise_error()
+        self.pos += 1
+        progress_marker = token
+        return lambda progress_markers: progress_marker in progress_markers
+
+    def peek(self) -> Optional[str]:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def raise_error(self) -> NoReturn:
+        raise ValueError(
+            f"Invalid progress marker expression at token {self.pos}: {self.expression}"
+        )
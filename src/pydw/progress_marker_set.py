@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ProgressMarkerSet:
+    """
+    Set of progress markers stored as a bitset over interned progress marker ids.
+
+    Ids are assigned to all of the progress markers referenced by the game configuration when it is loaded (see
+    ProgressMarkerSet.intern) and to any other progress markers on first use, so membership is a dictionary lookup and
+    a bit test regardless of how many progress markers a game defines.
+    """
+
+    ids: Dict[str, int] = {}
+    names: List[str] = []
+
+    @staticmethod
+    def intern(name: str) -> int:
+        progress_marker_id = ProgressMarkerSet.ids.get(name)
+        if progress_marker_id is None:
+            progress_marker_id = len(ProgressMarkerSet.names)
+            ProgressMarkerSet.ids[name] = progress_marker_id
+            ProgressMarkerSet.names.append(name)
+        return progress_marker_id
+
+    @staticmethod
+    def intern_all(names: Iterable[str]) -> None:
+        for name in names:
+            ProgressMarkerSet.intern(name)
+
+    def __init__(self, names: Optional[Iterable[str]] = None) -> None:
+        self.bits = 0
+        if names is not None:
+            for name in names:
+                self.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        progress_marker_id = ProgressMarkerSet.ids.get(name)  # type: ignore
+        return progress_marker_id is not None and bool(
+            (self.bits >> progress_marker_id) & 1
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        bits = self.bits
+        progress_marker_id = 0
+        while bits:
+            if bits & 1:
+                yield ProgressMarkerSet.names[progress_marker_id]
+            bits >>= 1
+            progress_marker_id += 1
+
+    def __len__(self) -> int:
+        return bin(self.bits).count("1")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ProgressMarkerSet):
+            return self.bits == other.bits
+        return False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def add(self, name: str) -> None:
+        self.bits |= 1 << ProgressMarkerSet.intern(name)
+
+    def discard(self, name: str) -> None:
+        progress_marker_id = ProgressMarkerSet.ids.get(name)
+        if progress_marker_id is not None:
+            self.bits &= ~(1 << progress_marker_id)
+
+    def copy(self) -> "ProgressMarkerSet":
+        return ProgressMarkerSet.from_bits(self.bits)
+
+    def snapshot(self) -> int:
+        """
+        :return: The bits of the set, which are only meaningful for the current interned ids
+        """
+        return self.bits
+
+    def restore(self, bits: int) -> None:
+        self.bits = bits
+
+    def diff(self, other: "ProgressMarkerSet") -> Tuple[List[str], List[str]]:
+        """
+        :return: The progress markers in this set but not in other and the progress markers in other but not in this
+                 set
+        """
+        return (
+            list(ProgressMarkerSet.from_bits(self.bits & ~other.bits)),
+            list(ProgressMarkerSet.from_bits(other.bits & ~self.bits)),
+        )
+
+    @staticmethod
+    def from_bits(bits: int) -> "ProgressMarkerSet":
+        progress_markers = ProgressMarkerSet()
+        progress_markers.bits = bits
+        return progress_markers
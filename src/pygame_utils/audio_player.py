@@ -145,6 +145,7 @@ class AudioPlayer:
             self.music_file_start2_sec = 0.0
             self.running = True
             self.sounds: Dict[str, Optional[pygame.mixer.Sound]] = {}
+            self.sounds_muted = False
             self.music_thread_lock = threading.RLock()
             self.music_thread = threading.Thread(target=self.__music_thread)
             self.music_thread.start()
@@ -341,6 +342,9 @@ class AudioPlayer:
         def play_sound(
             self, sound_rel_file_path: str, from_music_tracks_first: bool = False
         ) -> None:
+            if self.sounds_muted:
+                return
+
             # Can play either a sound or music track as a sound track - it just won't loop.
             sound_track = self.stage_sound_track(sound_rel_file_path)
             music_track = self.stage_music_track(sound_rel_file_path)
@@ -376,6 +380,9 @@ class AudioPlayer:
             if sound is not None:
                 sound.play()
 
+        def set_sounds_muted(self, sounds_muted: bool) -> None:
+            self.sounds_muted = sounds_muted
+
         def stop_music(self) -> None:
             self.music_rel_file_path1 = self.music_rel_file_path2 = None
 
@@ -446,6 +453,11 @@ class AudioPlayer:
         if self.instance is not None:
             self.instance.play_sound(sound_file_path, from_music_tracks_first)
 
+    # Sounds are muted for headless simulations, which would otherwise start a thread for every sound
+    def set_sounds_muted(self, sounds_muted: bool) -> None:
+        if self.instance is not None:
+            self.instance.set_sounds_muted(sounds_muted)
+
     def stop_music(self) -> None:
         if self.instance is not None:
             self.instance.stop_music()
@@ -0,0 +1,6 @@
+""" Module configuring pygame to run the tests headless """
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,144 @@
+""" Module defining tests for the DialogCompiler and DialogTemplate classes """
+
+from typing import Dict
+
+import pytest
+
+from pydw.dialog_compiler import DialogCompiler, DialogOpcode, DialogTemplate
+from pydw.game_types import (
+    DialogAction,
+    DialogActionEnum,
+    DialogCheck,
+    DialogCheckEnum,
+    DialogGoTo,
+    DialogType,
+)
+
+
+def test_sequence_going_to_itself() -> None:
+    """Test that a sequence which goes to itself is compiled to a call back to the same compiled sequence"""
+    dialog_sequences: Dict[str, DialogType] = {
+        "loop": ["Again?", {"YES": [DialogGoTo("loop")], "NO": None}]
+    }
+    compiler = DialogCompiler(dialog_sequences)
+    assert compiler.compile_sequences() == set()
+
+    sequence = compiler.get_sequence("loop")
+    assert sequence is not None
+    assert sequence.label == "loop"
+    assert [instruction.opcode for instruction in sequence.instructions] == [
+        DialogOpcode.TEXT,
+        DialogOpcode.OPTIONS,
+    ]
+
+    options = sequence.instructions[1].options
+    assert options is not None
+    assert options["NO"] is None
+    yes_dialog = options["YES"]
+    assert yes_dialog is not None
+    assert len(yes_dialog.instructions) == 1
+    assert yes_dialog.instructions[0].opcode == DialogOpcode.CALL
+    assert yes_dialog.instructions[0].dialog is sequence
+
+    # Compiling dialog which goes to the sequence reuses the compiled sequence
+    compiled_dialog = compiler.compile([DialogGoTo("loop")])
+    assert compiled_dialog.instructions[0].dialog is sequence
+
+
+def test_missing_label_reported_once(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that a label referenced by several sequences but never defined is reported a single time"""
+    dialog_sequences: Dict[str, DialogType] = {
+        "first": ["One", DialogGoTo("missing")],
+        "second": ["Two", DialogGoTo("missing"), DialogGoTo("first")],
+    }
+    compiler = DialogCompiler(dialog_sequences)
+    assert compiler.compile_sequences() == {"missing"}
+    assert compiler.compile([DialogGoTo("missing")]).instructions == []
+
+    output = capsys.readouterr().out
+    assert output.count("ERROR: missing not found in dialogSequences") == 1
+
+    # The go to the missing label is dropped while the rest of the sequence is kept
+    second = compiler.get_sequence("second")
+    assert second is not None
+    assert [instruction.opcode for instruction in second.instructions] == [
+        DialogOpcode.TEXT,
+        DialogOpcode.CALL,
+    ]
+    assert second.instructions[1].dialog is compiler.get_sequence("first")
+
+
+def test_referenced_labels_resolved_with_sequences(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test that the labels gone to by dialog outside of the sequences are reported before that dialog is compiled"""
+    dialog_sequences: Dict[str, DialogType] = {"greeting": ["Hello"]}
+    compiler = DialogCompiler(dialog_sequences)
+    assert compiler.compile_sequences(["greeting", "typo", "other_typo", "typo"]) == {
+        "typo",
+        "other_typo",
+    }
+
+    output = capsys.readouterr().out
+    assert output.count("ERROR: typo not found in dialogSequences") == 1
+    assert output.count("ERROR: other_typo not found in dialogSequences") == 1
+
+    # Compiling the dialog on first use does not report the missing label again
+    assert compiler.compile([DialogGoTo("typo")]).instructions == []
+    assert capsys.readouterr().out == ""
+
+
+def test_template_substitutes_referenced_variables() -> None:
+    """Test that only the variables referenced by the text are substituted"""
+    template = DialogTemplate("[NAME] has [GOLD] gold and [NAME] is tired.")
+    assert template.variables == ("[NAME]", "[GOLD]", "[NAME]")
+
+    variables = {"[NAME]": "Erdrick", "[ITEM]": "Torch"}
+    assert template.references_any(variables)
+    assert (
+        template.substitute(variables)
+        == "Erdrick has [GOLD] gold and Erdrick is tired."
+    )
+    assert (
+        template.substitute({"[GOLD]": 120}) == "[NAME] has 120 gold and [NAME] is tired."
+    )
+
+    # Text which references none of the variables is returned unchanged
+    assert not template.references_any({"[ITEM]": "Torch"})
+    assert template.substitute({"[ITEM]": "Torch"}) is template.text
+
+    plain_template = DialogTemplate("No variables here.")
+    assert plain_template.variables == ()
+    assert plain_template.substitute(variables) == "No variables here."
+
+
+def test_count_templates() -> None:
+    """Test that a count template is only compiled for counts which reference replacement variables"""
+    assert DialogCompiler.compile_count(3) is None
+    assert DialogCompiler.compile_count("5") is None
+    assert DialogCompiler.compile_count("unlimited") is None
+
+    count_template = DialogCompiler.compile_count("[COST]")
+    assert count_template is not None
+    assert count_template.substitute({"[COST]": 25}) == "25"
+
+    compiler = DialogCompiler({})
+    compiled_dialog = compiler.compile(
+        [
+            DialogCheck(
+                DialogCheckEnum.HAS_ITEM, ["Too poor"], name="Gold", count="[COST]"
+            ),
+            DialogAction(DialogActionEnum.LOSE_ITEM, name="[ITEM]", count=2),
+        ]
+    )
+    check, action = compiled_dialog.instructions
+    assert check.opcode == DialogOpcode.CHECK
+    assert check.count_template is not None
+    assert check.count_template.substitute({"[COST]": 25}) == "25"
+    assert check.dialog is not None
+    assert check.dialog.instructions[0].opcode == DialogOpcode.TEXT
+
+    assert action.opcode == DialogOpcode.ACTION
+    assert action.count_template is None
+    assert action.template is not None
+    assert action.template.substitute({"[ITEM]": "Herb"}) == "Herb"
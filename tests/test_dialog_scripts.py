@@ -0,0 +1,94 @@
+""" Module defining tests which run the dialog scripts of the game headless """
+
+from typing import cast, Any, Dict, Iterator
+
+import json
+import os
+import random
+import sys
+
+import pygame
+import pytest
+
+from generic_utils.point import Point
+from pygame_utils.audio_player import AudioPlayer
+
+from pydw.game_info import GameInfo
+from pydw.headless_dialog_evaluator import HeadlessDialogEvaluator, HeadlessGameState
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Regenerate with: python scripts/run_dialog_scripts.py -o tests/data/dialog_script_results.json
+EXPECTED_RESULTS_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "dialog_script_results.json"
+)
+
+# Prior to Python 3.9 GameInfo resolves the xincludes with lxml, which includes them relative to the including file
+# rather than the base path
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 9),
+    reason="GameInfo cannot load data/game.xml with lxml prior to Python 3.9",
+)
+
+
+@pytest.fixture(scope="module")
+def game_info() -> Iterator[GameInfo]:
+    """Load data/game.xml as game.py does, with the window and tile sizes it uses"""
+    # Xml files are included relative to the base path
+    cwd = os.getcwd()
+    os.chdir(BASE_PATH)
+    win_size_pixels = Point(1280, 720)
+    pygame.init()
+    pygame.display.set_mode(win_size_pixels.get_as_int_tuple())
+    try:
+        loaded_game_info = GameInfo(
+            BASE_PATH,
+            os.path.join(BASE_PATH, "data", "game.xml"),
+            16 * 3,
+            win_size_pixels,
+        )
+        loaded_game_info.parse_initial_game_state("Hero")
+        yield loaded_game_info
+    finally:
+        AudioPlayer().terminate()
+        pygame.quit()
+        os.chdir(cwd)
+
+
+@pytest.fixture(scope="module")
+def dialog_script_results(game_info: GameInfo) -> Dict[str, Dict[str, Any]]:
+    """Run every dialog script from a new game, as scripts/run_dialog_scripts.py does with its defaults"""
+    random.seed(0)
+    results: Dict[str, Dict[str, Any]] = {}
+    for label, dialog in game_info.dialog_sequences.items():
+        game_state = HeadlessGameState(
+            game_info,
+            HeadlessGameState.create_initial_hero_party(game_info),
+            game_info.initial_map,
+        )
+        dialog_result = HeadlessDialogEvaluator(game_info, game_state).run(dialog)
+        results[label] = dialog_result._asdict()
+    # Compare in the form the results are stored as JSON
+    return cast(Dict[str, Dict[str, Any]], json.loads(json.dumps(results)))
+
+
+def test_dialog_scripts_match_expected_results(
+    dialog_script_results: Dict[str, Dict[str, Any]]
+) -> None:
+    """Test that every dialog script displays and changes the same as recorded in the expected results"""
+    with open(EXPECTED_RESULTS_PATH) as expected_file:
+        expected_results = json.load(expected_file)
+    assert sorted(dialog_script_results) == sorted(expected_results)
+    for label, result in dialog_script_results.items():
+        assert result == expected_results[label], label
+
+
+def test_vendor_scripts_stop_without_vendor_options(
+    dialog_script_results: Dict[str, Dict[str, Any]]
+) -> None:
+    """Test that the shared buy and sell dialog stops rather than showing the fallback for a vendor without options"""
+    for label, result in dialog_script_results.items():
+        assert not any("Nature calls" in message for message in result["messages"])
+        if label.startswith("buy_or_sell_"):
+            assert result["stop_reason"] is not None, label
+            assert "is not set by the vendor dialog" in result["stop_reason"], label
@@ -0,0 +1,135 @@
+""" Module defining tests for the ProgressMarkerExpression class """
+
+from typing import Container, List, Set
+
+import glob
+import os
+import random
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from pydw.progress_marker_expression import ProgressMarkerExpression
+from pydw.progress_marker_set import ProgressMarkerSet
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+
+
+def get_data_expressions() -> List[str]:
+    """Get every progress marker expression referenced by the xml files under the data directory"""
+    expressions: Set[str] = set()
+    for xml_path in glob.glob(os.path.join(DATA_PATH, "**", "*.xml"), recursive=True):
+        for element in ET.parse(xml_path).getroot().iter():
+            for attrib_name in ("progressMarker", "inverseProgressMarker"):
+                if attrib_name in element.attrib:
+                    expressions.add(element.attrib[attrib_name])
+    return sorted(expressions)
+
+
+def evaluate_with_eval(expression: str, progress_markers: Container[str]) -> bool:
+    """Evaluate an expression the way the game did before expressions were compiled: string replacement and eval"""
+    progress_marker_term_string = expression
+    logical_tokens = ["(", ")", " and ", " or ", " not ", "&", "|", "!"]
+    for strip_term in logical_tokens:
+        progress_marker_term_string = progress_marker_term_string.replace(
+            strip_term, " "
+        )
+    stripped_logical_tokens = [x.strip() for x in logical_tokens]
+    for term in filter(None, progress_marker_term_string.split(" ")):
+        if term in stripped_logical_tokens:
+            continue
+        expression = expression.replace(term, str(term in progress_markers))
+    return bool(eval(expression))
+
+
+def get_progress_marker_sets(progress_marker_names: List[str]) -> List[Set[str]]:
+    """Get the empty and full sets, each single marker, each marker left out, and some random subsets"""
+    all_names = set(progress_marker_names)
+    progress_marker_sets = [set(), all_names]
+    for name in progress_marker_names:
+        progress_marker_sets.append({name})
+        progress_marker_sets.append(all_names - {name})
+    rng = random.Random(17)
+    for _ in range(32):
+        progress_marker_sets.append(
+            {name for name in progress_marker_names if rng.random() < 0.5}
+        )
+    return progress_marker_sets
+
+
+DATA_EXPRESSIONS = get_data_expressions()
+
+
+def test_data_expressions_found() -> None:
+    """Test that the data directory provides expressions to compare, including ones with operators"""
+    assert len(DATA_EXPRESSIONS) > 0
+    assert any(
+        len(ProgressMarkerExpression.get_progress_markers(expression)) > 1
+        for expression in DATA_EXPRESSIONS
+    )
+
+
+@pytest.mark.parametrize("expression", DATA_EXPRESSIONS)
+def test_data_expression_matches_eval(expression: str) -> None:
+    """Test that a compiled expression from the game data evaluates the same as replacing markers and using eval"""
+    progress_marker_names = ProgressMarkerExpression.get_progress_markers(expression)
+    # Include a marker which is not referenced to check that unrelated markers are ignored
+    progress_marker_names.append("PM_Unreferenced")
+    for progress_markers in get_progress_marker_sets(progress_marker_names):
+        expected = evaluate_with_eval(expression, progress_markers)
+        assert (
+            ProgressMarkerExpression.evaluate(expression, progress_markers) == expected
+        ), f"{expression} with {sorted(progress_markers)}"
+        assert (
+            ProgressMarkerExpression.evaluate(
+                expression, ProgressMarkerSet(progress_markers)
+            )
+            == expected
+        ), f"{expression} with ProgressMarkerSet({sorted(progress_markers)})"
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "PM_A and PM_B or PM_C",
+        "PM_A or PM_B and not PM_C",
+        "not (PM_A or PM_B) and PM_C",
+        "(PM_A or PM_B) and (PM_B or not PM_C)",
+        "PM_A & PM_B | PM_C",
+        "PM_A | PM_B and PM_C",
+        "PM_A and PM_B | PM_C",
+        "not PM_A & PM_B",
+        "not PM_A | PM_B and not PM_C & PM_B",
+    ],
+)
+def test_operator_expression_matches_eval(expression: str) -> None:
+    """Test that operator precedence and the symbolic operators evaluate the same as eval"""
+    progress_marker_names = ["PM_A", "PM_B", "PM_C"]
+    for bits in range(1 << len(progress_marker_names)):
+        progress_markers = {
+            name
+            for index, name in enumerate(progress_marker_names)
+            if bits & (1 << index)
+        }
+        assert ProgressMarkerExpression.evaluate(
+            expression, progress_markers
+        ) == evaluate_with_eval(expression, progress_markers)
+
+
+def test_not_operator_and_overlapping_names() -> None:
+    """Test the cases the eval semantics got wrong: the ! operator and markers whose names contain other markers"""
+    assert ProgressMarkerExpression.evaluate("!PM_A", set())
+    assert not ProgressMarkerExpression.evaluate("!PM_A", {"PM_A"})
+    # ! binds tighter than &, unlike not
+    assert ProgressMarkerExpression.evaluate("!PM_A & PM_B", {"PM_B"})
+    assert not ProgressMarkerExpression.evaluate("!PM_A & PM_B", set())
+    assert ProgressMarkerExpression.evaluate("not PM_A & PM_B", set())
+    assert ProgressMarkerExpression.evaluate("PM_A_B and not PM_A", {"PM_A_B"})
+    assert not ProgressMarkerExpression.evaluate("PM_A_B", {"PM_A"})
+
+
+def test_invalid_expressions() -> None:
+    """Test that malformed expressions raise ValueError"""
+    for expression in ["", "PM_A and", "(PM_A", "PM_A)", "PM_A PM_B", "not"]:
+        with pytest.raises(ValueError):
+            ProgressMarkerExpression.compile(expression)